@@ -0,0 +1,191 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Admission control of the cold computations of each worker"""
+
+# A request only needs a slot when it reaches a cold computation: extracting a block's sources, predicting timestamps
+# missing from the prediction cache, rendering a plot or loading wave grids. Cached requests never wait for a slot, and
+# a request keeps its slot from its first cold computation to its end, so it is never refused halfway. Baseline requests,
+# whose scenario parameters are all 0, and scenario requests have separate lanes, each with a concurrency limit and a
+# bounded queue, so a burst of scenario requests does not hold back the dashboard's baseline forecasts. When a lane's
+# queue is full, or a request waits longer than ADMISSION_QUEUE_TIMEOUT_SECONDS, the request is answered with 503 and a
+# Retry-After header. Requests waiting for the computation of an identical request take a place in their lane's queue, but
+# no slot, under the same limits. Outside of a request, e.g. in the hindcast, computations are not limited.
+
+import contextvars
+import os
+import threading
+import time
+from werkzeug.exceptions import ServiceUnavailable
+import metrics
+import utils
+
+
+utils.loadConfigFile()
+
+queue_timeout = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_SECONDS", "30"))
+retry_after = int(os.environ.get("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+lanes = {
+    lane_name: {
+        "concurrency_limit": int(
+            os.environ.get(f"{lane_name.upper()}_COLD_CONCURRENCY", default_limit)
+        ),
+        "queue_size": int(
+            os.environ.get(f"{lane_name.upper()}_COLD_QUEUE_SIZE", default_queue_size)
+        ),
+        "running_count": 0,
+        "waiting_count": 0,
+        "condition": threading.Condition(),
+    }
+    for lane_name, default_limit, default_queue_size in (
+        ("baseline", "2", "8"),
+        ("scenario", "1", "4"),
+    )
+}
+# Lane of the current request, and whether it holds a slot of it
+request_lane = contextvars.ContextVar("request_lane", default=None)
+is_admitted = contextvars.ContextVar("is_admitted", default=False)
+
+
+def get_lane_name(query_params):
+    """Get the lane of a request from its scenario parameters
+
+    Args:
+        query_params (MultiDict): Request's query parameters
+
+    Returns:
+        string: Either baseline, when all the scenario parameters are 0, or scenario
+    """
+
+    try:
+        is_baseline = utils.all_variables_with_initial_values(
+            *(
+                utils.getNumericValue(query_params.get(param_name, 0))
+                for param_name in utils.SCENARIO_PARAMS
+            )
+        )
+    except ValueError:
+        is_baseline = False
+    return "baseline" if is_baseline else "scenario"
+
+
+def start_request_admission(query_params):
+    """Assign the current request to its lane, without taking a slot yet
+
+    Args:
+        query_params (MultiDict): Request's query parameters
+    """
+
+    request_lane.set(get_lane_name(query_params))
+    is_admitted.set(False)
+
+
+def admit_cold_computation():
+    """Take a slot of the current request's lane before a cold computation, unless the request already holds one
+
+    Raises:
+        ServiceUnavailable: The lane's queue is full or the request waited too long for a slot
+    """
+
+    lane_name = request_lane.get()
+    if lane_name is None or is_admitted.get():
+        return
+
+    lane = lanes[lane_name]
+    with lane["condition"]:
+        if lane["running_count"] >= lane["concurrency_limit"]:
+            if lane["waiting_count"] >= lane["queue_size"]:
+                metrics.record_rejected_request(lane_name, "queue_full")
+                raise ServiceUnavailable(
+                    f"Too many {lane_name} requests, retry later.",
+                    retry_after=retry_after,
+                )
+
+            lane["waiting_count"] += 1
+            deadline = time.monotonic() + queue_timeout
+            try:
+                while lane["running_count"] >= lane["concurrency_limit"]:
+                    remaining_time = deadline - time.monotonic()
+                    if remaining_time <= 0:
+                        metrics.record_rejected_request(lane_name, "queue_timeout")
+                        raise ServiceUnavailable(
+                            f"Too many {lane_name} requests, retry later.",
+                            retry_after=retry_after,
+                        )
+                    lane["condition"].wait(remaining_time)
+            finally:
+                lane["waiting_count"] -= 1
+
+        lane["running_count"] += 1
+    is_admitted.set(True)
+
+
+def wait_for_other_request(wait):
+    """Wait for the computation of another request, taking a place in the current request's lane queue meanwhile
+
+    Args:
+        wait (Function): Wait for the computation, called with the longest wait in seconds, None for no limit, and returning False when it timed out
+
+    Raises:
+        ServiceUnavailable: The lane's queue is full or the request waited too long for the computation
+    """
+
+    lane_name = request_lane.get()
+    if lane_name is None:
+        wait(None)
+        return
+
+    lane = lanes[lane_name]
+    with lane["condition"]:
+        if lane["waiting_count"] >= lane["queue_size"]:
+            metrics.record_rejected_request(lane_name, "queue_full")
+            raise ServiceUnavailable(
+                f"Too many {lane_name} requests, retry later.",
+                retry_after=retry_after,
+            )
+        lane["waiting_count"] += 1
+
+    try:
+        is_done = wait(queue_timeout)
+    finally:
+        with lane["condition"]:
+            lane["waiting_count"] -= 1
+    if not is_done:
+        metrics.record_rejected_request(lane_name, "queue_timeout")
+        raise ServiceUnavailable(
+            f"Too many {lane_name} requests, retry later.",
+            retry_after=retry_after,
+        )
+
+
+def finish_request_admission():
+    """Release the slot held by the current request, if any"""
+
+    lane_name = request_lane.get()
+    if lane_name is not None and is_admitted.get():
+        lane = lanes[lane_name]
+        with lane["condition"]:
+            lane["running_count"] -= 1
+            lane["condition"].notify()
+    request_lane.set(None)
+    is_admitted.set(False)
+
+
+def get_lanes_status():
+    """Get the occupancy of every lane
+
+    Returns:
+        Dictionary: Running and waiting requests count, concurrency limit and queue size by lane
+    """
+
+    lanes_status = {}
+    for lane_name, lane in lanes.items():
+        with lane["condition"]:
+            lanes_status[lane_name] = {
+                "running": lane["running_count"],
+                "waiting": lane["waiting_count"],
+                "concurrency_limit": lane["concurrency_limit"],
+                "queue_size": lane["queue_size"],
+            }
+    return lanes_status
@@ -0,0 +1,5 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Offline benchmarks of the dashboard backend on synthetic Met Office fixtures"""
@@ -0,0 +1,426 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Synthetic Met Office, tide and model fixtures laid out like the data folder"""
+
+# Wave files follow the AMM15 NetCDF layout (VHM0, VTM02 and VMDR by time, latitude and longitude, one file per day and
+# 24 hourly steps per file) over a Southwest England subset. Wind files are GRIB2 messages of 10 m wind speed or direction
+# encoded with simple packing, hourly up to 54 hours and 3-hourly afterwards, plus 100 m messages which the sites skip.
+# Tide tables use the two header lines and the dd/mm/YYYY HH:MM layout of the EXMOUTH and NEWLYN files. Models are small
+# random forests trained on the real feature schema, so they load and predict like the real ones but much faster.
+
+import argparse
+import os
+import struct
+from datetime import date, datetime, timedelta
+import joblib
+import numpy as np
+import pandas as pd
+import xarray as xr
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+
+FEATURES = ["Hs", "Tm", "shoreWaveDir", "Wind(m/s)", "shoreWindDir", "Freeboard"]
+LEAD_TIMES = ("T24", "T48", "T72")
+DEFAULT_BLOCK_DATES = (date(2024, 11, 20), date(2024, 11, 21), date(2024, 11, 23))
+
+# Southwest England subset of the AMM15 grid
+WAVE_LATITUDES = np.round(np.arange(49.0, 52.0 + 1e-9, 0.02), 5)
+WAVE_LONGITUDES = np.round(np.arange(-7.0, -1.0 + 1e-9, 0.03), 5)
+WAVE_FORECAST_DAYS = 6
+
+# Met Office UKV wind grid, longitudes east in [0, 360)
+WIND_LATITUDES = np.arange(49.0, 52.0 + 1e-9, 0.05)
+WIND_LONGITUDES = np.arange(353.0, 359.0 + 1e-9, 0.05)
+WIND_FORECAST_HOURS = 120
+WIND_DECIMAL_SCALE = 2
+
+
+def encode_signed(value, size):
+    """Encode an integer in GRIB2 sign and magnitude notation
+
+    Args:
+        value (integer): Value to encode
+        size (integer): Number of bytes
+
+    Returns:
+        bytes: Encoded value
+    """
+
+    sign_bit = 1 << (8 * size - 1)
+    return (abs(int(value)) | (sign_bit if value < 0 else 0)).to_bytes(size, "big")
+
+
+def encode_grib2_message(values, reference_time, forecast_hour, parameter, level):
+    """Encode a field on the wind grid as a GRIB2 message with simple packing
+
+    Args:
+        values (Array): Field values by latitude and longitude
+        reference_time (datetime): Forecast reference time
+        forecast_hour (integer): Forecast lead time in hours
+        parameter (integer): Momentum parameter number, 0 for the wind direction and 1 for the wind speed
+        level (integer): Height above ground in metres
+
+    Returns:
+        bytes: GRIB2 message
+    """
+
+    latitudes_count, longitudes_count = values.shape
+    points_count = latitudes_count * longitudes_count
+    scaled_values = np.round(values.astype(np.float64) * 10**WIND_DECIMAL_SCALE)
+    scaled_values = scaled_values.astype(np.int64).ravel()
+    reference_value = int(scaled_values.min())
+    packed_values = scaled_values - reference_value
+    bits_per_value = max(1, int(packed_values.max()).bit_length())
+    bits = (packed_values[:, None] >> np.arange(bits_per_value - 1, -1, -1)) & 1
+    data = np.packbits(bits.astype(np.uint8).ravel()).tobytes()
+
+    # Section 1: identification, Met Office centre, forecast products
+    identification = struct.pack(
+        ">IBHHBBBHBBBBBBB",
+        21,
+        1,
+        74,
+        0,
+        4,
+        0,
+        1,
+        reference_time.year,
+        reference_time.month,
+        reference_time.day,
+        reference_time.hour,
+        reference_time.minute,
+        0,
+        0,
+        1,
+    )
+
+    # Section 3: regular latitude/longitude grid on a spherical earth
+    grid_step = round((WIND_LATITUDES[1] - WIND_LATITUDES[0]) * 1e6)
+    grid_template = (
+        bytes([6, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+        + longitudes_count.to_bytes(4, "big")
+        + latitudes_count.to_bytes(4, "big")
+        + (0).to_bytes(4, "big")
+        + (0xFFFFFFFF).to_bytes(4, "big")
+        + encode_signed(round(WIND_LATITUDES[0] * 1e6), 4)
+        + encode_signed(round(WIND_LONGITUDES[0] * 1e6), 4)
+        + bytes([48])
+        + encode_signed(round(WIND_LATITUDES[-1] * 1e6), 4)
+        + encode_signed(round(WIND_LONGITUDES[-1] * 1e6), 4)
+        + grid_step.to_bytes(4, "big")
+        + grid_step.to_bytes(4, "big")
+        + bytes([64])
+    )
+    grid = (
+        struct.pack(">IBBIBBH", 14 + len(grid_template), 3, 0, points_count, 0, 0, 0)
+        + grid_template
+    )
+
+    # Section 4: analysis or forecast at a height above ground
+    product_template = (
+        bytes([2, parameter, 2, 0, 0])
+        + (0).to_bytes(2, "big")
+        + bytes([0, 1])
+        + int(forecast_hour).to_bytes(4, "big")
+        + bytes([103, 0])
+        + int(level).to_bytes(4, "big")
+        + bytes([255, 255])
+        + (0xFFFFFFFF).to_bytes(4, "big")
+    )
+    product = (
+        struct.pack(">IBHH", 9 + len(product_template), 4, 0, 0) + product_template
+    )
+
+    # Sections 5 to 7: simple packing, no bitmap and packed data
+    representation_template = (
+        struct.pack(">f", float(reference_value))
+        + encode_signed(0, 2)
+        + encode_signed(WIND_DECIMAL_SCALE, 2)
+        + bytes([bits_per_value, 0])
+    )
+    representation = (
+        struct.pack(">IBIH", 11 + len(representation_template), 5, points_count, 0)
+        + representation_template
+    )
+    bitmap = struct.pack(">IBB", 6, 6, 255)
+    packed_data = struct.pack(">IB", 5 + len(data), 7) + data
+
+    body = (
+        identification
+        + grid
+        + product
+        + representation
+        + bitmap
+        + packed_data
+        + b"7777"
+    )
+    # Section 0: meteorological discipline, edition 2
+    return b"GRIB\x00\x00\x00\x02" + (16 + len(body)).to_bytes(8, "big") + body
+
+
+def write_wind_file(wind_folder, block_date, variable):
+    """Write the wind speed or wind direction GRIB2 file of a block
+
+    Args:
+        wind_folder (string): Wind folder's path
+        block_date (Date): Block's date
+        variable (string): Either speed or direction
+
+    Returns:
+        string: Path to wind file
+    """
+
+    reference_time = datetime.combine(block_date, datetime.min.time())
+    rng = np.random.default_rng([block_date.toordinal(), variable == "speed"])
+    parameter = 1 if variable == "speed" else 0
+
+    messages = bytearray()
+    for forecast_hour in range(WIND_FORECAST_HOURS + 1):
+        if forecast_hour > 54 and forecast_hour % 3:
+            continue
+        if variable == "speed":
+            base_value = 8 + 6 * np.sin(forecast_hour / 12.0)
+        else:
+            base_value = (180 + 120 * np.sin(forecast_hour / 30.0)) % 360
+        values = np.abs(
+            base_value
+            + rng.normal(0, 0.5, (WIND_LATITUDES.size, WIND_LONGITUDES.size))
+            + np.linspace(0, 1, WIND_LONGITUDES.size)
+        )
+        messages += encode_grib2_message(
+            values, reference_time, forecast_hour, parameter, 10
+        )
+        if forecast_hour % 6 == 0:
+            messages += encode_grib2_message(
+                values, reference_time, forecast_hour, parameter, 100
+            )
+
+    wind_file = os.path.join(
+        wind_folder, f"agl_wind-{variable}-{block_date.strftime('%Y%m%d')}03.grib2"
+    )
+    with open(wind_file, "wb") as file:
+        file.write(bytes(messages))
+    return wind_file
+
+
+def write_wave_files(wave_folder, block_date, storm_factor=1.0):
+    """Write the daily AMM15 wave files of a block
+
+    Args:
+        wave_folder (string): Wave folder's path
+        block_date (Date): Block's date
+        storm_factor (float, optional): Scale of the significant wave height. Defaults to 1.0.
+
+    Returns:
+        List: Paths to wave files
+    """
+
+    grid_shape = (24, WAVE_LATITUDES.size, WAVE_LONGITUDES.size)
+    land = np.zeros(grid_shape[1:], bool)
+    land[-20:, -30:] = True
+
+    wave_files = []
+    for day in range(WAVE_FORECAST_DAYS):
+        day_start = datetime.combine(block_date, datetime.min.time()) + timedelta(
+            days=day
+        )
+        hours = (np.arange(24) + 24 * day)[:, None, None]
+        hs = np.broadcast_to(
+            storm_factor * (1.2 + np.sin(hours / 10.0))
+            + np.linspace(0, 1.5, WAVE_LATITUDES.size)[None, :, None],
+            grid_shape,
+        ).astype("float32")
+        tm = np.broadcast_to(6.0 + np.sin(hours / 7.0), grid_shape).astype("float32")
+        vmdr = np.broadcast_to(
+            (200 + 60 * np.sin(hours / 15.0)) % 360, grid_shape
+        ).astype("float32")
+        for values in (hs, tm, vmdr):
+            values[:, land] = np.nan
+
+        dimensions = ("time", "latitude", "longitude")
+        wave_dataset = xr.Dataset(
+            {
+                "VHM0": (dimensions, hs),
+                "VTM02": (dimensions, tm),
+                "VMDR": (dimensions, vmdr),
+            },
+            coords={
+                "time": pd.date_range(day_start, periods=24, freq="h"),
+                "latitude": WAVE_LATITUDES,
+                "longitude": WAVE_LONGITUDES,
+            },
+        )
+        wave_file = os.path.join(
+            wave_folder,
+            f"metoffice_wave_amm15_NWS_WAV_b{block_date.strftime('%Y%m%d')}_hi{day_start.strftime('%Y%m%d')}.nc",
+        )
+        wave_dataset.to_netcdf(wave_file)
+        wave_files.append(wave_file)
+    return wave_files
+
+
+def write_tide_file(tide_file, start_date, end_date, mean_level):
+    """Write a predicted tide table every 15 minutes
+
+    Args:
+        tide_file (string): Tide file's path
+        start_date (Date): First day of the table
+        end_date (Date): Last day of the table
+        mean_level (float): Mean water level in metres
+    """
+
+    times = pd.date_range(start_date, end_date, freq="15min")
+    hours = (times - times[0]).total_seconds() / 3600.0
+    levels = (
+        mean_level
+        + 2.0 * np.sin(2 * np.pi * hours / 12.42)
+        + 0.3 * np.sin(2 * np.pi * hours / 24 / 14.7)
+    )
+    with open(tide_file, "w") as file:
+        file.write("Predicted tide heights\nDate Time Height\n")
+        for time_value, level in zip(times, levels):
+            file.write(f"{time_value.strftime('%d/%m/%Y %H:%M')} {level:.3f}\n")
+
+
+def train_models(models_folder, prefix, seed, trees_count=20):
+    """Train small stand-in RF1 to RF4 models of every lead time on the real feature schema
+
+    Args:
+        models_folder (string): Models folder's path
+        prefix (string): Site's prefix of the model files
+        seed (integer): Random seed
+        trees_count (integer, optional): Number of trees of every forest. Defaults to 20.
+    """
+
+    rng = np.random.default_rng(seed)
+    samples_count = 600
+    features = pd.DataFrame(
+        {
+            "Hs": rng.uniform(0, 5, samples_count),
+            "Tm": rng.uniform(3, 12, samples_count),
+            "shoreWaveDir": rng.uniform(0, 360, samples_count),
+            "Wind(m/s)": rng.uniform(0, 25, samples_count),
+            "shoreWindDir": rng.uniform(0, 360, samples_count),
+            "Freeboard": rng.uniform(0, 6, samples_count),
+        }
+    )[FEATURES]
+    overtopping = ((features["Hs"] > 1.5) & (features["Freeboard"] > 3.5)).astype(int)
+    overtopping_count = np.where(overtopping == 1, features["Hs"] * 20, 0)
+
+    for lead_time in LEAD_TIMES:
+        for model_name, model_class, target in (
+            ("RF1", RandomForestClassifier, overtopping),
+            ("RF2", RandomForestRegressor, overtopping_count),
+            ("RF3", RandomForestClassifier, overtopping),
+            ("RF4", RandomForestRegressor, overtopping_count / 3),
+        ):
+            model = model_class(
+                n_estimators=trees_count, max_depth=8, random_state=seed
+            ).fit(features, target)
+            joblib.dump(
+                model,
+                os.path.join(models_folder, f"{prefix}_{model_name}_{lead_time}.pkl"),
+            )
+
+
+def build_fixtures(data_folder, block_dates=DEFAULT_BLOCK_DATES):
+    """Write the inputs of every block, the tide tables and the models into a data folder
+
+    Args:
+        data_folder (string): Data folder's path
+        block_dates (Tuple, optional): Blocks dates. Defaults to DEFAULT_BLOCK_DATES, which leaves a missing block.
+
+    Returns:
+        Dictionary: Paths to input folders and files by environment variable name
+    """
+
+    def make_folder(*path):
+        folder = os.path.join(data_folder, *path)
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    wave_folder = make_folder("data_inputs", "wave")
+    wind_folder = make_folder("data_inputs", "wind")
+    water_folder = make_folder("data_inputs", "water")
+    dawlish_models_folder = make_folder("data_inputs", "dawlish_models")
+    penzance_models_folder = make_folder("data_inputs", "penzance_models")
+
+    for block_date in block_dates:
+        write_wave_files(wave_folder, block_date)
+        write_wind_file(wind_folder, block_date, "speed")
+        write_wind_file(wind_folder, block_date, "direction")
+
+    tide_start_date = min(block_dates) - timedelta(days=2)
+    tide_end_date = max(block_dates) + timedelta(days=WAVE_FORECAST_DAYS + 3)
+    dawlish_tide_file = os.path.join(water_folder, "EXMOUTH.txt")
+    penzance_tide_file = os.path.join(water_folder, "NEWLYN.txt")
+    write_tide_file(dawlish_tide_file, tide_start_date, tide_end_date, 3.0)
+    write_tide_file(penzance_tide_file, tide_start_date, tide_end_date, 3.3)
+
+    train_models(dawlish_models_folder, "DWL", seed=0)
+    train_models(penzance_models_folder, "PNZ", seed=1)
+
+    for site in ("dawlish", "penzance"):
+        make_folder("data_outputs", site, "all_plots")
+        make_folder("data_outputs", site, "waves")
+
+    return get_fixture_paths(data_folder)
+
+
+def get_fixture_paths(data_folder):
+    """Get the paths of the fixture inputs
+
+    Args:
+        data_folder (string): Data folder's path
+
+    Returns:
+        Dictionary: Paths to input folders and files by environment variable name
+    """
+
+    inputs_folder = os.path.join(data_folder, "data_inputs")
+    wave_folder = os.path.join(inputs_folder, "wave")
+    wind_folder = os.path.join(inputs_folder, "wind")
+    return {
+        "DAWLISH_MODELS_FOLDER": os.path.join(inputs_folder, "dawlish_models"),
+        "PENZANCE_MODELS_FOLDER": os.path.join(inputs_folder, "penzance_models"),
+        "MET_OFFICE_WAVE_FOLDER": wave_folder,
+        "MET_OFFICE_WIND_FOLDER": wind_folder,
+        "MET_OFFICE_NO_OVERTOP_WAVE_FOLDER": wave_folder,
+        "MET_OFFICE_NO_OVERTOP_WIND_FOLDER": wind_folder,
+        "MET_OFFICE_STORM_BERT_WAVE_FOLDER": wave_folder,
+        "MET_OFFICE_STORM_BERT_WIND_FOLDER": wind_folder,
+        "WATER_LEVEL_FILE": os.path.join(inputs_folder, "water", "EXMOUTH.txt"),
+        "PENZANCE_WATER_LEVEL_FILE": os.path.join(inputs_folder, "water", "NEWLYN.txt"),
+        "OUTPUT_PATH_DAWLISH": os.path.join(
+            data_folder,
+            "data_outputs",
+            "dawlish",
+            "all_plots",
+            "dawlish_combined_features.png",
+        ),
+        "OUTPUT_PATH_PENZANCE": os.path.join(
+            data_folder,
+            "data_outputs",
+            "penzance",
+            "all_plots",
+            "combined_features.png",
+        ),
+        "DAWLISH_OUTPUT_WAVES_FOLDER": os.path.join(
+            data_folder, "data_outputs", "dawlish", "waves"
+        ),
+        "PENZANCE_OUTPUT_WAVES_FOLDER": os.path.join(
+            data_folder, "data_outputs", "penzance", "waves"
+        ),
+    }
+
+
+if __name__ == "__main__":
+    # e.g. python -m benchmarks.fixtures /tmp/splash_fixtures
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("data_folder", help="Folder to write the fixtures to")
+    arguments = parser.parse_args()
+
+    build_fixtures(arguments.data_folder)
+    print(f"Fixtures written to {arguments.data_folder}")
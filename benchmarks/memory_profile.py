@@ -0,0 +1,247 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Trace the memory allocated by every pipeline stage and API route over repeated calls on synthetic fixtures"""
+
+# Run from the repository's root folder, e.g. python -m benchmarks.memory_profile --iterations 5 --output memory.json
+# Every stage and route is called once cold, with the in-memory caches of the worker cleared, then repeatedly warm, as
+# successive requests would. For each call tracemalloc gives the peak allocated memory, and the memory retained once the
+# call returned and garbage was collected, which includes the call's result and what the caches kept. A stage or route is
+# flagged when the memory traced before each warm call, once the previous result is released, keeps growing by more than
+# the growth threshold per call on average, and the lines which allocated the growth are reported. Memory allocated by
+# worker processes, e.g. the feature plots renderers, and by native libraries which bypass Python's allocator is not traced.
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from benchmarks import fixtures
+from benchmarks import run_benchmarks
+
+
+MEBIBYTE = 1024 * 1024
+TOP_GROWTH_LINES_COUNT = 5
+
+
+def trace_call(function, iterations, growth_threshold, prepare=None):
+    """Trace the memory allocated by a call, once cold and repeatedly warm
+
+    Args:
+        function (Function): Call to trace, without arguments
+        iterations (integer): Number of warm calls, growth is measured from two of them
+        growth_threshold (integer): Average growth in bytes per warm call above which the call is flagged
+        prepare (Function, optional): Call run before the cold call only. Defaults to None.
+
+    Returns:
+        Dictionary: Peak and retained bytes of every call, average growth per warm call, whether it is flagged and the lines which allocated the growth, last result
+    """
+
+    if prepare is not None:
+        prepare()
+
+    calls = []
+    start_memories = []
+    snapshots = []
+    result = None
+    for iteration in range(iterations + 1):
+        result = None
+        gc.collect()
+        # The cold call fills the caches, growth is only measured over the warm calls
+        if iteration in (1, iterations):
+            snapshots.append(tracemalloc.take_snapshot())
+        start_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        result = function()
+
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        calls.append(
+            {
+                "peak": peak_memory - start_memory,
+                "retained": tracemalloc.get_traced_memory()[0] - start_memory,
+            }
+        )
+        start_memories.append(start_memory)
+
+    growth = (
+        (start_memories[-1] - start_memories[1]) / (iterations - 1)
+        if iterations > 1
+        else 0
+    )
+    is_flagged = growth > growth_threshold
+    growth_lines = []
+    if is_flagged:
+        growth_lines = [
+            str(statistic)
+            for statistic in snapshots[-1].compare_to(snapshots[0], "lineno")[
+                :TOP_GROWTH_LINES_COUNT
+            ]
+        ]
+
+    return {
+        "calls": calls,
+        "growth_per_call": growth,
+        "is_flagged": is_flagged,
+        "growth_lines": growth_lines,
+        "result": result,
+    }
+
+
+def profile_site_stages(site, iterations, growth_threshold):
+    """Trace the memory allocated by every pipeline stage of a site, in the order a request runs them
+
+    Args:
+        site (string): Site's name
+        iterations (integer): Number of warm calls of every stage
+        growth_threshold (integer): Average growth in bytes per warm call above which a stage is flagged
+
+    Returns:
+        Dictionary: Memory traces by stage name
+    """
+
+    stages = {}
+
+    def run_stage(name, function, prepare=None):
+        stages[name] = trace_call(function, iterations, growth_threshold, prepare)
+        return stages[name].pop("result")
+
+    run_benchmarks.run_site_stages(site, run_stage)
+    return stages
+
+
+def profile_routes(iterations, growth_threshold):
+    """Trace the memory allocated by every GET route through the test client
+
+    Args:
+        iterations (integer): Number of warm requests of every route
+        growth_threshold (integer): Average growth in bytes per warm request above which a route is flagged
+
+    Returns:
+        Dictionary: Status code and memory traces by url
+    """
+
+    import main
+
+    client = main.app.test_client()
+    results = {}
+    for url in run_benchmarks.get_route_urls(main.app):
+        traces = trace_call(
+            lambda: client.get(url).status_code,
+            iterations,
+            growth_threshold,
+            prepare=run_benchmarks.clear_caches,
+        )
+        results[url] = {"status": traces.pop("result"), **traces}
+    return results
+
+
+def print_results(title, results):
+    """Print memory traces as a table, followed by the growth lines of flagged entries
+
+    Args:
+        title (string): Table's title
+        results (Dictionary): Memory traces by name
+    """
+
+    print(f"\n{title}")
+    print(
+        f"{'':60s} {'cold peak':>10s} {'warm peak':>10s} {'retained':>10s} {'growth':>10s}"
+    )
+    print(f"{'':60s} {'(MiB)':>10s} {'(MiB)':>10s} {'(MiB)':>10s} {'(KiB/call)':>10s}")
+    for name, traces in results.items():
+        warm_calls = traces["calls"][1:] or traces["calls"]
+        print(
+            f"{name[:60]:60s} {traces['calls'][0]['peak'] / MEBIBYTE:10.2f}"
+            f" {max(call['peak'] for call in warm_calls) / MEBIBYTE:10.2f}"
+            f" {warm_calls[-1]['retained'] / MEBIBYTE:10.2f}"
+            f" {traces['growth_per_call'] / 1024:10.1f}"
+            f"{'  GROWING' if traces['is_flagged'] else ''}"
+        )
+    for name, traces in results.items():
+        if traces["is_flagged"]:
+            print(f"\n{name} grows by:")
+            for growth_line in traces["growth_lines"]:
+                print(f"    {growth_line}")
+
+
+def main(arguments):
+    """Build or reuse the fixtures and trace the memory of every stage and route
+
+    Args:
+        arguments (Namespace): Command line arguments
+
+    Returns:
+        Dictionary: Stages and routes memory traces
+    """
+
+    data_folder = arguments.data or tempfile.mkdtemp(prefix="splash_fixtures_")
+    work_folder = tempfile.mkdtemp(prefix="splash_memory_")
+    growth_threshold = arguments.growth_threshold * 1024
+    try:
+        if not os.path.isdir(os.path.join(data_folder, "data_inputs")):
+            print(f"Writing fixtures to {data_folder}")
+            fixtures.build_fixtures(data_folder)
+        run_benchmarks.set_fixture_environment(data_folder, work_folder)
+
+        tracemalloc.start()
+        try:
+            results = {
+                "stages": {
+                    site: profile_site_stages(
+                        site, arguments.iterations, growth_threshold
+                    )
+                    for site in ("dawlish", "penzance")
+                },
+                "routes": profile_routes(arguments.iterations, growth_threshold),
+            }
+        finally:
+            tracemalloc.stop()
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+        if not arguments.data:
+            shutil.rmtree(data_folder, ignore_errors=True)
+
+    for site, stages in results["stages"].items():
+        print_results(f"{site.capitalize()} stages", stages)
+    print_results("Routes", results["routes"])
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data",
+        help="Fixtures data folder, written when it has no inputs yet and kept afterwards",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="Number of warm calls of every route and stage",
+    )
+    parser.add_argument(
+        "--growth-threshold",
+        type=int,
+        default=256,
+        help="Average growth in KiB per warm call above which a route or stage is flagged",
+    )
+    parser.add_argument("--output", help="Json file to write the memory traces to")
+    arguments = parser.parse_args()
+
+    results = main(arguments)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=4)
+    flagged_names = [
+        name
+        for traces_by_name in (*results["stages"].values(), results["routes"])
+        for name, traces in traces_by_name.items()
+        if traces["is_flagged"]
+    ]
+    sys.exit(1 if flagged_names else 0)
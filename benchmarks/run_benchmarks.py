@@ -0,0 +1,315 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Time every API route and every pipeline stage of both sites on synthetic fixtures"""
+
+# Run from the repository's root folder, e.g. python -m benchmarks.run_benchmarks --repeat 5 --output results.json
+# The environment points every input, output and store folder to the fixtures before the backend modules are imported,
+# so the configuration files only provide the remaining settings. Cold timings clear the in-memory caches of the worker
+# first, warm timings repeat the same call with the caches filled.
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks import fixtures
+
+
+BLOCK_DATE = fixtures.DEFAULT_BLOCK_DATES[0]
+SCENARIO_QUERY = "sig_wave_height=20&wind_speed=-10&mean_wave_dir=60"
+
+
+def set_fixture_environment(data_folder, work_folder):
+    """Point the backend's configuration to the fixtures
+
+    Args:
+        data_folder (string): Fixtures data folder's path
+        work_folder (string): Folder's path of the state file and the stores
+    """
+
+    os.environ.update(fixtures.get_fixture_paths(data_folder))
+    os.environ.update(
+        {
+            "DEBUG": "False",
+            "STATE_FILE": os.path.join(work_folder, "last_processed_block.txt"),
+            "PREDICTION_STORE_FOLDER": os.path.join(work_folder, "predictions"),
+            "FEATURE_STORE_FOLDER": os.path.join(work_folder, "features"),
+        }
+    )
+
+
+def clear_caches():
+    """Clear the in-memory caches of the worker"""
+
+    import block_assembly
+    import feature_plots
+    import prediction_cache
+    import utils
+    import wave_rasters
+
+    utils.block_files_index.clear()
+    block_assembly.assembled_blocks.clear()
+    prediction_cache.cached_predictions.clear()
+    feature_plots.cached_plots.clear()
+    wave_rasters.wave_rasters.clear()
+
+
+def time_call(function, repeat, prepare=None):
+    """Time a call, once cold and repeatedly warm
+
+    Args:
+        function (Function): Call to time, without arguments
+        repeat (integer): Number of warm calls
+        prepare (Function, optional): Call run before the cold call only. Defaults to None.
+
+    Returns:
+        Dictionary: Cold duration, warm median and minimum durations in seconds, last result
+    """
+
+    if prepare is not None:
+        prepare()
+    start = time.perf_counter()
+    result = function()
+    cold_duration = time.perf_counter() - start
+
+    warm_durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        warm_durations.append(time.perf_counter() - start)
+
+    return {
+        "cold": cold_duration,
+        "warm_median": statistics.median(warm_durations) if warm_durations else None,
+        "warm_min": min(warm_durations) if warm_durations else None,
+        "result": result,
+    }
+
+
+def get_route_urls(app):
+    """Get the url of every GET route with its benchmark queries
+
+    Args:
+        app (Flask): Backend's application
+
+    Returns:
+        List: Urls of the baseline and scenario requests of every route
+    """
+
+    import sites
+
+    start_date = BLOCK_DATE.strftime("%d-%m-%Y")
+    urls = []
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if "GET" not in rule.methods or not rule.rule.startswith("/splash/"):
+            continue
+        # Routes of the registered sites and products are expanded to every site and product
+        paths = [rule.rule.replace("<int:time_index>", "0")]
+        for variable, names in (
+            ("<site_name>", sites.SITES),
+            ("<product_name>", sites.PRODUCTS),
+        ):
+            if variable in rule.rule:
+                paths = [
+                    path.replace(variable, name) for path in paths for name in names
+                ]
+        for path in paths:
+            if "history" in path:
+                urls.append(f"{path}?start_date={start_date}&end_date={start_date}")
+            else:
+                urls.append(f"{path}?start_date={start_date}")
+                if "/dawlish/" in path or "/penzance/" in path:
+                    urls.append(f"{path}?start_date={start_date}&{SCENARIO_QUERY}")
+    return urls
+
+
+def benchmark_routes(repeat):
+    """Time every GET route through the test client
+
+    Args:
+        repeat (integer): Number of warm requests of every route
+
+    Returns:
+        Dictionary: Status code and timings by url
+    """
+
+    import main
+
+    client = main.app.test_client()
+    results = {}
+    for url in get_route_urls(main.app):
+        timings = time_call(lambda: client.get(url), repeat, prepare=clear_caches)
+        results[url] = {"status": timings.pop("result").status_code, **timings}
+    return results
+
+
+def run_site_stages(site, run_stage):
+    """Run every pipeline stage of a site, in the order a request runs them
+
+    Args:
+        site (string): Site's name
+        run_stage (Function): Runner of a stage, called with the stage's name, the stage's call without arguments and an optional call run before the first one, and returning the stage's result
+    """
+
+    import digital_twin
+    import sites
+    import utils
+
+    site_config = sites.SITES[site]
+    data_sources = digital_twin.get_data_sources(site_config, site)
+    wave_folder = data_sources["wave_folder"]
+    wind_folder = data_sources["wind_folder"]
+    wave_files = digital_twin.get_wave_files(wave_folder, BLOCK_DATE)
+    wind_speed_file = digital_twin.get_wind_file(
+        "agl_wind-speed-{}", wind_folder, BLOCK_DATE
+    )
+
+    run_stage(
+        "get_available_block_dates",
+        lambda: utils.get_available_block_dates(wave_folder, wind_folder),
+        prepare=clear_caches,
+    )
+    run_stage(
+        "extract_wave_data",
+        lambda: digital_twin.extract_wave_data(site_config, wave_files),
+    )
+    run_stage(
+        "extract_wind_data",
+        lambda: digital_twin.extract_wind_data(site_config, wind_speed_file),
+    )
+    run_stage(
+        "extract_water_level_data",
+        lambda: digital_twin.extract_water_level_data(data_sources["water_level_file"]),
+    )
+    run_stage(
+        "process_block",
+        lambda: digital_twin.process_block(site_config, BLOCK_DATE, data_sources),
+        prepare=clear_caches,
+    )
+    dataset, _ = digital_twin.get_digital_twin_dataset(
+        site_config, BLOCK_DATE, data_sources
+    )
+    run_stage("load_models", lambda: digital_twin.load_models(site_config))
+
+    for scenario_name, scenario in (
+        ("baseline", (0, 0, 0, 0, 0, 0)),
+        ("scenario", (20, 0, 0, 60, -10, 0)),
+    ):
+        df_adjusted = run_stage(
+            f"adjust_overtopping_features[{scenario_name}]",
+            lambda: digital_twin.adjust_overtopping_features(dataset, *scenario),
+        )
+        rig1_overtopping_df, _ = run_stage(
+            f"process_wave_overtopping[{scenario_name}]",
+            lambda: digital_twin.process_wave_overtopping(site_config, df_adjusted),
+            prepare=clear_caches,
+        )
+
+    run_stage(
+        "convert_df_to_json_data",
+        lambda: utils.convert_df_to_json_data(rig1_overtopping_df.copy()),
+    )
+
+
+def benchmark_site_stages(site, repeat):
+    """Time every pipeline stage of a site, in the order a request runs them
+
+    Args:
+        site (string): Site's name
+        repeat (integer): Number of warm calls of every stage
+
+    Returns:
+        Dictionary: Timings by stage name
+    """
+
+    stages = {}
+
+    def run_stage(name, function, prepare=None):
+        timings = time_call(function, repeat, prepare)
+        stages[name] = {key: value for key, value in timings.items() if key != "result"}
+        return timings["result"]
+
+    run_site_stages(site, run_stage)
+    return stages
+
+
+def print_results(title, results):
+    """Print timings as a table
+
+    Args:
+        title (string): Table's title
+        results (Dictionary): Timings by name
+    """
+
+    print(f"\n{title}")
+    print(f"{'':70s} {'cold (ms)':>10s} {'warm (ms)':>10s}")
+    for name, timings in results.items():
+        warm = timings["warm_median"]
+        print(
+            f"{name[:70]:70s} {timings['cold'] * 1000:10.1f} {'' if warm is None else f'{warm * 1000:10.1f}':>10s}"
+        )
+
+
+def main(arguments):
+    """Build or reuse the fixtures and run the benchmarks
+
+    Args:
+        arguments (Namespace): Command line arguments
+
+    Returns:
+        Dictionary: Routes and stages timings
+    """
+
+    data_folder = arguments.data or tempfile.mkdtemp(prefix="splash_fixtures_")
+    work_folder = tempfile.mkdtemp(prefix="splash_benchmark_")
+    try:
+        if not os.path.isdir(os.path.join(data_folder, "data_inputs")):
+            print(f"Writing fixtures to {data_folder}")
+            fixtures.build_fixtures(data_folder)
+        set_fixture_environment(data_folder, work_folder)
+
+        results = {
+            "stages": {
+                site: benchmark_site_stages(site, arguments.repeat)
+                for site in ("dawlish", "penzance")
+            },
+            "routes": benchmark_routes(arguments.repeat),
+        }
+    finally:
+        shutil.rmtree(work_folder, ignore_errors=True)
+        if not arguments.data:
+            shutil.rmtree(data_folder, ignore_errors=True)
+
+    for site, stages in results["stages"].items():
+        print_results(f"{site.capitalize()} stages", stages)
+    print_results("Routes", results["routes"])
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data",
+        help="Fixtures data folder, written when it has no inputs yet and kept afterwards",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of warm calls of every route and stage",
+    )
+    parser.add_argument("--output", help="Json file to write the timings to")
+    arguments = parser.parse_args()
+
+    results = main(arguments)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=4)
+    sys.exit(
+        0 if all(route["status"] == 200 for route in results["routes"].values()) else 1
+    )
@@ -0,0 +1,430 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Incremental assembly of forecast blocks"""
+
+# Every worker keeps the extracted sources and the merged frame of its most recently used blocks. When the files of a block
+# have not changed the merged frame is reused. When a new file of the same block arrives, e.g. an extra wave time chunk,
+# only that file is extracted and only the tail of the merged frame after the last wave values preceding the new data is
+# aligned again. Cached predictions are then invalidated for the changed timestamps only.
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import admission
+import metrics
+import prediction_cache
+import stage_timing
+import utils
+
+
+utils.loadConfigFile()
+
+logger = logging.getLogger(__name__)
+
+HOURLY_FORECAST_HOURS = (
+    54  # First 54 hours remain hourly, then the forecast is 3-hourly
+)
+DIRECTION_COLUMNS = ("shoreWaveDir", "Wind Direction")  # degrees, from 0 to 360
+
+assembled_blocks_cache_size = int(os.environ.get("ASSEMBLED_BLOCKS_CACHE_SIZE", "8"))
+assembled_blocks = OrderedDict()
+assembled_blocks_lock = threading.Lock()
+
+
+def get_block_key(site, data_sources, block_date):
+    """Get the key identifying a block of a site in the caches
+
+    Args:
+        site (string): Site's name
+        data_sources (Dictionary): Dataset's option name, wave folder, wind folder and water level file
+        block_date (Date): Block's date
+
+    Returns:
+        Tuple: Site's name, data sources and block's date
+    """
+
+    return (
+        site,
+        data_sources["wave_folder"],
+        data_sources["wind_folder"],
+        data_sources["water_level_file"],
+        block_date,
+    )
+
+
+def combine_wave_data(wave_frames):
+    """Combine the wave data extracted from each file of a block into 3-hourly means
+
+    Args:
+        wave_frames (List): Wave dataframes of each file
+
+    Raises:
+        ValueError: Error's description
+
+    Returns:
+        Dataframe: Mean wave data
+    """
+
+    if not wave_frames:
+        raise ValueError("No wave data available for the specified block.")
+    combined_wave = pd.concat(wave_frames, ignore_index=True)
+    return combined_wave.set_index("datetime").resample("3H").mean()
+
+
+def build_time_axis(start_time, end_time):
+    """Build the target time axis of a block, hourly for the first 54 hours and 3-hourly afterwards
+
+    Args:
+        start_time (Timestamp): First wave timestamp
+        end_time (Timestamp): Last wave timestamp
+
+    Returns:
+        DatetimeIndex: Target time axis
+    """
+
+    hourly_end = start_time + pd.Timedelta(hours=HOURLY_FORECAST_HOURS)
+    hourly_times = pd.date_range(
+        start_time, min(end_time, hourly_end - pd.Timedelta(hours=1)), freq="1H"
+    )
+    three_hourly_times = pd.date_range(hourly_end, end_time, freq="3H")
+    return hourly_times.append(three_hourly_times).rename("datetime")
+
+
+def align_source(source_data, time_axis):
+    """Linearly interpolate every column of a source onto the target time axis
+
+    Times before the first available value of a column are left empty and times after the last one hold the last value.
+    Directions are interpolated through the shorter arc between two samples, e.g. from 350° to 10° through north.
+
+    Args:
+        source_data (Dataframe): Source data indexed by time
+        time_axis (DatetimeIndex): Target time axis
+
+    Returns:
+        Dataframe: Source data aligned on the target time axis
+    """
+
+    target_times = time_axis.asi8
+    aligned_data = {}
+    for column in source_data.columns:
+        samples = source_data[column].dropna()
+        sample_times = samples.index.asi8
+        sample_values = samples.to_numpy(dtype=float)
+        aligned_values = np.full(len(target_times), np.nan)
+        if len(sample_times) > 0:
+            # Number of samples at or before each target time
+            positions = np.searchsorted(sample_times, target_times, side="right")
+            after_last = positions == len(sample_times)
+            aligned_values[after_last] = sample_values[-1]
+
+            between = (positions > 0) & ~after_last
+            left = positions[between] - 1
+            weights = (target_times[between] - sample_times[left]) / (
+                sample_times[left + 1] - sample_times[left]
+            )
+            differences = sample_values[left + 1] - sample_values[left]
+            if column in DIRECTION_COLUMNS:
+                differences = (differences + 180) % 360 - 180
+                aligned_values[between] = (
+                    sample_values[left] + weights * differences
+                ) % 360
+            else:
+                aligned_values[between] = sample_values[left] + weights * differences
+        aligned_data[column] = aligned_values
+    return pd.DataFrame(aligned_data, index=time_axis)
+
+
+@stage_timing.timed_stage
+def merge_block_data(
+    wave_data, wind_speed_data, wind_direction_data, water_level_data, since=None
+):
+    """Align block sources on a single time axis, hourly for the first 54 hours and 3-hourly afterwards
+
+    Args:
+        wave_data (Dataframe): Mean wave data
+        wind_speed_data (Dataframe): Wind speed data
+        wind_direction_data (Dataframe): Wind direction data
+        water_level_data (Dataframe): Water level data
+        since (Timestamp, optional): First timestamp to align. Defaults to None, which aligns the whole block.
+
+    Returns:
+        Dataframe: Combined dataframe which holds wind, wave and water level data
+    """
+
+    time_axis = build_time_axis(wave_data.index[0], wave_data.index[-1])
+    if since is not None:
+        time_axis = time_axis[time_axis >= since]
+
+    return pd.concat(
+        [
+            align_source(source_data, time_axis)
+            for source_data in (
+                wave_data,
+                wind_speed_data,
+                wind_direction_data,
+                water_level_data,
+            )
+        ],
+        axis=1,
+    )
+
+
+def get_changed_timestamps(previous_data, current_data):
+    """Get timestamps of rows which are new or whose values changed
+
+    Args:
+        previous_data (Dataframe): Previous merged block data
+        current_data (Dataframe): Current merged block data
+
+    Returns:
+        DatetimeIndex: Changed timestamps
+    """
+
+    previous_data = previous_data.reindex(
+        index=current_data.index, columns=current_data.columns
+    )
+    unchanged_values = (current_data == previous_data) | (
+        current_data.isna() & previous_data.isna()
+    )
+    return current_data.index[~unchanged_values.all(axis=1)]
+
+
+def get_files_signature(file_paths):
+    """Get modification times of files
+
+    Args:
+        file_paths (List): Files paths
+
+    Returns:
+        Dictionary: Modification time by file path
+    """
+
+    return {
+        file_path: os.stat(file_path).st_mtime_ns
+        for file_path in file_paths
+        if file_path is not None
+    }
+
+
+def extract_block_sources(
+    wave_files,
+    wind_speed_file,
+    wind_direction_file,
+    water_level_file,
+    extract_wave_file_data,
+    extract_wind_data,
+    extract_water_level_data,
+):
+    """Extract all the sources of a block
+
+    Args:
+        wave_files (List): Wave files paths
+        wind_speed_file (string): Wind speed file path
+        wind_direction_file (string): Wind direction file path
+        water_level_file (string): Water level file path
+        extract_wave_file_data (Function): Site's wave extractor of a single file
+        extract_wind_data (Function): Site's wind extractor
+        extract_water_level_data (Function): Site's water level extractor
+
+    Returns:
+        Dictionary, Dataframes: Wave data by file path, wind speed, wind direction and water level data
+    """
+
+    # Use multi-threading to speed up data extraction
+    with ThreadPoolExecutor() as executor:
+        wave_future = stage_timing.submit_in_context(
+            executor,
+            lambda: {
+                file_path: extract_wave_file_data(file_path) for file_path in wave_files
+            },
+        )
+        wind_speed_future = stage_timing.submit_in_context(
+            executor, extract_wind_data, wind_speed_file
+        )
+        wind_direction_future = stage_timing.submit_in_context(
+            executor, extract_wind_data, wind_direction_file
+        )
+        water_level_future = stage_timing.submit_in_context(
+            executor, extract_water_level_data, water_level_file
+        )
+
+        wave_file_frames = wave_future.result()
+        wind_speed_data = wind_speed_future.result().rename(
+            columns={"value": "Wind Speed"}
+        )
+        wind_direction_data = wind_direction_future.result().rename(
+            columns={"value": "Wind Direction"}
+        )
+        water_level_data = water_level_future.result()
+
+    return wave_file_frames, wind_speed_data, wind_direction_data, water_level_data
+
+
+def append_wave_files(assembled_block, new_wave_files, extract_wave_file_data):
+    """Append new wave files to an assembled block and merge again only the affected tail
+
+    Args:
+        assembled_block (Dictionary): Previously assembled block
+        new_wave_files (List): Paths of wave files which are not part of the assembled block yet
+        extract_wave_file_data (Function): Site's wave extractor of a single file
+
+    Returns:
+        Dictionary, DatetimeIndex: Updated assembled block, changed timestamps
+    """
+
+    wave_file_frames = dict(assembled_block["wave_file_frames"])
+    for file_path in new_wave_files:
+        wave_file_frames[file_path] = extract_wave_file_data(file_path)
+
+    previous_wave_data = assembled_block["wave_data"]
+    wave_data = combine_wave_data(
+        [wave_file_frames[file_path] for file_path in sorted(wave_file_frames)]
+    )
+    _, wind_speed_data, wind_direction_data, water_level_data = assembled_block[
+        "sources"
+    ]
+    sources = (wave_data, wind_speed_data, wind_direction_data, water_level_data)
+    previous_data = assembled_block["data"]
+
+    changed_wave_timestamps = get_changed_timestamps(previous_wave_data, wave_data)
+    if changed_wave_timestamps.empty:
+        data = previous_data
+    else:
+        # Rows before the last wave value of every column preceding the new data are interpolated between unchanged
+        # values, so only the rows from there onwards are aligned again.
+        earlier_wave_data = wave_data.loc[wave_data.index < changed_wave_timestamps[0]]
+        last_valid_times = [
+            earlier_wave_data[column].last_valid_index()
+            for column in earlier_wave_data.columns
+        ]
+        if (
+            wave_data.index[0] != previous_wave_data.index[0]
+            or None in last_valid_times
+        ):
+            data = merge_block_data(*sources)
+        else:
+            since = min(last_valid_times)
+            data = pd.concat(
+                [
+                    previous_data.loc[previous_data.index < since],
+                    merge_block_data(*sources, since=since),
+                ]
+            )
+
+    updated_block = dict(
+        assembled_block,
+        wave_file_frames=wave_file_frames,
+        wave_data=wave_data,
+        sources=sources,
+        data=data,
+    )
+    return updated_block, get_changed_timestamps(previous_data, data)
+
+
+def assemble_block(
+    block_key,
+    wave_files,
+    wind_speed_file,
+    wind_direction_file,
+    water_level_file,
+    extract_wave_file_data,
+    extract_wind_data,
+    extract_water_level_data,
+):
+    """Assemble the merged data of a block, reusing the previously assembled data of the same block
+
+    Args:
+        block_key (Tuple): Site's name, data sources and block's date identifying the block
+        wave_files (List): Wave files paths
+        wind_speed_file (string): Wind speed file path
+        wind_direction_file (string): Wind direction file path
+        water_level_file (string): Water level file path
+        extract_wave_file_data (Function): Site's wave extractor of a single file
+        extract_wind_data (Function): Site's wind extractor
+        extract_water_level_data (Function): Site's water level extractor
+
+    Raises:
+        ValueError: Error's description
+
+    Returns:
+        Dataframe: Combined dataframe which holds wind, wave and water level data
+    """
+
+    if not wave_files:
+        raise ValueError("No wave data available for the specified block.")
+
+    wave_files_signature = get_files_signature(wave_files)
+    other_files_signature = get_files_signature(
+        [wind_speed_file, wind_direction_file, water_level_file]
+    )
+
+    with assembled_blocks_lock:
+        assembled_block = assembled_blocks.get(block_key)
+
+    is_hit = (
+        assembled_block is not None
+        and assembled_block["other_files_signature"] == other_files_signature
+        and assembled_block["wave_files_signature"].items()
+        <= wave_files_signature.items()
+    )
+    metrics.record_cache_lookup("assembled_blocks", is_hit)
+    if is_hit:
+        new_wave_files = sorted(
+            set(wave_files_signature) - set(assembled_block["wave_files_signature"])
+        )
+        if new_wave_files:
+            admission.admit_cold_computation()
+            assembled_block, changed_timestamps = append_wave_files(
+                assembled_block, new_wave_files, extract_wave_file_data
+            )
+            assembled_block["wave_files_signature"] = wave_files_signature
+            prediction_cache.invalidate_timestamps(block_key, changed_timestamps)
+            logger.info(
+                "Appended %d wave files, %d timestamps changed",
+                len(new_wave_files),
+                len(changed_timestamps),
+            )
+    else:
+        admission.admit_cold_computation()
+        wave_file_frames, wind_speed_data, wind_direction_data, water_level_data = (
+            extract_block_sources(
+                wave_files,
+                wind_speed_file,
+                wind_direction_file,
+                water_level_file,
+                extract_wave_file_data,
+                extract_wind_data,
+                extract_water_level_data,
+            )
+        )
+        wave_data = combine_wave_data(
+            [wave_file_frames[file_path] for file_path in sorted(wave_file_frames)]
+        )
+        sources = (wave_data, wind_speed_data, wind_direction_data, water_level_data)
+        assembled_block = {
+            "wave_files_signature": wave_files_signature,
+            "other_files_signature": other_files_signature,
+            "wave_file_frames": wave_file_frames,
+            "wave_data": wave_data,
+            "sources": sources,
+            "data": merge_block_data(*sources),
+        }
+        prediction_cache.invalidate_block(block_key)
+
+    with assembled_blocks_lock:
+        assembled_blocks[block_key] = assembled_block
+        assembled_blocks.move_to_end(block_key)
+        evictions_count = max(len(assembled_blocks) - assembled_blocks_cache_size, 0)
+        for _ in range(evictions_count):
+            assembled_blocks.popitem(last=False)
+    metrics.record_cache_evictions("assembled_blocks", evictions_count)
+
+    block_data = assembled_block["data"].reset_index()
+    block_data.attrs["block_key"] = block_key
+    return block_data
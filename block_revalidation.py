@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Serving of the previous block while a new block is built in the background"""
+
+# A block is ready in a worker once the worker has processed it, its data then being in the assembled blocks cache, or
+# once it is in the feature store. A block is newly published when it was not available yet at the worker's previous
+# lookup of the site's blocks. When a request resolves to a newly published block, or to a block still being built, and
+# an earlier ready block is within the look-back window, the request is served with that block while a background thread
+# builds the new block, which is used as soon as it is ready. The block date of stale responses is given in the response's
+# block date, and the date of the block being built in the X-Block-Revalidating header. The build is given the option and
+# data sources of the request which scheduled it, so requests of other options meanwhile do not change what it builds.
+# Blocks which were already available, and blocks whose build failed, are processed synchronously as before, as are all
+# blocks outside of a request, e.g. in the hindcast.
+
+import contextvars
+import logging
+import threading
+import time
+from flask import has_request_context
+
+
+logger = logging.getLogger(__name__)
+
+known_block_dates = {}
+ready_block_dates = {}
+building_blocks = set()
+blocks_lock = threading.Lock()
+# Date of the block being built while the current request is served with an earlier block
+revalidating_block_date = contextvars.ContextVar(
+    "revalidating_block_date", default=None
+)
+
+
+def mark_block_ready(site, option, block_date):
+    """Record that a block has been processed in this worker
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        block_date (Date): Block's date
+    """
+
+    with blocks_lock:
+        ready_block_dates.setdefault((site, option), set()).add(block_date)
+
+
+def build_block(site, data_sources, block_date, process_available_block):
+    """Process a block in the background and mark it ready
+
+    Args:
+        site (string): Site's name
+        data_sources (Dictionary): Dataset's option name, wave folder, wind folder and water level file of the block
+        block_date (Date): Block's date
+        process_available_block (Function): Site's processing of an available block, called with the block's date and data sources
+    """
+
+    option = data_sources["option"]
+    start = time.perf_counter()
+    try:
+        process_available_block(block_date, data_sources)
+    except Exception as e:
+        logger.warning("Block %s of %s could not be built: %s", block_date, site, e)
+    else:
+        mark_block_ready(site, option, block_date)
+        logger.info(
+            "Built block %s of %s in %.1f s",
+            block_date,
+            site,
+            time.perf_counter() - start,
+        )
+    finally:
+        with blocks_lock:
+            building_blocks.discard((site, option, block_date))
+
+
+def start_block_build(site, data_sources, block_date, process_available_block):
+    """Start building a block in the background, unless it is already being built
+
+    Args:
+        site (string): Site's name
+        data_sources (Dictionary): Dataset's option name, wave folder, wind folder and water level file of the block
+        block_date (Date): Block's date
+        process_available_block (Function): Site's processing of an available block, called with the block's date and data sources
+    """
+
+    build_key = (site, data_sources["option"], block_date)
+    with blocks_lock:
+        if build_key in building_blocks:
+            return
+        building_blocks.add(build_key)
+
+    # The thread keeps its own copy of the data sources as they are when the build is scheduled
+    threading.Thread(
+        target=build_block,
+        args=(site, dict(data_sources), block_date, process_available_block),
+        name=f"build-block-{site}-{block_date}",
+        daemon=True,
+    ).start()
+
+
+def get_servable_block_dates(
+    site,
+    data_sources,
+    available_block_dates,
+    candidate_block_dates,
+    stored_block_dates,
+    process_available_block,
+):
+    """Get the candidate blocks to serve a request with, starting from a ready block while a newly published block is built
+
+    Args:
+        site (string): Site's name
+        data_sources (Dictionary): Dataset's option name, wave folder, wind folder and water level file of the request
+        available_block_dates (List): Sorted available blocks dates
+        candidate_block_dates (List): Candidate blocks dates, latest first
+        stored_block_dates (List): Dates of the blocks in the feature store
+        process_available_block (Function): Site's processing of an available block, called with the block's date and data sources
+
+    Returns:
+        List: Candidate blocks dates to try in turn, latest first
+    """
+
+    revalidating_block_date.set(None)
+    if not candidate_block_dates or not has_request_context():
+        return candidate_block_dates
+
+    option = data_sources["option"]
+    latest_block_date = candidate_block_dates[0]
+    with blocks_lock:
+        previous_block_dates = known_block_dates.get((site, option))
+        known_block_dates[(site, option)] = set(available_block_dates)
+        ready_dates = ready_block_dates.get((site, option), set()) | set(
+            stored_block_dates
+        )
+        is_newly_published = (
+            previous_block_dates is not None
+            and latest_block_date not in previous_block_dates
+        )
+        is_building = (site, option, latest_block_date) in building_blocks
+    if latest_block_date in ready_dates or not (is_newly_published or is_building):
+        return candidate_block_dates
+
+    for index, candidate_block_date in enumerate(candidate_block_dates[1:], start=1):
+        if candidate_block_date in ready_dates:
+            start_block_build(
+                site, data_sources, latest_block_date, process_available_block
+            )
+            revalidating_block_date.set(latest_block_date)
+            return candidate_block_dates[index:]
+    return candidate_block_dates
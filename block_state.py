@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Latest published forecast block of each Met Office data source"""
+
+# The ingest job publishes a block once all its files have arrived. Every worker keeps the published blocks in memory and
+# only re-reads the state file when its modification time changes. The state file is replaced atomically, so a reader
+# never sees a partially written record and requests never write to disk.
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+import utils
+
+
+utils.loadConfigFile()
+
+state_file = os.environ.get("STATE_FILE")
+
+published_blocks = {}
+published_blocks_lock = threading.Lock()
+state_file_mtime = None
+
+
+def get_source_key(wave_folder):
+    """Get the key identifying a data source in the state file
+
+    Args:
+        wave_folder (string): Wave folder's path
+
+    Returns:
+        string: Absolute path of wave folder
+    """
+
+    return os.path.abspath(wave_folder)
+
+
+def read_state_file():
+    """Read published blocks from the state file
+
+    Returns:
+        Dictionary: Published block's date by data source, empty when the state file is missing or unreadable
+    """
+
+    try:
+        with open(state_file, "r") as file:
+            state = json.load(file)
+        return {
+            source_key: datetime.strptime(block_date, "%Y-%m-%d").date()
+            for source_key, block_date in state.items()
+        }
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def refresh_published_blocks():
+    """Reload published blocks when another process has replaced the state file"""
+
+    global state_file_mtime
+    try:
+        current_mtime = os.stat(state_file).st_mtime_ns
+    except OSError:
+        return
+
+    if current_mtime == state_file_mtime:
+        return
+
+    with published_blocks_lock:
+        if current_mtime != state_file_mtime:
+            published_blocks.update(read_state_file())
+            state_file_mtime = current_mtime
+
+
+def get_published_block(wave_folder):
+    """Get the latest published block of a data source
+
+    Args:
+        wave_folder (string): Wave folder's path
+
+    Returns:
+        Date: Latest published block's date, None when no block has been published
+    """
+
+    refresh_published_blocks()
+    return published_blocks.get(get_source_key(wave_folder))
+
+
+def publish_block(wave_folder, block_date):
+    """Publish a block of a data source, this must only be called by the ingest job
+
+    Args:
+        wave_folder (string): Wave folder's path
+        block_date (Date): Block's date
+    """
+
+    global state_file_mtime
+    with published_blocks_lock:
+        state = read_state_file()
+        state[get_source_key(wave_folder)] = block_date
+        utils.write_file_atomically(
+            state_file,
+            json.dumps(
+                {
+                    source_key: source_block_date.strftime("%Y-%m-%d")
+                    for source_key, source_block_date in state.items()
+                },
+                indent=4,
+            ),
+        )
+        published_blocks.update(state)
+        state_file_mtime = os.stat(state_file).st_mtime_ns
+    print(f"Published block {block_date} of {wave_folder}")
+
+
+def publish_latest_available_block(option):
+    """Publish the latest block which has all its wave and wind files
+
+    Args:
+        option (string): Dataset's option name
+
+    Returns:
+        Date: Published block's date, None when there are no available blocks
+    """
+
+    wave_folder, wind_folder = utils.getLocationDataPaths(option)
+    available_block_dates = utils.get_available_block_dates(wave_folder, wind_folder)
+    if not available_block_dates:
+        print(f"No available blocks in {wave_folder}")
+        return None
+
+    publish_block(wave_folder, available_block_dates[-1])
+    return available_block_dates[-1]
+
+
+if __name__ == "__main__":
+    # Run by the ingest job once new Met Office files have been downloaded, e.g. python block_state.py dawlish
+    publish_latest_available_block(sys.argv[1] if len(sys.argv) > 1 else "dawlish")
@@ -0,0 +1,393 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""SPLASH Digital Twin Dawlish notebook and plots"""
+
+# Notebook sliders, overtopping graphs, features line plots and significant-wave-height contour plots of the Dawlish digital
+# twin. This module is only imported on demand, so the API workers never load IPython, ipywidgets, matplotlib or seaborn.
+
+from IPython.display import display, clear_output
+import matplotlib.lines as mlines
+import ipywidgets as widgets
+import matplotlib.dates as mdates
+import pandas as pd
+from datetime import datetime
+import matplotlib.pyplot as plt
+import block_state
+import dawlish_final_digital_twin_script_upgraded as ddt
+import digital_twin
+import feature_plots
+import utils
+import wave_maps
+
+
+utils.loadConfigFile()
+
+# Step 5: This is our slider adjustments, remember we defined this in step 3.
+style = {"description_width": "150px"}
+slider_layout_design_with_digital_twin = widgets.Layout(width="400px")
+Sig_wave_height_slider_output = widgets.FloatSlider(
+    value=0,
+    min=-100,
+    max=100,
+    step=1,
+    description="Hs (%):",
+    style=style,
+    layout=slider_layout_design_with_digital_twin,
+)
+Mean_Period_Slider = widgets.FloatSlider(
+    value=0,
+    min=-100,
+    max=100,
+    step=1,
+    description="Tm (%):",
+    style=style,
+    layout=slider_layout_design_with_digital_twin,
+)
+Cross_shore_wave_dir_slider = widgets.FloatSlider(
+    value=0,
+    min=0,
+    max=360,
+    step=1,
+    description="ShoreWaveDir (°):",
+    style=style,
+    layout=slider_layout_design_with_digital_twin,
+)
+wind_speed_slider = widgets.FloatSlider(
+    value=0,
+    min=-100,
+    max=100,
+    step=1,
+    description="Wind (m/s) (%):",
+    style=style,
+    layout=slider_layout_design_with_digital_twin,
+)
+Cross_shore_wind_dir_slider = widgets.FloatSlider(
+    value=0,
+    min=0,
+    max=360,
+    step=1,
+    description="ShoreWindDir (°):",
+    style=style,
+    layout=slider_layout_design_with_digital_twin,
+)
+freeboard_slider = widgets.FloatSlider(
+    value=0,
+    min=-100,
+    max=100,
+    step=1,
+    description="Freeboard (%):",
+    style=style,
+    layout=slider_layout_design_with_digital_twin,
+)
+submit_button = widgets.Button(description="Submit")
+final_DawlishTwin_dataset = pd.DataFrame()
+
+
+def adjust_features(df):
+    """Adjust wave and atmospheric features
+
+    Args:
+        df (Dataframe): Initial digital twin dataframe
+
+    Returns:
+        Dataframe: Dataframe with adjusted features values
+    """
+
+    df_adjusted_slideronly = df.copy()
+    df_adjusted_slideronly["Hs"] *= 1 + Sig_wave_height_slider_output.value / 100
+    df_adjusted_slideronly["Tm"] *= 1 + Mean_Period_Slider.value / 100
+    df_adjusted_slideronly["shoreWaveDir"] = Cross_shore_wave_dir_slider.value
+    df_adjusted_slideronly["Wind(m/s)"] *= 1 + wind_speed_slider.value / 100
+    df_adjusted_slideronly["shoreWindDir"] = Cross_shore_wind_dir_slider.value
+    df_adjusted_slideronly["Freeboard"] *= 1 + freeboard_slider.value / 100
+    return df_adjusted_slideronly
+
+
+def plot_overtopping_graphs(
+    df_adjusted_slideronly_tmp,
+    overtopping_counts_rf1_rf2,
+    overtopping_counts_rf3_rf4,
+    rf1_confidences_GINI,
+    rf3_confidences_GINI,
+):
+    """Plot overtopping graphs using Matplotlib
+
+    Args:
+        df_adjusted_slideronly_tmp (Dataframe): Main dataframe with adjusted wave and atmospheric variables
+        overtopping_counts_rf1_rf2 (List): Overtopping counts list of first location
+        overtopping_counts_rf3_rf4 (List): Overtopping counts list of second location
+        rf1_confidences_GINI (List): Confidence values list of overtopping events prediction for first location
+        rf3_confidences_GINI (List): Confidence values list of overtopping events prediction for second location
+    """
+
+    # Step 9, now we plot our results
+    clear_output(wait=True)
+    fig, (axes1_DG_Plot, axes2_DG_Plot) = plt.subplots(2, 1, figsize=(16, 10), dpi=300)
+    time_stamps = df_adjusted_slideronly_tmp["time"]
+    start_date = time_stamps.iloc[0]
+    end_date = time_stamps.iloc[-1]
+    xticks = df_adjusted_slideronly_tmp["time"]
+
+    # Plot for Rig 1
+    feature_plots.scatter_overtopping_counts(
+        axes1_DG_Plot,
+        time_stamps,
+        overtopping_counts_rf1_rf2,
+        ddt.get_confidence_colors(rf1_confidences_GINI),
+        80,
+    )
+
+    axes1_DG_Plot.axhline(
+        y=6, color="black", linestyle="--", linewidth=1, label="25% IQR (6)"
+    )
+    axes1_DG_Plot.axhline(
+        y=54, color="black", linestyle="--", linewidth=1, label="75% IQR (54)"
+    )
+    axes1_DG_Plot.set_ylim(-10, 120)
+    axes1_DG_Plot.set_xlim(
+        df_adjusted_slideronly_tmp["time"].min(),
+        df_adjusted_slideronly_tmp["time"].max(),
+    )
+    axes1_DG_Plot.set_xticks(df_adjusted_slideronly_tmp["time"])
+    axes1_DG_Plot.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d %H:%M"))
+    axes1_DG_Plot.tick_params(axis="x", rotation=90, labelsize=8)
+    axes1_DG_Plot.tick_params(axis="x", rotation=90, labelsize=8)
+    axes1_DG_Plot.tick_params(axis="y", labelsize=8)
+    axes1_DG_Plot.set_title(
+        "Dawlish Seawall Crest", loc="center", fontsize=12, fontweight="bold"
+    )
+    axes1_DG_Plot.set_ylabel(
+        "No. of Overtopping Occurences (Per 10 Mins)", fontsize=10, labelpad=10
+    )
+
+    # Plot for Rig 2, with the adjusted color logic for the railway plot
+    feature_plots.scatter_overtopping_counts(
+        axes2_DG_Plot,
+        time_stamps,
+        overtopping_counts_rf3_rf4,
+        ddt.get_confidence_colors(rf3_confidences_GINI, 1),
+        80,
+    )
+
+    axes2_DG_Plot.axhline(
+        y=2, color="black", linestyle="--", linewidth=1, label="25% IQR (2)"
+    )
+    axes2_DG_Plot.axhline(
+        y=9, color="black", linestyle="--", linewidth=1, label="75% IQR (9)"
+    )
+    axes2_DG_Plot.set_ylim(-5, 120)
+    axes2_DG_Plot.set_xlim(
+        df_adjusted_slideronly_tmp["time"].min(),
+        df_adjusted_slideronly_tmp["time"].max(),
+    )
+    axes2_DG_Plot.set_xticks(df_adjusted_slideronly_tmp["time"])
+    axes2_DG_Plot.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d %H:%M"))
+    axes2_DG_Plot.tick_params(axis="x", rotation=90, labelsize=8)
+    axes2_DG_Plot.tick_params(axis="x", rotation=90, labelsize=8)
+    axes2_DG_Plot.tick_params(axis="y", labelsize=8)
+    axes2_DG_Plot.set_title(
+        "Dawlish Railway Line", loc="center", fontsize=12, fontweight="bold"
+    )
+    axes2_DG_Plot.set_ylabel(
+        "No. of Overtopping Occurences (Per 10 Mins)", fontsize=10, labelpad=10
+    )
+
+    # Now plot our legend
+    Randforest_high_confidence_scoring_metrics = mlines.Line2D(
+        [],
+        [],
+        color="#00008B",
+        marker="o",
+        linestyle="None",
+        markersize=10,
+        label="High Confidence (> 80%)",
+    )
+    Randforest_medium_confidence_scoring_metrics = mlines.Line2D(
+        [],
+        [],
+        color="#4682B4",
+        marker="o",
+        linestyle="None",
+        markersize=10,
+        label="Medium Confidence (50-80%)",
+    )
+    Randforest_low_confidence_scoring_metrics = mlines.Line2D(
+        [],
+        [],
+        color="aqua",
+        marker="o",
+        linestyle="None",
+        markersize=10,
+        label="Low Confidence (< 50%)",
+    )
+    There_is_no_overtopping_recorded = mlines.Line2D(
+        [],
+        [],
+        color="black",
+        marker="x",
+        linestyle="None",
+        markersize=10,
+        label="No Overtopping",
+    )
+    Upper_and_lower_iqr_dashed_lines = mlines.Line2D(
+        [],
+        [],
+        color="black",
+        linestyle="--",
+        linewidth=1,
+        label="Interquartile Range (25th & 75th)",
+    )
+
+    fig.legend(
+        handles=[
+            Randforest_high_confidence_scoring_metrics,
+            Randforest_medium_confidence_scoring_metrics,
+            Randforest_low_confidence_scoring_metrics,
+            There_is_no_overtopping_recorded,
+            Upper_and_lower_iqr_dashed_lines,
+        ],
+        loc="lower center",
+        bbox_to_anchor=(0.5, -0.15),
+        ncol=5,
+        frameon=False,
+    )
+
+    plt.tight_layout()
+    plt.show()
+
+
+def on_submit_clicked(button):
+    """Update overtopping graphs after inputting new variales values
+
+    Args:
+        b (Button): Button instance
+    """
+
+    df_adjusted = adjust_features(final_DawlishTwin_dataset)
+    clear_output(wait=True)
+    ddt.process_wave_overtopping(df_adjusted)
+    display(
+        Sig_wave_height_slider_output,
+        Mean_Period_Slider,
+        Cross_shore_wave_dir_slider,
+        wind_speed_slider,
+        Cross_shore_wind_dir_slider,
+        freeboard_slider,
+        submit_button,
+    )
+
+
+# Step 10, now we want to plot, for the processed block, what the changing Hs, freeboard, wind speed and direction was.
+def save_penazance_combined_features_plot_with_overtopping(
+    df, overtopping_times, output_path, start_date, end_date
+):
+    """Save combined features plot
+
+    Args:
+        df (Dataframe): Digital twin dataframe
+        overtopping_times (Dataframe): Overtopping events dataframe
+        output_path (string): Path to outputs folder
+        start_date (string): Forecast start date
+        end_date (string): Forecast end date
+    """
+
+    df = (
+        df.set_index("time")
+        .reindex(pd.date_range(start=start_date, end=end_date, freq="1H"))
+        .interpolate(method="time")
+        .reset_index()
+    )
+    df.rename(columns={"index": "time"}, inplace=True)
+
+    # Extract hourly water level data directly from the text file
+    wl_data_hourly = digital_twin.extract_hourly_water_level_data(
+        start_date, end_date, ddt.site["water_level_file"]
+    )
+
+    utils.write_file_atomically(
+        output_path,
+        feature_plots.render_dawlish_combined_features_plot(
+            df, overtopping_times, wl_data_hourly, start_date, end_date
+        ),
+    )
+
+
+def save_combined_features(final_DawlishTwin_dataset):
+    """Save combined features
+
+    Args:
+        final_DawlishTwin_dataset (Dataframe): Digital twin dataframe
+    """
+
+    use_this_output_path_dawlish = ddt.site["combined_features_plot_path"]
+    overtopping_times_dawlish = final_DawlishTwin_dataset[
+        final_DawlishTwin_dataset["RF1_Final_Predictions"] == 1
+    ]["time"]
+    block_start_date = final_DawlishTwin_dataset["time"].min()
+    block_end_date = final_DawlishTwin_dataset["time"].max()
+
+    save_penazance_combined_features_plot_with_overtopping(
+        final_DawlishTwin_dataset,
+        overtopping_times_dawlish,
+        use_this_output_path_dawlish,
+        block_start_date,
+        block_end_date,
+    )
+
+
+def adjust_arrow_density(latitudes, longitudes, density_factor=12):
+    """
+    Adjusts the density of arrows to be plotted by returning slice objects.
+
+    Args:
+        latitudes (list): A list or array of latitude values.
+        longitudes (list): A list or array of longitude values.
+        density_factor (int, optional): The factor by which to reduce the
+            density of arrows. Higher values result in fewer arrows. Defaults to 12.
+
+    Returns:
+        tuple: A tuple containing two slice objects, one for latitudes and
+               one for longitudes. Each slice object specifies the step size
+               for downsampling the corresponding array. The step size is
+               calculated as the maximum of 1 and the length of the array
+               divided by the density factor.
+    """
+    return (
+        slice(None, None, max(1, len(latitudes) // density_factor)),
+        slice(None, None, max(1, len(longitudes) // density_factor)),
+    )
+
+
+def plot_significant_wave_height():
+    """Plot significant wave height"""
+
+    # Step 11: Plot Hs geospatially and save to the figures folders of both sites
+    wave_maps.generate_wave_maps(datetime.now().date())
+
+    block_state.publish_latest_available_block("dawlish")
+
+
+def generate_overtopping_graphs():
+    """Generate overtopping graphs"""
+
+    global final_DawlishTwin_dataset
+    final_DawlishTwin_dataset, block_date = ddt.get_digital_twin_dataset(
+        datetime.now().date(), ddt.get_data_sources()
+    )
+    ddt.load_models()
+
+    ddt.process_wave_overtopping(final_DawlishTwin_dataset)
+    display(
+        Sig_wave_height_slider_output,
+        Mean_Period_Slider,
+        Cross_shore_wave_dir_slider,
+        wind_speed_slider,
+        Cross_shore_wind_dir_slider,
+        freeboard_slider,
+        submit_button,
+    )
+    submit_button.on_click(on_submit_clicked)
+
+    save_combined_features(final_DawlishTwin_dataset)
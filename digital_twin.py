@@ -0,0 +1,837 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""SPLASH Digital Twin engine shared by all the sites"""
+
+# The pretrained machine learning models of each site predict (1) wave overtopping occurrences and (2) overtopping
+# frequency at two locations of the site, from forecasting data extracted at the site's wave buoy:
+# 1.- VHM0/Hs (significant wave height)
+# 2.- VTM02/Tm (mean period)
+# 3.- VMDR/shoreWaveDir (direction of the waves)
+# 4.- water_level/Freeboard (how high the water level is)
+# 5.- Wind Direction/shoreWindDir (wind direction)
+# 6.- Wind Speed/Wind(m/s) (wind speed)
+# Every function is driven by the site's entry of sites.SITES, which declares the site's buoy, tide file, wind sampling,
+# lead time buckets, regularisation rules and outputs, so all the sites go through the same extraction, regularisation
+# and inference path.
+
+# Authors: Michael McGlade, Nieves G. Valiente, Jennifer Brown, Christopher Stokes, Timothy Poate
+
+import functools
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+import joblib
+import numpy as np
+import pandas as pd
+import xarray as xr
+import admission
+import block_assembly
+import block_revalidation
+import block_state
+import feature_store
+import lead_time
+import metrics
+import prediction_cache
+import stage_timing
+import utils
+
+
+utils.loadConfigFile()
+
+logger = logging.getLogger(__name__)
+
+# Model inputs, in the order the models were trained with
+FEATURE_COLUMNS = ["Hs", "Tm", "shoreWaveDir", "Wind(m/s)", "shoreWindDir", "Freeboard"]
+# Names of the block's columns in the digital twin dataset
+DATASET_COLUMNS = {
+    "datetime": "time",
+    "Hs": "Hs",
+    "Tm": "Tm",
+    "shoreWaveDir": "shoreWaveDir",
+    "water_level": "Freeboard",
+    "Wind Speed": "Wind(m/s)",
+    "Wind Direction": "shoreWindDir",
+}
+# Tests of the regularisation rules' conditions, called with the feature's value and the condition's bound
+CONDITION_TESTS = {
+    "<": lambda value, bound: value < bound,
+    ">": lambda value, bound: value > bound,
+    "between": lambda value, bounds: bounds[0] <= value <= bounds[1],
+    "in": lambda value, values: value in values,
+}
+# Colours of the confidences above the high and medium thresholds, the low confidences colour is the site's
+HIGH_CONFIDENCE_COLOR = "#00008B"
+MEDIUM_CONFIDENCE_COLOR = "#4682B4"
+
+max_block_lookback_days = int(
+    os.environ.get("MAX_BLOCK_LOOKBACK_DAYS", "7")
+)  # how many days we may fall back when the requested block has not arrived yet.
+
+# Loaded models of every site, by model name and lead time model
+site_models = {}
+
+
+def get_data_sources(site, option):
+    """Get the data sources of a site for a dataset option
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        option (string): Dataset's option name
+
+    Returns:
+        Dictionary: Dataset's option name, wave folder, wind folder and water level file
+    """
+
+    wave_folder, wind_folder = utils.getLocationDataPaths(option)
+    return {
+        "option": option,  # names the data sources in the feature store
+        "wave_folder": wave_folder,
+        "wind_folder": wind_folder,
+        "water_level_file": site["water_level_file"],
+    }
+
+
+def get_wave_files(wave_folder, block_date):
+    """Get the wave files of a block
+
+    Args:
+        wave_folder (string): Wave folder's path
+        block_date (Date): Block's date, the unique identification code of each dataset
+
+    Returns:
+        Array: Array of files names
+    """
+
+    wave_files_index = utils.get_block_files_index(
+        wave_folder, (utils.WAVE_FILE_PREFIX,)
+    )
+    return wave_files_index[utils.WAVE_FILE_PREFIX].get(block_date, [])
+
+
+def get_wind_file(template, folder, date):
+    """Get the wind file of a block
+
+    Args:
+        template (string): Template of file's name
+        folder (string): Folder's name
+        date (Date): Block's date
+
+    Returns:
+        string: Path to wind file
+    """
+
+    prefix = template.format("")
+    wind_files = utils.get_block_files_index(folder, (prefix,))[prefix].get(date)
+    return wind_files[0] if wind_files else None
+
+
+@stage_timing.timed_stage
+def extract_wave_file_data(site, file_path):
+    """Extract the wave data of a single file at the site's wave buoy
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        file_path (string): Wave file path
+
+    Returns:
+        Dataframe: Wave data
+    """
+
+    with xr.open_dataset(file_path) as wave_dataset:
+        buoy_wave_dataset = wave_dataset.sel(
+            latitude=site["wave_buoy_latitude"],
+            longitude=site["wave_buoy_longitude"],
+            method="nearest",
+        )
+        wave_data = (
+            buoy_wave_dataset[["time", "VHM0", "VTM02", "VMDR"]]
+            .to_dataframe()
+            .reset_index()
+        )
+        wave_data = wave_data.rename(
+            columns={
+                "time": "datetime",
+                "VHM0": "Hs",
+                "VTM02": "Tm",
+                "VMDR": "shoreWaveDir",
+            }
+        )  # the names of the models' training dataset
+        wave_data = wave_data[["datetime", "Hs", "Tm", "shoreWaveDir"]]
+        wave_data["datetime"] = pd.to_datetime(wave_data["datetime"])
+    return wave_data
+
+
+def extract_wave_data(site, wave_files):
+    """Extract the wave data of a block at the site's wave buoy
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        wave_files (Array): Array of file names
+
+    Raises:
+        ValueError: Error's description
+
+    Returns:
+        Dataframe: Mean wave data
+    """
+
+    return block_assembly.combine_wave_data(
+        [extract_wave_file_data(site, file_path) for file_path in wave_files]
+    )
+
+
+@stage_timing.timed_stage
+def extract_wind_data(site, wind_file):
+    """Extract wind speed or direction data at the site's wave buoy
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        wind_file (string): Wind file path
+
+    Raises:
+        ValueError: Error's description
+
+    Returns:
+        Dataframe: Wind data, averaged over the site's wind mean hours when it has some
+    """
+
+    import pygrib  # imported on first use, cached blocks never need the GRIB reader
+
+    data = []
+    grbs = pygrib.open(wind_file)
+    for grb in grbs:
+        if grb.level != 10:
+            continue
+        forecast_time = grb.forecastTime
+        # Without averaging, only the hourly part of the forecast is read hourly, then every 3 hours
+        if (
+            site["wind_mean_hours"] is None
+            and forecast_time > block_assembly.HOURLY_FORECAST_HOURS
+            and forecast_time % 3 != 0
+        ):
+            continue
+
+        values = grb.values
+        lats, lons = grb.latlons()
+        converted_lons = np.where(lons > 180, lons - 360, lons)
+        distances = np.sqrt(
+            (lats - site["wave_buoy_latitude"]) ** 2
+            + (converted_lons - site["wave_buoy_longitude"]) ** 2
+        )
+        min_dist_index = np.unravel_index(distances.argmin(), distances.shape)
+        init_datetime = datetime.strptime(
+            f"{grb.dataDate:08d}{grb.dataTime:04d}", "%Y%m%d%H%M"
+        )
+        data.append(
+            {
+                "datetime": init_datetime + timedelta(hours=forecast_time),
+                "value": values[min_dist_index],
+            }
+        )
+    grbs.close()
+
+    if not data:
+        raise ValueError("There is no wind data available for the specified block.")
+    wind_data = pd.DataFrame(data)
+    wind_data["datetime"] = pd.to_datetime(wind_data["datetime"])
+    wind_data = wind_data.drop_duplicates(subset="datetime").set_index("datetime")
+    if site["wind_mean_hours"] is None:
+        return wind_data
+    return wind_data.resample(f"{site['wind_mean_hours']}h").mean()
+
+
+def read_water_level_file(water_level_file):
+    """Read a tide gauge's predicted water levels
+
+    Args:
+        water_level_file (string): Water level file path
+
+    Returns:
+        Dataframe: Water level indexed by time
+    """
+
+    water_level = pd.read_csv(
+        water_level_file,
+        sep=r"\s+",
+        header=None,
+        skiprows=2,
+        names=["date", "time", "water_level"],
+        engine="python",
+    )
+    water_level["datetime"] = pd.to_datetime(
+        water_level["date"] + " " + water_level["time"], format="%d/%m/%Y %H:%M"
+    )
+    return water_level.set_index("datetime")[["water_level"]]
+
+
+@stage_timing.timed_stage
+def extract_water_level_data(water_level_file):
+    """Extract the 3-hourly water level data
+
+    Args:
+        water_level_file (string): Water level file path
+
+    Returns:
+        Dataframe: Interpolated water level data
+    """
+
+    return read_water_level_file(water_level_file).resample("3h").interpolate()
+
+
+def extract_hourly_water_level_data(start_date, end_date, water_level_file):
+    """Extract the hourly water level data of a date range
+
+    Args:
+        start_date (Timestamp): Start date
+        end_date (Timestamp): End date
+        water_level_file (string): Water level file path
+
+    Returns:
+        Dataframe: Interpolated tidal level indexed by time
+    """
+
+    water_level = read_water_level_file(water_level_file).rename(
+        columns={"water_level": "tidal_level"}
+    )
+    water_level = water_level.rename_axis("Time").loc[start_date:end_date]
+    return water_level.asfreq("1h").interpolate()
+
+
+@stage_timing.timed_stage
+def process_block(site, block_date, data_sources):
+    """Combine the wind, wave and water level data of a block into a single dataset
+    When the requested block is missing, the latest available block within the look-back window is used instead.
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        block_date (Date): Forecast block's date
+        data_sources (Dictionary): Dataset's option name, wave folder, wind folder and water level file
+
+    Raises:
+        ValueError: No block could be read within the look-back window
+
+    Returns:
+        Dataframe, Date: Combined dataframe which holds wind, wave and water level data, resolved block's date
+    """
+
+    site_name = site["name"]
+    option = data_sources["option"]
+    process_site_block = functools.partial(process_available_block, site)
+    # Blocks in the feature store remain available once their raw files have been archived
+    stored_block_dates = feature_store.get_stored_block_dates(site_name, option)
+    available_block_dates = sorted(
+        set(
+            utils.get_available_block_dates(
+                data_sources["wave_folder"], data_sources["wind_folder"]
+            )
+        )
+        | set(stored_block_dates)
+    )
+    # A newly published block is built in the background while requests are served with the previous block
+    candidate_block_dates = block_revalidation.get_servable_block_dates(
+        site_name,
+        data_sources,
+        available_block_dates,
+        utils.get_candidate_block_dates(
+            available_block_dates, block_date, max_block_lookback_days
+        ),
+        stored_block_dates,
+        process_site_block,
+    )
+    for candidate_block_date in candidate_block_dates:
+        try:
+            block_data = process_site_block(candidate_block_date, data_sources)
+        except ValueError as e:
+            metrics.record_block_fallback(site_name, "unreadable_block")
+            # Handle unreadable data by using the previous available block
+            logger.warning(
+                "No data available for block %s: %s. Using the previous available block...",
+                candidate_block_date,
+                e,
+            )
+            continue
+
+        block_revalidation.mark_block_ready(site_name, option, candidate_block_date)
+        if candidate_block_date != block_date:
+            metrics.record_block_fallback(site_name, "previous_block")
+        return block_data, candidate_block_date
+
+    raise ValueError(
+        f"No data available for the {max_block_lookback_days} days up to block {block_date}."
+    )
+
+
+def process_available_block(site, block_date, data_sources):
+    """Combine the wind, wave and water level data of an available block into a single dataset
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        block_date (Date): Forecast block's date
+        data_sources (Dictionary): Dataset's option name, wave folder, wind folder and water level file
+
+    Raises:
+        ValueError: Error's description
+
+    Returns:
+        Dataframe: Combined dataframe which holds wind, wave and water level data
+    """
+
+    wave_folder = data_sources["wave_folder"]
+    wind_folder = data_sources["wind_folder"]
+    block_key = block_assembly.get_block_key(site["name"], data_sources, block_date)
+    block_data = feature_store.read_block(
+        site["name"], data_sources["option"], block_date, block_key
+    )
+    if block_data is None:
+        # Only the files which changed since this block was last assembled are extracted again
+        block_data = block_assembly.assemble_block(
+            block_key,
+            get_wave_files(wave_folder, block_date),
+            get_wind_file("agl_wind-speed-{}", wind_folder, block_date),
+            get_wind_file("agl_wind-direction-{}", wind_folder, block_date),
+            data_sources["water_level_file"],
+            functools.partial(extract_wave_file_data, site),
+            functools.partial(extract_wind_data, site),
+            extract_water_level_data,
+        )
+        feature_store.store_block(
+            site["name"], data_sources["option"], block_date, wave_folder, block_data
+        )
+
+    logger.debug(
+        "Processed Block: Start Date = %s, End Date = %s",
+        block_data["datetime"].min(),
+        block_data["datetime"].max(),
+    )
+    return block_data
+
+
+def get_next_block(start_date, wave_folder):
+    """Get the date of the block to process
+
+    Args:
+        start_date (Date): Forecast block's date
+        wave_folder (string): Wave folder's path
+
+    Returns:
+        Date: Requested block's date, or the latest published block's date when the requested block has not been published yet
+    """
+
+    logger.debug("Starting process for date: %s", start_date)
+    published_block_date = block_state.get_published_block(wave_folder)
+    if published_block_date is not None and published_block_date < start_date:
+        return published_block_date  # The requested block is still being ingested
+    return start_date
+
+
+def get_digital_twin_dataset(site, start_date, data_sources):
+    """Get the digital twin dataset of a site
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        start_date (Date): Forecast start date
+        data_sources (Dictionary): Dataset's option name, wave folder, wind folder and water level file
+
+    Raises:
+        ValueError: No block could be read within the look-back window
+
+    Returns:
+        Dataframe, Date: Digital twin dataframe, resolved block's date
+    """
+
+    block_data, block_date = process_block(
+        site, get_next_block(start_date, data_sources["wave_folder"]), data_sources
+    )
+    # Select relevant columns and rename for consistency with the model input
+    dataset = block_data[list(DATASET_COLUMNS)].rename(columns=DATASET_COLUMNS)
+    dataset["time"] = pd.to_datetime(dataset["time"])
+    return dataset, block_date
+
+
+@stage_timing.timed_stage
+def load_models(site):
+    """Load the pretrained models of a site, one per model and lead time model
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+    """
+
+    start = time.perf_counter()
+    models = site_models.setdefault(
+        site["name"], {"RF1": {}, "RF2": {}, "RF3": {}, "RF4": {"Regressor": {}}}
+    )
+    for file_name in os.listdir(site["models_folder"]):
+        model_name = next(
+            (model_name for model_name in models if model_name in file_name), None
+        )
+        lead_time_model = next(
+            (
+                lead_time_model
+                for lead_time_model in lead_time.LEAD_TIME_MODELS
+                if lead_time_model in file_name
+            ),
+            None,
+        )
+        if model_name is None or lead_time_model is None:
+            continue
+        # RF4 is a regression model, the others are classifiers
+        lead_time_models = (
+            models[model_name]["Regressor"]
+            if model_name == "RF4"
+            else models[model_name]
+        )
+        lead_time_models[lead_time_model] = joblib.load(
+            os.path.join(site["models_folder"], file_name)
+        )
+
+    metrics.record_model_load(site["name"], time.perf_counter() - start)
+
+
+def get_confidence_colors(confidences, confidence_colors):
+    """Get colours according to confidence values
+
+    Args:
+        confidences (List): Confidence values
+        confidence_colors (Tuple): High and medium confidence thresholds, and low confidence colour, of the overtopping output
+
+    Returns:
+        Array: Colours' names, gray for values which are not numbers
+    """
+
+    high_threshold, medium_threshold, low_color = confidence_colors
+    confidences = pd.to_numeric(
+        pd.Series(confidences, dtype=object), errors="coerce"
+    ).to_numpy(dtype=float)
+    return np.select(
+        [
+            confidences > high_threshold,
+            confidences > medium_threshold,
+            ~np.isnan(confidences),
+        ],
+        [HIGH_CONFIDENCE_COLOR, MEDIUM_CONFIDENCE_COLOR, low_color],
+        default="gray",
+    )
+
+
+@stage_timing.timed_stage
+def adjust_overtopping_features(
+    df,
+    sig_wave_height,
+    freeboard,
+    mean_wave_period,
+    mean_wave_dir,
+    wind_speed,
+    wind_direction,
+):
+    """Adjust wave and atmospheric features
+
+    Args:
+        df (Dataframe): Initial digital twin dataframe
+        sig_wave_height (integer): Significant wave height value in percentage
+        freeboard (integer): Freeboard value in percentage
+        mean_wave_period (integer): Mean wave period value in percentage
+        mean_wave_dir (integer): Mean wave direction value in degrees
+        wind_speed (integer): Wind speed value in percentage
+        wind_direction (integer): Wind direction value in degrees
+
+    Returns:
+        Dataframe: Dataframe with adjusted features values
+    """
+
+    df_adjusted = df.copy()
+    df_adjusted["Hs"] *= 1 + sig_wave_height / 100
+    df_adjusted["Tm"] *= 1 + mean_wave_period / 100
+    df_adjusted["shoreWaveDir"] = mean_wave_dir
+    df_adjusted["Wind(m/s)"] *= 1 + wind_speed / 100
+    df_adjusted["shoreWindDir"] = wind_direction
+    df_adjusted["Freeboard"] *= 1 + freeboard / 100
+    df_adjusted.attrs["scenario"] = (
+        sig_wave_height,
+        freeboard,
+        mean_wave_period,
+        mean_wave_dir,
+        wind_speed,
+        wind_direction,
+    )  # identifies cached predictions of these adjustments
+    return df_adjusted
+
+
+def adjust_freeboard_only(df, freeboard):
+    """Adjust freeboard value only
+
+    Args:
+        df (Dataframe): Hourly tidal level dataframe
+        freeboard (integer): Freeboard value in percentage
+
+    Returns:
+        Dataframe: Dataframe with adjusted tidal level values
+    """
+
+    df_adjusted = df.copy()
+    df_adjusted["tidal_level"] *= 1 + freeboard / 100
+    return df_adjusted
+
+
+def revise_prediction(site, model_name, prediction, row):
+    """Revise a model's prediction with the site's regularisation rules of the model, applied in order
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        model_name (string): Model's name
+        prediction (integer): Prediction's value
+        row (Series): Features data row
+
+    Returns:
+        integer: Final prediction's value
+    """
+
+    for rule in site["regularisation"].get(model_name, ()):
+        if prediction != rule["prediction"]:
+            continue
+        is_unless_rule = "unless_any" in rule
+        is_matched = any(
+            CONDITION_TESTS[test](row[feature_name], bound)
+            for feature_name, test, bound in rule[
+                "unless_any" if is_unless_rule else "when_any"
+            ]
+        )
+        if is_matched != is_unless_rule:
+            prediction = rule["revised_prediction"]
+    return prediction
+
+
+def predict_wave_overtopping(site, row, selected_model):
+    """Predict wave overtopping of a single row
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        row (Series): Row with adjusted wave and atmospheric variables
+        selected_model (string): Selected model's name according to forecast lead time
+
+    Returns:
+        Tuple: RF1 confidence, final RF1 prediction, RF2 overtopping count, RF3 and RF4 overtopping count, RF3 confidence which is None when RF3 was not run
+    """
+
+    models = site_models[site["name"]]
+    input_data = row[FEATURE_COLUMNS].to_frame().T
+
+    # RF1 predicts overtopping occurrence at the first location
+    rf1_model = models["RF1"][selected_model]
+    rf1_confidence = rf1_model.predict_proba(input_data)[0][1]
+    final_rf1_prediction = revise_prediction(
+        site, "RF1", rf1_model.predict(input_data)[0], row
+    )
+    if final_rf1_prediction == 0:
+        return rf1_confidence, final_rf1_prediction, 0, 0, None
+
+    # RF2 predicts the overtopping count at the first location
+    rf2_prediction = models["RF2"][selected_model].predict(input_data)[0]
+
+    # RF3 predicts overtopping occurrence at the second location
+    rf3_model = models["RF3"][selected_model]
+    rf3_confidence = rf3_model.predict_proba(input_data)[0][1]
+    final_rf3_prediction = revise_prediction(
+        site, "RF3", rf3_model.predict(input_data)[0], row
+    )
+    if final_rf3_prediction == 0:
+        return rf1_confidence, final_rf1_prediction, rf2_prediction, 0, rf3_confidence
+
+    # RF4 predicts the overtopping count at the second location, only when RF3 predicts overtopping
+    rf4_prediction = models["RF4"]["Regressor"][selected_model].predict(input_data)[0]
+    return (
+        rf1_confidence,
+        final_rf1_prediction,
+        rf2_prediction,
+        min(rf4_prediction, rf2_prediction),
+        rf3_confidence,
+    )
+
+
+@stage_timing.timed_stage
+def process_wave_overtopping(site, df_adjusted):
+    """Predict wave overtopping at both locations of a site
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        df_adjusted (Dataframe): Main dataframe with adjusted wave and atmospheric variables, the predictions are added to it
+
+    Returns:
+        Dataframes: First location and second location wave-overtopping-events dataframes
+    """
+
+    time_stamps = df_adjusted["time"].dropna()
+    rf1_predictions = []
+    rf1_confidences = []
+    overtopping_counts_rf1_rf2 = []
+    overtopping_counts_rf3_rf4 = []
+    rf3_confidences = []
+
+    # Predictions of unchanged rows are reused from previous requests of the same block and scenario
+    cached_predictions = prediction_cache.get_predictions(
+        df_adjusted.attrs.get("block_key"), df_adjusted.attrs.get("scenario")
+    )
+
+    # The pretrained model of each timestamp depends on its forecast lead time
+    lead_time_hours = lead_time.get_lead_time_hours(
+        df_adjusted["time"], df_adjusted["time"].iloc[0]
+    )
+    lead_time_codes = lead_time.get_lead_time_codes(
+        lead_time_hours, site["lead_time_bucket_hours"]
+    )
+
+    for (idx, row), forecast_hour, lead_time_code in zip(
+        df_adjusted.iterrows(), lead_time_hours, lead_time_codes
+    ):
+        # Only predict hourly during the hourly part of the forecast, then 3-hourly
+        if pd.isna(row["time"]) or (
+            forecast_hour > block_assembly.HOURLY_FORECAST_HOURS
+            and forecast_hour % 3 != 0
+        ):
+            continue
+
+        selected_model = lead_time.LEAD_TIME_MODELS[lead_time_code]
+        model_inputs = (selected_model, *row[FEATURE_COLUMNS])
+        prediction = prediction_cache.get_prediction(
+            cached_predictions, row["time"], model_inputs
+        )
+        if prediction is None:
+            admission.admit_cold_computation()
+            prediction = predict_wave_overtopping(site, row, selected_model)
+            prediction_cache.set_prediction(
+                cached_predictions, row["time"], model_inputs, prediction
+            )
+
+        (
+            rf1_confidence,
+            final_rf1_prediction,
+            rf2_prediction,
+            rf3_rf4_prediction,
+            rf3_confidence,
+        ) = prediction
+        rf1_confidences.append(rf1_confidence)
+        rf1_predictions.append(final_rf1_prediction)
+        overtopping_counts_rf1_rf2.append(rf2_prediction)
+        overtopping_counts_rf3_rf4.append(rf3_rf4_prediction)
+        if rf3_confidence is not None:
+            rf3_confidences.append(rf3_confidence)
+        elif not site["pack_rf3_confidences"]:
+            rf3_confidences.append(0)
+
+    # Sites packing the RF3 confidences list those of the timestamps where RF3 was run first, then zeros
+    rf3_confidences.extend([0] * (len(df_adjusted) - len(rf3_confidences)))
+
+    df_adjusted["RF1_Final_Predictions"] = rf1_predictions
+    df_adjusted["RF2_Overtopping_Count"] = overtopping_counts_rf1_rf2
+    df_adjusted["RF3_Final_Predictions"] = overtopping_counts_rf3_rf4
+    df_adjusted["RF1_Confidence"] = rf1_confidences
+    df_adjusted["RF3_Confidence"] = rf3_confidences
+
+    data_rf1_rf2 = pd.DataFrame(
+        {
+            "Time": time_stamps,
+            "Overtopping Count": overtopping_counts_rf1_rf2,
+            "Confidence": rf1_confidences,
+        }
+    )
+    data_rf3_rf4 = pd.DataFrame(
+        {
+            "Time": time_stamps,
+            "Overtopping Count": overtopping_counts_rf3_rf4,
+            "Confidence": rf3_confidences,
+        }
+    )
+    return data_rf1_rf2, data_rf3_rf4
+
+
+def get_overtopping_times_data(dataset, feature_name):
+    """Get a feature's values at the overtopping events
+
+    Args:
+        dataset (Dataframe): Digital twin dataframe with overtopping predictions
+        feature_name (string): Feature's name
+
+    Returns:
+        Dataframe: Overtopping events times dataframe
+    """
+
+    overtopping_times = pd.DataFrame()
+    overtopping_times_filtered = [
+        time
+        for time in dataset[dataset["RF1_Final_Predictions"] == 1]["time"]
+        if time in dataset["time"].values
+    ]
+    overtopping_times[feature_name] = dataset[
+        dataset["time"].isin(overtopping_times_filtered)
+    ][feature_name]
+    overtopping_times["overtopping_time"] = overtopping_times_filtered
+    return overtopping_times
+
+
+@stage_timing.timed_stage
+def get_interpolated_feature_data(site, dataset, feature_names):
+    """Interpolate features in time, onto an hourly time axis for the sites with hourly features
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        dataset (Dataframe): Digital twin dataframe
+        feature_names (Tuple): Names of the features to interpolate
+
+    Returns:
+        Dataframe: Interpolated features with their time
+    """
+
+    features = dataset[["time", *feature_names]].set_index("time")
+    if site["hourly_features"]:
+        features = features.reindex(
+            pd.date_range(
+                start=dataset["time"].min(), end=dataset["time"].max(), freq="1h"
+            )
+        )
+    return features.interpolate(method="time").rename_axis("time").reset_index()
+
+
+@stage_timing.timed_stage
+def get_feature_and_overtopping_times_data(site, dataset, feature_name):
+    """Get a feature's interpolated data and its values at the overtopping events
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        dataset (Dataframe): Digital twin dataframe with overtopping predictions
+        feature_name (string): Feature's name
+
+    Returns:
+        Dataframes: Interpolated feature with its time, and forecast-overtopping-events dataframes
+    """
+
+    # Only the feature is interpolated, the other columns are not part of the feature data
+    return (
+        get_interpolated_feature_data(site, dataset, (feature_name,)),
+        get_overtopping_times_data(dataset, feature_name),
+    )
+
+
+@stage_timing.timed_stage
+def get_combined_features_data(site, dataset, water_level_file):
+    """Get the data of the combined features plot
+
+    Args:
+        site (Dictionary): Site's entry of sites.SITES
+        dataset (Dataframe): Digital twin dataframe with overtopping predictions
+        water_level_file (string): Water level file path
+
+    Returns:
+        Tuple: Interpolated features dataframe, overtopping events times, hourly water level dataframe, forecast start and end dates
+    """
+
+    start_date = dataset["time"].min()
+    end_date = dataset["time"].max()
+    return (
+        get_interpolated_feature_data(site, dataset, ("Hs", "Wind(m/s)")),
+        dataset[dataset["RF1_Final_Predictions"] == 1]["time"],
+        extract_hourly_water_level_data(start_date, end_date, water_level_file),
+        start_date,
+        end_date,
+    )
@@ -0,0 +1,373 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Combined features plots of each site rendered on demand"""
+
+# Plots are rendered in memory with the object-oriented Agg API by a bounded pool of processes, never by the request
+# thread, so renders neither hold the worker's GIL nor share matplotlib's state between threads. The pool is started on the
+# first render, and matplotlib is only imported by its processes. Each worker keeps the images of its most recently used
+# blocks and scenarios, together with a signature of the plotted data, so an image is only rendered again when its data
+# changes. Concurrent requests for the same image wait for a single render.
+
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+import numpy as np
+import pandas as pd
+import admission
+import metrics
+import utils
+
+
+utils.loadConfigFile()
+
+PLOT_DPI = 300
+
+feature_plots_cache_size = int(os.environ.get("FEATURE_PLOTS_CACHE_SIZE", "16"))
+feature_plots_workers = int(os.environ.get("FEATURE_PLOTS_WORKERS", "2"))
+cached_plots = OrderedDict()
+pending_plots = {}
+cached_plots_lock = threading.Lock()
+plots_executor = None
+
+
+def format_time_axes(axs):
+    """Format the shared time axis of the subplots
+
+    Args:
+        axs (Array): Subplots axes
+    """
+
+    from matplotlib.dates import DateFormatter
+
+    for ax in axs:
+        ax.xaxis.set_major_formatter(DateFormatter("%Y-%m-%d %H:%M"))
+        ax.tick_params(axis="x", rotation=90, labelsize=8)
+        ax.tick_params(axis="y", labelsize=8)
+
+
+def scatter_overtopping_counts(ax, time_stamps, counts, colors, no_overtopping_size):
+    """Plot overtopping counts with a single scatter per class, crosses without overtopping and circles by confidence colour
+
+    Args:
+        ax (Axes): Plot's axes
+        time_stamps (List): Time stamps of the counts
+        counts (List): Overtopping counts
+        colors (Array): Confidence colour of each count
+        no_overtopping_size (integer): Size of the no overtopping crosses
+    """
+
+    time_stamps = np.asarray(time_stamps)
+    counts = np.asarray(counts)
+    colors = np.asarray(colors)
+    no_overtopping = counts == 0
+
+    if no_overtopping.any():
+        ax.scatter(
+            time_stamps[no_overtopping],
+            counts[no_overtopping],
+            marker="x",
+            color="black",
+            s=no_overtopping_size,
+            linewidths=1.5,
+        )
+    for color in pd.unique(colors[~no_overtopping]):
+        confidence_class = ~no_overtopping & (colors == color)
+        ax.scatter(
+            time_stamps[confidence_class],
+            counts[confidence_class],
+            marker="o",
+            color=color,
+            s=75,
+            edgecolor="black",
+            linewidth=1,
+        )
+
+
+def get_png_bytes(fig):
+    """Render a figure into PNG bytes
+
+    Args:
+        fig (Figure): Figure to render
+
+    Returns:
+        bytes: PNG image
+    """
+
+    fig.tight_layout()
+    output = BytesIO()
+    fig.savefig(output, dpi=PLOT_DPI, format="png")
+    return output.getvalue()
+
+
+def render_dawlish_combined_features_plot(
+    df, overtopping_times, water_level, start_date, end_date
+):
+    """Render the Dawlish significant wave height, freeboard and wind speed plot
+
+    Args:
+        df (Dataframe): Hourly features dataframe
+        overtopping_times (Series): Overtopping events times
+        water_level (Dataframe): Hourly water level dataframe
+        start_date (Timestamp): Forecast start date
+        end_date (Timestamp): Forecast end date
+
+    Returns:
+        bytes: PNG image
+    """
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 9), dpi=PLOT_DPI)
+    FigureCanvasAgg(fig)
+    axs = fig.subplots(3, 1, sharex=True)
+    overtopping_times_filtered = [
+        time for time in overtopping_times if time in df["time"].values
+    ]
+
+    # Hs
+    axs[0].plot(
+        df["time"],
+        df["Hs"],
+        label="Significant Wave Height (Hs)",
+        linewidth=1.5,
+        color="blue",
+    )
+    axs[0].scatter(
+        overtopping_times_filtered,
+        df[df["time"].isin(overtopping_times_filtered)]["Hs"],
+        color="red",
+        label="Overtopping Event",
+        zorder=5,
+    )
+    axs[0].set_ylabel("Hs (m)", fontsize=10)
+    axs[0].set_ylim(0, 5)
+    axs[0].legend(loc="upper left", fontsize=8)
+    axs[0].grid(True)
+
+    # Freeboard
+    axs[1].plot(
+        water_level.index,
+        water_level["tidal_level"],
+        label="Freeboard (m)",
+        linewidth=1.5,
+        color="orange",
+    )
+    axs[1].scatter(
+        overtopping_times_filtered,
+        water_level.loc[
+            water_level.index.isin(overtopping_times_filtered), "tidal_level"
+        ],
+        color="red",
+        label="Overtopping Event",
+        zorder=5,
+    )
+    axs[1].set_ylabel("Freeboard (m)", fontsize=10)
+    axs[1].set_ylim(0, 6)
+    axs[1].legend(loc="upper left", fontsize=8)
+    axs[1].grid(True)
+
+    # Wind Speed
+    axs[2].plot(
+        df["time"],
+        df["Wind(m/s)"],
+        label="Wind Speed (m/s)",
+        linewidth=1.5,
+        color="green",
+    )
+    axs[2].scatter(
+        overtopping_times_filtered,
+        df[df["time"].isin(overtopping_times_filtered)]["Wind(m/s)"],
+        color="red",
+        label="Overtopping Event",
+        zorder=5,
+    )
+    axs[2].set_ylabel("Wind Speed (m/s)", fontsize=10)
+    axs[2].set_ylim(0, 25)
+    axs[2].set_xlabel("Time", fontsize=10)
+    axs[2].legend(loc="upper left", fontsize=8)
+    axs[2].grid(True)
+
+    for ax in axs:
+        ax.set_xlim([start_date, end_date])
+    format_time_axes(axs)
+
+    return get_png_bytes(fig)
+
+
+def render_penzance_combined_features_plot(
+    df, overtopping_times, water_level, start_date, end_date
+):
+    """Render the Penzance significant wave height, freeboard and wind speed plot
+
+    Args:
+        df (Dataframe): Interpolated features dataframe
+        overtopping_times (Series): Overtopping events times
+        water_level (Dataframe): Hourly water level dataframe
+        start_date (Timestamp): Unused, the plot spans its data
+        end_date (Timestamp): Unused, the plot spans its data
+
+    Returns:
+        bytes: PNG image
+    """
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 8), dpi=PLOT_DPI)
+    FigureCanvasAgg(fig)
+    axs = fig.subplots(3, 1, sharex=True)
+
+    # Hs
+    axs[0].plot(
+        df["time"],
+        df["Hs"],
+        label="Significant Wave Height (Hs)",
+        linewidth=1.5,
+        color="blue",
+    )
+    axs[0].scatter(
+        overtopping_times,
+        df.loc[df["time"].isin(overtopping_times), "Hs"],
+        color="red",
+        label="Overtopping Event",
+        zorder=5,
+    )
+    axs[0].set_ylabel("Hs (m)", fontsize=10)
+    axs[0].set_ylim(0, 5)
+    axs[0].legend(loc="upper left", fontsize=8)
+    axs[0].grid(True)
+
+    # Freeboard
+    axs[1].plot(
+        water_level.index,
+        water_level["tidal_level"],
+        label="Freeboard (Hourly)",
+        linewidth=1.5,
+        color="orange",
+    )
+    axs[1].scatter(
+        overtopping_times,
+        water_level.loc[water_level.index.isin(overtopping_times), "tidal_level"],
+        color="red",
+        label="Overtopping Event",
+        zorder=5,
+    )
+    axs[1].set_ylabel("Freeboard (m)", fontsize=10)
+    axs[1].legend(loc="upper left", fontsize=8)
+    axs[1].grid(True)
+
+    # Wind Speed
+    axs[2].plot(
+        df["time"],
+        df["Wind(m/s)"],
+        label="Wind Speed (m/s)",
+        linewidth=1.5,
+        color="green",
+    )
+    axs[2].scatter(
+        overtopping_times,
+        df.loc[df["time"].isin(overtopping_times), "Wind(m/s)"],
+        color="red",
+        label="Overtopping Event",
+        zorder=5,
+    )
+    axs[2].set_ylabel("Wind Speed (m/s)", fontsize=10)
+    axs[2].set_ylim(0, 25)
+    axs[2].legend(loc="upper left", fontsize=8)
+    axs[2].grid(True)
+    axs[2].set_xlabel("Time", fontsize=10)
+
+    format_time_axes(axs)
+
+    return get_png_bytes(fig)
+
+
+def get_data_signature(plot_data):
+    """Get a signature of the plotted data
+
+    Args:
+        plot_data (Tuple): Arguments of the plot's renderer
+
+    Returns:
+        Tuple: Hash of every dataframe or series, other arguments as they are
+    """
+
+    return tuple(
+        (
+            int(pd.util.hash_pandas_object(value).sum())
+            if isinstance(value, (pd.DataFrame, pd.Series))
+            else value
+        )
+        for value in plot_data
+    )
+
+
+def get_plots_executor():
+    """Get the pool of processes rendering the plots, starting it on first use, with cached_plots_lock held
+
+    Returns:
+        ProcessPoolExecutor: Plots' pool
+    """
+
+    global plots_executor
+    if plots_executor is None:
+        # Spawned processes do not inherit the threads and locks of the worker
+        plots_executor = ProcessPoolExecutor(
+            max_workers=feature_plots_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return plots_executor
+
+
+def get_plot(plot_key, render_plot, *plot_data):
+    """Get a plot image, rendering it in the pool of processes when it is not cached
+
+    Args:
+        plot_key (Tuple): Site's name, block's key and scenario identifying the plot
+        render_plot (Function): Plot's renderer, a function of this module
+        plot_data (Tuple): Arguments of the plot's renderer
+
+    Returns:
+        bytes: PNG image
+    """
+
+    data_signature = get_data_signature(plot_data)
+    with cached_plots_lock:
+        cached_plot = cached_plots.get(plot_key)
+        is_hit = cached_plot is not None and cached_plot[0] == data_signature
+        metrics.record_cache_lookup("feature_plots", is_hit)
+        if is_hit:
+            cached_plots.move_to_end(plot_key)
+            return cached_plot[1]
+
+    admission.admit_cold_computation()
+    with cached_plots_lock:
+        render_key = (plot_key, data_signature)
+        future = pending_plots.get(render_key)
+        is_owner = future is None
+        if is_owner:
+            future = get_plots_executor().submit(render_plot, *plot_data)
+            pending_plots[render_key] = future
+
+    try:
+        png = future.result()
+    finally:
+        if is_owner:
+            with cached_plots_lock:
+                del pending_plots[render_key]
+
+    if is_owner:
+        with cached_plots_lock:
+            cached_plots[plot_key] = (data_signature, png)
+            cached_plots.move_to_end(plot_key)
+            evictions_count = max(len(cached_plots) - feature_plots_cache_size, 0)
+            for _ in range(evictions_count):
+                cached_plots.popitem(last=False)
+        metrics.record_cache_evictions("feature_plots", evictions_count)
+    return png
@@ -0,0 +1,160 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Parquet store of the buoy-point features extracted from each block"""
+
+# The wave, wind and water level series extracted at the buoy point of a site are stored as one Parquet file per site,
+# dataset option and block, in hive-style partition folders, e.g. site=dawlish/option=storm_bert/block_date=2024-11-20/
+# part-0.parquet. A block is only stored once it has been published, i.e. all its files have arrived, and a stored block
+# is never written again. Stored blocks are read instead of the raw Met Office files, which may then be archived.
+
+import logging
+import os
+from datetime import datetime
+import pandas as pd
+import block_state
+import utils
+
+
+utils.loadConfigFile()
+
+logger = logging.getLogger(__name__)
+
+PARTITION_FILE_NAME = "part-0.parquet"
+BLOCK_DATE_PARTITION_PREFIX = "block_date="
+
+feature_store_folder = os.environ.get("FEATURE_STORE_FOLDER")
+
+
+def get_option_folder(site, option):
+    """Get the folder of the features files of a site and dataset option
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+
+    Returns:
+        string: Path to option's folder
+    """
+
+    return os.path.join(feature_store_folder, f"site={site}", f"option={option}")
+
+
+def get_partition_path(site, option, block_date):
+    """Get the path of the features file of a block
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        block_date (Date): Block's date
+
+    Returns:
+        string: Path to features file
+    """
+
+    return os.path.join(
+        get_option_folder(site, option),
+        f"{BLOCK_DATE_PARTITION_PREFIX}{block_date.strftime('%Y-%m-%d')}",
+        PARTITION_FILE_NAME,
+    )
+
+
+def get_stored_block_dates(site, option):
+    """Get dates of the stored blocks of a site and dataset option
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+
+    Returns:
+        List: Sorted blocks dates, empty when the store is disabled
+    """
+
+    if not feature_store_folder:
+        return []
+
+    option_folder = get_option_folder(site, option)
+    try:
+        partition_names = os.listdir(option_folder)
+    except OSError:
+        return []
+
+    block_dates = []
+    for partition_name in partition_names:
+        if not partition_name.startswith(BLOCK_DATE_PARTITION_PREFIX):
+            continue
+        try:
+            block_date = datetime.strptime(
+                partition_name[len(BLOCK_DATE_PARTITION_PREFIX) :], "%Y-%m-%d"
+            ).date()
+        except ValueError:
+            continue
+        if os.path.exists(
+            os.path.join(option_folder, partition_name, PARTITION_FILE_NAME)
+        ):
+            block_dates.append(block_date)
+    return sorted(block_dates)
+
+
+def read_block(site, option, block_date, block_key):
+    """Read the stored features of a block
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        block_date (Date): Block's date
+        block_key (Tuple): Block's key, as set by the block assembly
+
+    Returns:
+        Dataframe: Combined dataframe which holds wind, wave and water level data, None when the block is not stored
+    """
+
+    if not feature_store_folder:
+        return None
+
+    try:
+        block_data = pd.read_parquet(get_partition_path(site, option, block_date))
+    except FileNotFoundError:
+        return None
+
+    block_data.attrs["block_key"] = block_key
+    return block_data
+
+
+def store_block(site, option, block_date, wave_folder, block_data):
+    """Store the features of a published block, unless they are already stored
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        block_date (Date): Block's date
+        wave_folder (string): Wave folder's path
+        block_data (Dataframe): Combined dataframe which holds wind, wave and water level data
+
+    Returns:
+        string: Path to features file, None when nothing was stored
+    """
+
+    if not feature_store_folder:
+        return None
+
+    # Files of unpublished blocks may still be arriving
+    published_block_date = block_state.get_published_block(wave_folder)
+    if published_block_date is None or block_date > published_block_date:
+        return None
+
+    partition_path = get_partition_path(site, option, block_date)
+    if os.path.exists(partition_path):
+        return None
+
+    # The block's key is only meaningful to the worker, pandas would save it in the file's metadata
+    stored_data = block_data.copy(deep=False)
+    stored_data.attrs = {}
+    try:
+        os.makedirs(os.path.dirname(partition_path), exist_ok=True)
+        utils.write_file_atomically(partition_path, stored_data.to_parquet(index=False))
+    except OSError as e:
+        logger.error("Features of block %s could not be stored: %s", block_date, e)
+        return None
+    return partition_path
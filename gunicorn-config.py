@@ -3,7 +3,33 @@
 # SPDX-License-Identifier: MIT
 
 import os
+import shutil
+import tempfile
 
 workers = int(os.environ.get('GUNICORN_PROCESSES', '2'))
 threads = int(os.environ.get('GUNICORN_THREADS', '4'))
 bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8080')
+
+
+# Workers write their Prometheus metrics to a shared folder, merged by the /metrics route of any worker
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), 'splash-dashboard-metrics'),
+)
+
+
+def on_starting(server):
+    """Clear the metrics left in the shared folder by a previous run"""
+
+    metrics_folder = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_folder, ignore_errors=True)
+    os.makedirs(metrics_folder)
+
+
+def child_exit(server, worker):
+    """Drop the live metrics of an exited worker"""
+
+    # Imported here so that the workers forked from the master import prometheus_client after PROMETHEUS_MULTIPROC_DIR is set
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
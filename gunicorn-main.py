@@ -2,638 +2,340 @@
 
 # SPDX-License-Identifier: MIT
 
-from flask import Flask, jsonify, request
-import dawlish_final_digital_twin_script_upgraded as ddt
-import penzance_final_digital_twin_script_upgraded as pdt
+from flask import Flask, Response, abort, g, jsonify, make_response, request
+import admission
+import block_revalidation
+import logs
+import metrics
 import os
+import prediction_store
+import profiling
+import single_flight
+import sites
+import stage_timing
 import utils
+import wave_rasters
 
 
 utils.loadConfigFile()
 
-SPLASH_DT_Dawlish_models_folder = os.environ.get("DAWLISH_MODELS_FOLDER")
-SPLASH_DT_Penzance_models_folder = os.environ.get("PENZANCE_MODELS_FOLDER")
-dawlish_lat_seawall = os.environ.get("DAWLISH_LAT_SEAWALL")
-dawlish_lon_seawall = os.environ.get("DAWLISH_LON_SEAWALL")
-penzance_lat_seawall = os.environ.get("PENZANCE_LAT_SEAWALL")
-penzance_lon_seawall = os.environ.get("PENZANCE_LON_SEAWALL")
 DEBUG = eval(
     os.environ.get("DEBUG").capitalize()
 )  # make DEBUG a boolean, we must ensure the string always starts in caps e.g. True/False as that's all eval recognises
 app = Flask(__name__)
+logs.configure_logging()
 
 
-@app.route("/splash/dawlish/wave-overtopping", methods=["GET"])
-def get_dawlish_wave_overtopping():
-    """Get Dawlish forecast wave overtopping data
+def get_route_name():
+    """Get the name of the request's route, with the registered site and product it asks for
 
     Returns:
-        Json: Dawlish forecast wave overtopping data in json format
+        string: Route's rule, with its site and product names when they are registered, unmatched for unknown routes
     """
 
-    option = request.args.get("option", "dawlish")
-    (
-        date_object,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    ) = utils.get_query_params_values(
-        "start_date",
-        "sig_wave_height",
-        "freeboard",
-        "mean_wave_period",
-        "mean_wave_dir",
-        "wind_speed",
-        "wind_direction",
-    )
+    if request.url_rule is None:
+        return "unmatched"
+    route_name = request.url_rule.rule
+    site_name = request.view_args.get("site_name")
+    if site_name in sites.SITES:
+        route_name = route_name.replace("<site_name>", site_name)
+    product_name = request.view_args.get("product_name")
+    if product_name in sites.PRODUCTS:
+        route_name = route_name.replace("<product_name>", product_name)
+    return route_name
 
-    ddt.setInputFolderPaths(option)
-    final_DawlishTwin_dataset = ddt.get_digital_twin_dataset(date_object)
-    final_DawlishTwin_dataset_adjusted = ddt.adjust_overtopping_features(
-        final_DawlishTwin_dataset,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    )
-    ddt.load_models(SPLASH_DT_Dawlish_models_folder)
 
-    seawall_crest_overtopping_df, railway_line_overtopping_df = (
-        ddt.process_wave_overtopping(final_DawlishTwin_dataset_adjusted)
-    )
-    seawall_crest_overtopping_df = seawall_crest_overtopping_df.rename(
-        columns={"Confidence": "confidence", "Overtopping Count": "overtopping_count"}
-    )
-    railway_line_overtopping_df = railway_line_overtopping_df.rename(
-        columns={"Confidence": "confidence", "Overtopping Count": "overtopping_count"}
-    )
+@app.before_request
+def start_request_logging():
+    """Set the correlation id of the request"""
 
-    seawall_crest_overtopping = utils.convert_df_to_json_data(
-        seawall_crest_overtopping_df
-    )
-    railway_line_overtopping = utils.convert_df_to_json_data(
-        railway_line_overtopping_df
-    )
+    logs.start_request_logging(request.headers.get(logs.REQUEST_ID_HEADER))
 
-    return jsonify(
-        {
-            "seawall_crest_overtopping": seawall_crest_overtopping,
-            "railway_line_overtopping": railway_line_overtopping,
-        }
-    )
 
+@app.after_request
+def add_request_id(response):
+    """Return the correlation id of the request in the response's X-Request-ID header
 
-@app.route("/splash/penzance/wave-overtopping", methods=["GET"])
-def get_penzance_wave_overtopping():
-    """Get Penzance forecast wave overtopping data
+    Args:
+        response (Response): Request's response
 
     Returns:
-        Json: Penzance forecast wave overtopping data in json format
+        Response: Response with the X-Request-ID header
     """
 
-    option = request.args.get("option", "penzance")
-    (
-        date_object,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    ) = utils.get_query_params_values(
-        "start_date",
-        "sig_wave_height",
-        "freeboard",
-        "mean_wave_period",
-        "mean_wave_dir",
-        "wind_speed",
-        "wind_direction",
-    )
-
-    pdt.setInputFolderPaths(option)
-    final_Penzance_Twin_dataset, start_time, start_date_block = (
-        pdt.get_digital_twin_dataset(date_object)
-    )
-    final_Penzance_Twin_dataset_adjusted = pdt.adjust_overtopping_features(
-        final_Penzance_Twin_dataset,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    )
-    pdt.load_model_files(SPLASH_DT_Penzance_models_folder)
-    final_Penzance_Twin_dataset_adjusted = pdt.add_selected_model_col(
-        final_Penzance_Twin_dataset_adjusted, start_time
-    )
+    request_id = logs.request_id.get()
+    if request_id is not None:
+        response.headers[logs.REQUEST_ID_HEADER] = request_id
+    logs.finish_request_logging()
+    return response
 
-    seawall_crest_overtopping_df, seawall_crest_sheltered_overtopping_df = (
-        pdt.process_wave_overtopping(final_Penzance_Twin_dataset_adjusted, start_time)
-    )
-    seawall_crest_overtopping_df = seawall_crest_overtopping_df.rename(
-        columns={"Confidence": "confidence", "Overtopping Count": "overtopping_count"}
-    )
-    seawall_crest_sheltered_overtopping_df = (
-        seawall_crest_sheltered_overtopping_df.rename(
-            columns={
-                "Confidence": "confidence",
-                "Overtopping Count": "overtopping_count",
-            }
-        )
-    )
 
-    seawall_crest_overtopping = utils.convert_df_to_json_data(
-        seawall_crest_overtopping_df
-    )
-    seawall_crest_sheltered_overtopping = utils.convert_df_to_json_data(
-        seawall_crest_sheltered_overtopping_df
-    )
+@app.before_request
+def start_request_admission():
+    """Assign the request to its admission lane"""
 
-    return jsonify(
-        {
-            "seawall_crest_overtopping": seawall_crest_overtopping,
-            "seawall_crest_sheltered_overtopping": seawall_crest_sheltered_overtopping,
-        }
-    )
+    admission.start_request_admission(request.args)
 
 
-@app.route("/splash/dawlish/significant-wave-height", methods=["GET"])
-def get_dawlish_significant_wave_height():
-    """Get Dawlish significant wave height data and overtopping times data
+@app.teardown_request
+def finish_request_admission(error):
+    """Release the admission slot held by the request, if any
 
-    Returns:
-        Json:  Dawlish significant wave height data and forecast wave overtopping times data in Json format
+    Args:
+        error (Exception): Unhandled error of the request, None when there is none
     """
 
-    option = request.args.get("option", "dawlish")
-    (
-        date_object,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    ) = utils.get_query_params_values(
-        "start_date",
-        "sig_wave_height",
-        "freeboard",
-        "mean_wave_period",
-        "mean_wave_dir",
-        "wind_speed",
-        "wind_direction",
-    )
+    admission.finish_request_admission()
+
+
+@app.before_request
+def start_stage_timings():
+    """Start recording the pipeline stage timings of the request"""
+
+    stage_timing.start_request_timings()
 
-    ddt.setInputFolderPaths(option)
-    final_DawlishTwin_dataset = ddt.get_digital_twin_dataset(date_object)
-    final_DawlishTwin_dataset_adjusted = ddt.adjust_overtopping_features(
-        final_DawlishTwin_dataset,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    )
 
-    ddt.load_models(SPLASH_DT_Dawlish_models_folder)
-    ddt.process_wave_overtopping(final_DawlishTwin_dataset_adjusted)
+@app.after_request
+def add_stage_timings(response):
+    """Add the pipeline stage timings of the request to the response's Server-Timing header, log them and record the request's metrics
+
+    Args:
+        response (Response): Request's response
+
+    Returns:
+        Response: Response with the Server-Timing header
+    """
 
-    interpolated_DawlishTwin_dataset, overtopping_times_by_feature_df = (
-        ddt.get_feature_and_overtopping_times_data(
-            final_DawlishTwin_dataset_adjusted, "Hs"
+    stage_timings = stage_timing.finish_request_timings()
+    if stage_timings is not None:
+        response.headers["Server-Timing"] = stage_timing.get_server_timing_header(
+            stage_timings
         )
-    )
-    interpolated_DawlishTwin_dataset = interpolated_DawlishTwin_dataset.rename(
-        columns={"Hs": "significant_wave_height", "time": "Time"}
-    )
-    overtopping_times_by_feature_df = overtopping_times_by_feature_df.rename(
-        columns={"Hs": "significant_wave_height", "overtopping_time": "Time"}
-    )
-    interpolated_DawlishTwin_dataset = interpolated_DawlishTwin_dataset.drop(
-        [
-            "Freeboard",
-            "RF1_Confidence",
-            "RF1_Final_Predictions",
-            "RF2_Overtopping_Count",
-            "RF3_Confidence",
-            "RF3_Final_Predictions",
-            "Tm",
-            "Wind(m/s)",
-            "shoreWaveDir",
-            "shoreWindDir",
-        ],
-        axis=1,
-    )
+        logs.log_request(
+            request.method,
+            request.path,
+            request.args.to_dict(),
+            response.status_code,
+            stage_timings,
+        )
+        metrics.record_request(
+            get_route_name(),
+            request.method,
+            response.status_code,
+            stage_timings,
+        )
+    return response
 
-    significant_wave_height = utils.convert_df_to_json_data(
-        interpolated_DawlishTwin_dataset
-    )
-    overtopping_times = utils.convert_df_to_json_data(overtopping_times_by_feature_df)
 
-    return jsonify(
-        {
-            "significant_wave_heights": significant_wave_height,
-            "overtopping_times": overtopping_times,
-        }
-    )
+@app.before_request
+def start_request_profile():
+    """Start profiling the request when an admin asks for it"""
+
+    if profiling.is_profiling_requested(request.headers):
+        g.profile = profiling.start_profile()
+
 
+@app.after_request
+def write_request_profile(response):
+    """Write the profile of a profiled request and add its file name to the response's X-Profile header
 
-@app.route("/splash/dawlish/tidal-level", methods=["GET"])
-def get_dawlish_water_level():
-    """Get Dawlish tidal level data and overtopping times data
+    Args:
+        response (Response): Request's response
 
     Returns:
-         Json:  Dawlish tidal level data and forecast wave overtopping times data in Json format
+        Response: Response with the X-Profile header when the request was profiled
     """
 
-    option = request.args.get("option", "dawlish")
-    (
-        date_object,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    ) = utils.get_query_params_values(
-        "start_date",
-        "sig_wave_height",
-        "freeboard",
-        "mean_wave_period",
-        "mean_wave_dir",
-        "wind_speed",
-        "wind_direction",
-    )
+    profile = g.pop("profile", None)
+    if profile is not None:
+        profile_name = profiling.stop_profile(
+            profile,
+            request.method,
+            get_route_name(),
+            request.path,
+            request.args.to_dict(),
+            response.status_code,
+        )
+        if profile_name is not None:
+            response.headers["X-Profile"] = profile_name
+    return response
 
-    ddt.setInputFolderPaths(option)
-    final_DawlishTwin_dataset = ddt.get_digital_twin_dataset(date_object)
-    final_DawlishTwin_dataset_adjusted = ddt.adjust_overtopping_features(
-        final_DawlishTwin_dataset,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    )
-    ddt.load_models(SPLASH_DT_Dawlish_models_folder)
-    ddt.process_wave_overtopping(final_DawlishTwin_dataset_adjusted)
 
-    ds_start_date = final_DawlishTwin_dataset_adjusted["time"].min()
-    ds_end_date = final_DawlishTwin_dataset_adjusted["time"].max()
+@app.route("/splash/health", methods=["GET"])
+def get_health():
+    """Get the health of the worker, without waiting for any computation
 
-    interpolated_DawlishTwin_dataset = ddt.extract_water_level_for_range(
-        ds_start_date, ds_end_date
-    )
-    interpolated_DawlishTwin_dataset = ddt.adjust_freeboard_only(
-        interpolated_DawlishTwin_dataset, freeboard
-    )
-    overtopping_times_by_feature_df = ddt.get_overtopping_times_data(
-        final_DawlishTwin_dataset_adjusted, "Freeboard"
-    )
-    interpolated_DawlishTwin_dataset = interpolated_DawlishTwin_dataset.reset_index()
-    overtopping_times_by_feature_df = overtopping_times_by_feature_df.rename(
-        columns={"Freeboard": "tidal_level", "overtopping_time": "Time"}
-    )
+    Returns:
+        Json: Status and occupancy of the admission lanes of the worker
+    """
 
-    tidal_level_data = utils.convert_df_to_json_data(interpolated_DawlishTwin_dataset)
-    overtopping_times = utils.convert_df_to_json_data(overtopping_times_by_feature_df)
+    return jsonify({"status": "ok", "lanes": admission.get_lanes_status()})
 
-    return jsonify(
-        {"tidal_levels": tidal_level_data, "overtopping_times": overtopping_times}
-    )
 
-
-@app.route("/splash/dawlish/wind-speed", methods=["GET"])
-def get_dawlish_wind_speed():
-    """Get Dawlish wind speed data and overtopping times data
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Get the metrics of all the workers
 
     Returns:
-         Json: Dawlish wind speed data and forecast wave overtopping times data in Json format
+        Response: Metrics in Prometheus text format
     """
 
-    option = request.args.get("option", "dawlish")
-    (
-        date_object,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    ) = utils.get_query_params_values(
-        "start_date",
-        "sig_wave_height",
-        "freeboard",
-        "mean_wave_period",
-        "mean_wave_dir",
-        "wind_speed",
-        "wind_direction",
-    )
+    metrics_data, content_type = metrics.get_metrics_data()
+    return Response(metrics_data, content_type=content_type)
 
-    ddt.setInputFolderPaths(option)
-    final_DawlishTwin_dataset = ddt.get_digital_twin_dataset(date_object)
-    final_DawlishTwin_dataset_adjusted = ddt.adjust_overtopping_features(
-        final_DawlishTwin_dataset,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    )
 
-    ddt.load_models(SPLASH_DT_Dawlish_models_folder)
-    ddt.process_wave_overtopping(final_DawlishTwin_dataset_adjusted)
+def get_option_value(default_option):
+    """Get the dataset option query parameter's value
 
-    interpolated_DawlishTwin_dataset, overtopping_times_by_feature_df = (
-        ddt.get_feature_and_overtopping_times_data(
-            final_DawlishTwin_dataset_adjusted, "Wind(m/s)"
+    Args:
+        default_option (string): Option when the parameter is missing
+
+    Returns:
+        string: Dataset's option name, the request is answered with 400 when it is not one of utils.DATASET_OPTIONS
+    """
+
+    option = request.args.get("option", default_option)
+    if option not in utils.DATASET_OPTIONS:
+        abort(
+            400,
+            description=f"Unknown option {option}, the options are: {', '.join(utils.DATASET_OPTIONS)}.",
         )
-    )
-    interpolated_DawlishTwin_dataset = interpolated_DawlishTwin_dataset.rename(
-        columns={"Wind(m/s)": "wind_speed", "time": "Time"}
-    )
-    overtopping_times_by_feature_df = overtopping_times_by_feature_df.rename(
-        columns={"Wind(m/s)": "wind_speed", "overtopping_time": "Time"}
-    )
-    interpolated_DawlishTwin_dataset = interpolated_DawlishTwin_dataset.drop(
-        [
-            "Freeboard",
-            "Hs",
-            "RF1_Confidence",
-            "RF1_Final_Predictions",
-            "RF2_Overtopping_Count",
-            "RF3_Confidence",
-            "RF3_Final_Predictions",
-            "Tm",
-            "shoreWaveDir",
-            "shoreWindDir",
-        ],
-        axis=1,
-    )
-    wind_speed_data = utils.convert_df_to_json_data(interpolated_DawlishTwin_dataset)
-    overtopping_times = utils.convert_df_to_json_data(overtopping_times_by_feature_df)
+    return option
 
-    return jsonify(
-        {"wind_speeds": wind_speed_data, "overtopping_times": overtopping_times}
-    )
 
+@app.route("/splash/<site_name>/<product_name>", methods=["GET"])
+@single_flight.coalesce_requests
+def get_site_product(site_name, product_name):
+    """Get a product of a site's forecast, e.g. its wave overtopping data, feature data or combined features plot
 
-@app.route("/splash/penzance/significant-wave-height", methods=["GET"])
-def get_penzance_significant_wave_height():
-    """Get Penzance significant wave height data and overtopping times data
+    Args:
+        site_name (string): Site's name, as registered in sites.SITES
+        product_name (string): Product's name, as registered in sites.PRODUCTS
 
     Returns:
-        Json: Penzance significant wave height data and forecast wave overtopping times data in Json format
+        Response: Site's product, in Json format or as a PNG image
     """
 
-    option = request.args.get("option", "penzance")
-    (
-        date_object,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    ) = utils.get_query_params_values(
-        "start_date",
-        "sig_wave_height",
-        "freeboard",
-        "mean_wave_period",
-        "mean_wave_dir",
-        "wind_speed",
-        "wind_direction",
-    )
+    if site_name not in sites.SITES or product_name not in sites.PRODUCTS:
+        abort(404, description="Unknown site or product.")
 
-    pdt.setInputFolderPaths(option)
-    final_Penzance_Twin_dataset, start_time, start_date_block = (
-        pdt.get_digital_twin_dataset(date_object)
-    )
-    final_Penzance_Twin_dataset_adjusted = pdt.adjust_overtopping_features(
-        final_Penzance_Twin_dataset,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    )
+    try:
+        fields = sites.get_product_fields(product_name, request.args.get("fields"))
+    except ValueError as e:
+        abort(400, description=str(e))
 
-    pdt.load_model_files(SPLASH_DT_Penzance_models_folder)
-    final_Penzance_Twin_dataset_adjusted = pdt.add_selected_model_col(
-        final_Penzance_Twin_dataset_adjusted, start_time
+    option = get_option_value(site_name)
+    date_object, *scenario_values = utils.get_query_params_values(
+        "start_date", *utils.SCENARIO_PARAMS
     )
-    pdt.process_wave_overtopping(final_Penzance_Twin_dataset_adjusted, start_time)
 
-    interpolated_PenzanceTwin_dataset, overtopping_times_by_feature_df = (
-        pdt.get_feature_and_overtopping_times_data(
-            final_Penzance_Twin_dataset_adjusted, "Hs"
+    try:
+        forecast = sites.get_forecast(
+            site_name,
+            option,
+            date_object,
+            dict(zip(utils.SCENARIO_PARAMS, scenario_values)),
         )
+    except ValueError as e:
+        # No block of the site could be read within the look-back window of the requested block
+        abort(404, description=str(e))
+    response = make_response(
+        sites.PRODUCTS[product_name]["get_product"](forecast, fields)
     )
-    interpolated_PenzanceTwin_dataset = interpolated_PenzanceTwin_dataset.rename(
-        columns={"Hs": "significant_wave_height", "time": "Time"}
-    )
-    overtopping_times_by_feature_df = overtopping_times_by_feature_df.rename(
-        columns={"Hs": "significant_wave_height", "overtopping_time": "Time"}
-    )
-    interpolated_PenzanceTwin_dataset = interpolated_PenzanceTwin_dataset.drop(
-        [
-            "Tm",
-            "shoreWaveDir",
-            "Wind(m/s)",
-            "Wind Speed_wind",
-            "Wind Direction_dir",
-            "water_level_wl",
-            "Freeboard",
-            "RF1_Final_Predictions",
-            "Selected_Model",
-            "shoreWindDir",
-        ],
-        axis=1,
-    )
+    # The header is part of the computed response, so coalesced requests sharing the response get it too
+    revalidating_block_date = block_revalidation.revalidating_block_date.get()
+    if revalidating_block_date is not None:
+        response.headers["X-Block-Revalidating"] = revalidating_block_date.isoformat()
+    return response
 
-    significant_wave_height_data = utils.convert_df_to_json_data(
-        interpolated_PenzanceTwin_dataset
-    )
-    overtopping_times = utils.convert_df_to_json_data(overtopping_times_by_feature_df)
 
-    return jsonify(
-        {
-            "significant_wave_heights": significant_wave_height_data,
-            "overtopping_times": overtopping_times,
-        }
-    )
+@app.route("/splash/<site_name>/overtopping-history", methods=["GET"])
+def get_overtopping_history(site_name):
+    """Get the stored wave overtopping predictions of a site's blocks between two dates
 
-
-@app.route("/splash/penzance/tidal-level", methods=["GET"])
-def get_penzance_tidal_level():
-    """Get Penzance tidal level data and overtopping times data
+    Args:
+        site_name (string): Site's name, as registered in sites.SITES
 
     Returns:
-         Json:  Penzance tidal level data and forecast wave overtopping times data in Json format
+        Json: Model inputs, final RF1 predictions, overtopping counts and confidences of both of the site's outputs (rig1
+        and rig2) for each block, in json format
     """
 
-    option = request.args.get("option", "penzance")
-    (
-        date_object,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    ) = utils.get_query_params_values(
-        "start_date",
-        "sig_wave_height",
-        "freeboard",
-        "mean_wave_period",
-        "mean_wave_dir",
-        "wind_speed",
-        "wind_direction",
-    )
+    if site_name not in sites.SITES:
+        abort(404, description="Unknown site.")
 
-    pdt.setInputFolderPaths(option)
-    final_Penzance_Twin_dataset, start_time, start_date_block = (
-        pdt.get_digital_twin_dataset(date_object)
-    )
-    final_Penzance_Twin_dataset_adjusted = pdt.adjust_overtopping_features(
-        final_Penzance_Twin_dataset,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
+    option = get_option_value(site_name)
+    start_date = utils.get_start_date_value("start_date")
+    end_date = utils.get_start_date_value("end_date")
+
+    predictions = prediction_store.read_predictions(
+        site_name, option, start_date, end_date
     )
 
-    pdt.load_model_files(SPLASH_DT_Penzance_models_folder)
-    final_Penzance_Twin_dataset_adjusted = pdt.add_selected_model_col(
-        final_Penzance_Twin_dataset_adjusted, start_time
+    return jsonify(
+        {
+            "start_date": start_date.strftime("%Y-%m-%d"),
+            "end_date": end_date.strftime("%Y-%m-%d"),
+            "blocks": utils.convert_predictions_to_json_data(predictions),
+        }
     )
-    pdt.process_wave_overtopping(final_Penzance_Twin_dataset_adjusted, start_time)
 
-    ds_start_date = final_Penzance_Twin_dataset_adjusted["time"].min()
-    ds_end_date = final_Penzance_Twin_dataset_adjusted["time"].max()
 
-    interpolated_PenzanceTwin_dataset = pdt.extract_hourly_water_level_data(
-        ds_start_date,
-        ds_end_date,
-    )
-    interpolated_PenzanceTwin_dataset = pdt.adjust_freeboard_only(
-        interpolated_PenzanceTwin_dataset, freeboard
-    )
-    overtopping_times_by_feature_df = pdt.get_overtopping_times_data(
-        final_Penzance_Twin_dataset_adjusted, "Freeboard"
-    )
-    interpolated_PenzanceTwin_dataset = interpolated_PenzanceTwin_dataset.reset_index()
+@app.route("/splash/wave-rasters", methods=["GET"])
+@single_flight.coalesce_requests
+def get_wave_rasters_metadata():
+    """Get the description of the quantized Southwest England wave grids of a block
 
-    overtopping_times_by_feature_df = overtopping_times_by_feature_df.rename(
-        columns={"Freeboard": "tidal_level", "overtopping_time": "Time"}
+    Returns:
+        Json: Block's date, time steps, coordinates and decoding parameters of the wave grids in Json format
+    """
+
+    option = get_option_value("dawlish")
+    wave_folder, _ = utils.getLocationDataPaths(option)
+    block_rasters = wave_rasters.get_wave_rasters(
+        wave_folder, utils.get_start_date_value("start_date")
     )
+    if block_rasters is None:
+        abort(404, description="No wave data available for the requested block.")
 
-    tidal_level_data = utils.convert_df_to_json_data(interpolated_PenzanceTwin_dataset)
-    overtopping_times = utils.convert_df_to_json_data(overtopping_times_by_feature_df)
+    return jsonify(wave_rasters.get_wave_rasters_metadata(block_rasters))
 
-    return jsonify(
-        {"tidal_levels": tidal_level_data, "overtopping_times": overtopping_times}
-    )
 
+@app.route("/splash/wave-rasters/<int:time_index>", methods=["GET"])
+@single_flight.coalesce_requests
+def get_wave_raster(time_index):
+    """Get the quantized Southwest England wave grids of a time step
 
-@app.route("/splash/penzance/wind-speed", methods=["GET"])
-def get_penzance_wind_speed_level():
-    """Get Penzance wind speed data and overtopping times data
+    Args:
+        time_index (integer): Index of the time step in the block
 
     Returns:
-         Json: Penzance wind speed data and forecast wave overtopping times data in Json format
+        Response: Significant wave height grid followed by the wave direction grid, as uint16 little-endian arrays
     """
 
-    option = request.args.get("option", "penzance")
-    (
-        date_object,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
-    ) = utils.get_query_params_values(
-        "start_date",
-        "sig_wave_height",
-        "freeboard",
-        "mean_wave_period",
-        "mean_wave_dir",
-        "wind_speed",
-        "wind_direction",
-    )
-
-    pdt.setInputFolderPaths(option)
-    final_Penzance_Twin_dataset, start_time, start_date_block = (
-        pdt.get_digital_twin_dataset(date_object)
-    )
-    final_Penzance_Twin_dataset_adjusted = pdt.adjust_overtopping_features(
-        final_Penzance_Twin_dataset,
-        sig_wave_height,
-        freeboard,
-        mean_wave_period,
-        mean_wave_dir,
-        wind_speed,
-        wind_direction,
+    option = get_option_value("dawlish")
+    wave_folder, _ = utils.getLocationDataPaths(option)
+    block_rasters = wave_rasters.get_wave_rasters(
+        wave_folder, utils.get_start_date_value("start_date")
     )
+    if block_rasters is None or time_index >= len(block_rasters["times"]):
+        abort(404, description="No wave data available for the requested time step.")
 
-    pdt.load_model_files(SPLASH_DT_Penzance_models_folder)
-    final_Penzance_Twin_dataset_adjusted = pdt.add_selected_model_col(
-        final_Penzance_Twin_dataset_adjusted, start_time
-    )
-    pdt.process_wave_overtopping(final_Penzance_Twin_dataset_adjusted, start_time)
-
-    interpolated_PenzanceTwin_dataset, overtopping_times_by_feature_df = (
-        pdt.get_feature_and_overtopping_times_data(
-            final_Penzance_Twin_dataset_adjusted, "Wind(m/s)"
-        )
+    response = app.response_class(
+        block_rasters["rasters"][time_index].tobytes(),
+        mimetype="application/octet-stream",
     )
-    interpolated_PenzanceTwin_dataset = interpolated_PenzanceTwin_dataset.rename(
-        columns={"Wind(m/s)": "wind_speed", "time": "Time"}
-    )
-    overtopping_times_by_feature_df = overtopping_times_by_feature_df.rename(
-        columns={"Wind(m/s)": "wind_speed", "overtopping_time": "Time"}
-    )
-    interpolated_PenzanceTwin_dataset = interpolated_PenzanceTwin_dataset.drop(
-        [
-            "Hs",
-            "Tm",
-            "shoreWaveDir",
-            "shoreWindDir",
-            "Freeboard",
-            "Wind Speed_wind",
-            "Wind Direction_dir",
-            "water_level_wl",
-            "Selected_Model",
-            "RF1_Final_Predictions",
-        ],
-        axis=1,
-    )
-
-    wind_speed_data = utils.convert_df_to_json_data(interpolated_PenzanceTwin_dataset)
-    overtopping_times = utils.convert_df_to_json_data(overtopping_times_by_feature_df)
-
-    return jsonify(
-        {"wind_speeds": wind_speed_data, "overtopping_times": overtopping_times}
+    response.headers["X-Block-Date"] = block_rasters["block_date"].strftime("%Y-%m-%d")
+    response.headers["X-Raster-Time"] = block_rasters["times"][time_index].strftime(
+        "%a, %d %b %Y %H:%M:%S GMT"
     )
+    return response
 
 
 if __name__ == "__main__":
     if DEBUG == True:
-        print("SPLASH_DT_Dawlish_models_folder = ", SPLASH_DT_Dawlish_models_folder)
-        print("SPLASH_DT_Penzance_models_folder = ", SPLASH_DT_Penzance_models_folder)
+        for site_name, site in sites.SITES.items():
+            print(f"{site_name} models folder = ", site["models_folder"])
 
     if os.environ.get("SPLASH_ENV") == "docker":
         app.run(debug=DEBUG, host="0.0.0.0", port=8080)
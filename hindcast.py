@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Hindcast of the digital twins over a range of archived blocks"""
+
+# Each block is processed by a pool of worker processes with the baseline scenario, i.e. without adjusted features, and its
+# predictions are written to the prediction store. Blocks already in the store are skipped, so an interrupted hindcast
+# resumes where it left off when it is run again with the same arguments.
+
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import digital_twin
+import feature_store
+import logs
+import prediction_store
+import sites
+import utils
+
+
+utils.loadConfigFile()
+
+hindcast_processes = int(os.environ.get("HINDCAST_PROCESSES", "0")) or None
+
+
+def init_hindcast_worker(site):
+    """Configure the logs and load the models of a site once in the worker process
+
+    Args:
+        site (string): Site's name
+    """
+
+    logs.configure_logging()
+    digital_twin.load_models(sites.SITES[site])
+
+
+def process_hindcast_block(site, option, block_date):
+    """Predict the overtopping of a block with the baseline scenario and store the predictions
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        block_date (Date): Block's date
+
+    Raises:
+        ValueError: Error's description
+
+    Returns:
+        string: Path to predictions file
+    """
+
+    forecast = sites.get_forecast(
+        site, option, block_date, dict.fromkeys(utils.SCENARIO_PARAMS, 0)
+    )
+
+    # Unpublished or unreadable blocks resolve to an earlier block, which is stored under its own date
+    if forecast["block_date"] != block_date:
+        raise ValueError(
+            f"Block {block_date} is not available, block {forecast['block_date']} was resolved instead."
+        )
+
+    return prediction_store.write_partition(
+        site,
+        option,
+        block_date,
+        prediction_store.build_predictions_frame(
+            forecast["dataset"], *forecast["overtopping_dfs"]
+        ),
+    )
+
+
+def get_pending_block_dates(site, option, start_date, end_date):
+    """Get dates of the available or archived blocks within a range whose predictions are not stored yet
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        start_date (Date): First block's date
+        end_date (Date): Last block's date
+
+    Returns:
+        List: Sorted blocks dates
+    """
+
+    wave_folder, wind_folder = utils.getLocationDataPaths(option)
+    available_block_dates = set(
+        utils.get_available_block_dates(wave_folder, wind_folder)
+    ) | set(feature_store.get_stored_block_dates(site, option))
+    return [
+        block_date
+        for block_date in sorted(available_block_dates)
+        if start_date <= block_date <= end_date
+        and not prediction_store.has_partition(site, option, block_date)
+    ]
+
+
+def run_hindcast(site, option, start_date, end_date):
+    """Run the hindcast of a site over the available blocks of a date range
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        start_date (Date): First block's date
+        end_date (Date): Last block's date
+
+    Returns:
+        List: Dates of the blocks which could not be processed
+    """
+
+    pending_block_dates = get_pending_block_dates(site, option, start_date, end_date)
+    print(
+        f"Hindcast of {site} ({option}): {len(pending_block_dates)} blocks to process between {start_date} and {end_date}"
+    )
+
+    failed_block_dates = []
+    # Spawned workers do not inherit the threads and locks of the calling process
+    with ProcessPoolExecutor(
+        max_workers=hindcast_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_hindcast_worker,
+        initargs=(site,),
+    ) as executor:
+        futures = {
+            executor.submit(
+                process_hindcast_block, site, option, block_date
+            ): block_date
+            for block_date in pending_block_dates
+        }
+        for future in as_completed(futures):
+            block_date = futures[future]
+            # A block which cannot be read or predicted, for whatever reason, must not abort the other blocks
+            try:
+                print(f"Stored block {block_date} to {future.result()}")
+            except Exception as e:
+                failed_block_dates.append(block_date)
+                print(f"Error: block {block_date} failed with {type(e).__name__}: {e}")
+
+    return sorted(failed_block_dates)
+
+
+if __name__ == "__main__":
+    # e.g. python hindcast.py dawlish 01-11-2024 30-11-2024 --option storm_bert
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("site", choices=sites.SITES)
+    parser.add_argument("start_date", help="First block's date in dd-mm-YYYY format")
+    parser.add_argument("end_date", help="Last block's date in dd-mm-YYYY format")
+    parser.add_argument(
+        "--option",
+        choices=("dawlish", "penzance", "no_overtopping", "storm_bert"),
+        help="Dataset's option name, defaults to the site's name",
+    )
+    arguments = parser.parse_args()
+
+    run_hindcast(
+        arguments.site,
+        arguments.option or arguments.site,
+        datetime.strptime(arguments.start_date, "%d-%m-%Y").date(),
+        datetime.strptime(arguments.end_date, "%d-%m-%Y").date(),
+    )
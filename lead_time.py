@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Forecast lead time buckets selecting the pretrained model of each timestamp"""
+
+# Every site has one pretrained model per lead time bucket, the bucket bounds are declared in the site's entry of
+# sites.SITES and default to LEAD_TIME_BUCKET_HOURS. Lead times are bucketed for the whole block at once into int8 codes,
+# the index of each timestamp's model in LEAD_TIME_MODELS. A bucket includes its lower bound and excludes its upper bound,
+# e.g. with the default 24,48 table a 48 hours lead time is predicted by the T72 models.
+
+import os
+import numpy as np
+import utils
+
+
+utils.loadConfigFile()
+
+LEAD_TIME_MODELS = ("T24", "T48", "T72")
+
+# Upper bound in hours of every bucket but the last one
+lead_time_bucket_hours = np.array(
+    [
+        float(hours)
+        for hours in os.environ.get("LEAD_TIME_BUCKET_HOURS", "24,48").split(",")
+    ]
+)
+if len(lead_time_bucket_hours) != len(LEAD_TIME_MODELS) - 1 or np.any(
+    np.diff(lead_time_bucket_hours) <= 0
+):
+    raise ValueError(
+        f"LEAD_TIME_BUCKET_HOURS must hold {len(LEAD_TIME_MODELS) - 1} increasing bounds, one per model but the last."
+    )
+
+
+def get_lead_time_hours(times, start_time):
+    """Get the forecast lead time of every timestamp
+
+    Args:
+        times (Series): Timestamps
+        start_time (Timestamp): Forecast start date
+
+    Returns:
+        Array: Lead times in hours
+    """
+
+    return (times - start_time).dt.total_seconds().to_numpy() / 3600
+
+
+def get_lead_time_codes(lead_time_hours, bucket_hours):
+    """Bucket lead times into the index of their pretrained model
+
+    Args:
+        lead_time_hours (Array): Lead times in hours
+        bucket_hours (Array): Upper bound in hours of every bucket but the last one
+
+    Returns:
+        Array: Index in LEAD_TIME_MODELS of every lead time's model, as int8
+    """
+
+    return np.searchsorted(bucket_hours, lead_time_hours, side="right").astype(np.int8)
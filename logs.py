@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Leveled json logs tagged with the correlation id of the request"""
+
+# Modules log through logging.getLogger(__name__) and configure_logging writes every record as a single json line on
+# stdout, at or above LOG_LEVEL. Extra fields of a record are passed as extra={"fields": {...}}. Every request gets a
+# correlation id, the incoming X-Request-ID header when it is valid, otherwise a new one, which is added to all the records
+# logged while it runs, including from the block extraction threads, and returned in the X-Request-ID header. Debug
+# records are kept for a sample of the requests only, LOG_DEBUG_SAMPLE_RATE, so all the debug records of a sampled request
+# are kept together. Outside of a request, e.g. in the hindcast, all records are kept. Every request is logged once with its
+# stage timings, as a warning with all its query parameters when it is slower than SLOW_REQUEST_MS.
+
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import sys
+import uuid
+from datetime import datetime
+import utils
+
+
+utils.loadConfigFile()
+
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+log_level = os.environ.get("LOG_LEVEL", "INFO").upper()
+debug_sample_rate = float(os.environ.get("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+slow_request_threshold = float(os.environ.get("SLOW_REQUEST_MS", "5000"))
+logger = logging.getLogger(__name__)
+request_id = contextvars.ContextVar("request_id", default=None)
+is_debug_sampled = contextvars.ContextVar("is_debug_sampled", default=True)
+exception_formatter = logging.Formatter()
+
+
+def format_record(record):
+    """Filter a record and format it as a json line, kept in the record's json_line attribute
+
+    Args:
+        record (LogRecord): Log record
+
+    Returns:
+        bool: Whether the record is written, False for debug records of requests left out of the sample
+    """
+
+    if record.levelno <= logging.DEBUG and not is_debug_sampled.get():
+        return False
+
+    log = {
+        "timestamp": datetime.fromtimestamp(record.created).isoformat(
+            timespec="milliseconds"
+        ),
+        "level": record.levelname,
+        "logger": record.name,
+        "request_id": request_id.get(),
+        "message": record.getMessage(),
+        **getattr(record, "fields", {}),
+    }
+    if record.exc_info:
+        log["exception"] = exception_formatter.formatException(record.exc_info)
+    record.json_line = json.dumps(log, default=str)
+    return True
+
+
+def configure_logging():
+    """Write the records of all loggers as json lines on stdout, at or above the configured level"""
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(format_record)
+    handler.setFormatter(logging.Formatter("%(json_line)s"))
+    root_logger = logging.getLogger()
+    root_logger.handlers = [handler]
+    root_logger.setLevel(log_level)
+
+
+def start_request_logging(incoming_request_id):
+    """Set the correlation id of the current request and whether its debug records are kept
+
+    Args:
+        incoming_request_id (string): Request's X-Request-ID header, it may be None
+
+    Returns:
+        string: Request's correlation id
+    """
+
+    if incoming_request_id is None or not REQUEST_ID_PATTERN.fullmatch(
+        incoming_request_id
+    ):
+        incoming_request_id = uuid.uuid4().hex
+    request_id.set(incoming_request_id)
+    is_debug_sampled.set(random.random() < debug_sample_rate)
+    return incoming_request_id
+
+
+def finish_request_logging():
+    """Clear the correlation id of the current request"""
+
+    request_id.set(None)
+    is_debug_sampled.set(True)
+
+
+def log_request(method, path, query_params, status_code, stage_timings):
+    """Log a request with its stage timings, as a warning when the request is slow
+
+    Args:
+        method (string): Request's method
+        path (string): Request's path
+        query_params (Dictionary): Request's query parameters
+        status_code (integer): Response's status code
+        stage_timings (Dictionary): Request's stage timings
+    """
+
+    is_slow = stage_timings["duration_ms"] > slow_request_threshold
+    logger.log(
+        logging.WARNING if is_slow else logging.INFO,
+        f"{'Slow request' if is_slow else 'Request'} {method} {path} {status_code} in {stage_timings['duration_ms']} ms",
+        extra={
+            "fields": {
+                "event": "slow_request" if is_slow else "request",
+                "method": method,
+                "path": path,
+                "query_params": query_params,
+                "status": status_code,
+                **stage_timings,
+            }
+        },
+    )
@@ -0,0 +1,195 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Prometheus metrics of the API's latency, caches and models"""
+
+# Under gunicorn, gunicorn-config.py sets PROMETHEUS_MULTIPROC_DIR before the workers start, so every worker writes its
+# metrics to that folder and the /metrics route of any worker merges the values of all of them. Otherwise, e.g. with the
+# Flask development server or in the hindcast, metrics are kept in the memory of the process.
+
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+request_duration = Histogram(
+    "splash_request_duration_seconds",
+    "Duration of API requests",
+    ["route", "method", "status"],
+    buckets=DURATION_BUCKETS,
+)
+stage_duration = Histogram(
+    "splash_stage_duration_seconds",
+    "Duration of a pipeline stage within a request, summed over its calls",
+    ["stage"],
+    buckets=DURATION_BUCKETS,
+)
+cache_lookups = Counter(
+    "splash_cache_lookups",
+    "Lookups of the in-memory caches",
+    ["cache", "result"],
+)
+cache_evictions = Counter(
+    "splash_cache_evictions",
+    "Entries evicted from the in-memory caches",
+    ["cache"],
+)
+model_loads = Counter(
+    "splash_model_loads",
+    "Loads of a site's models",
+    ["site"],
+)
+model_load_duration = Histogram(
+    "splash_model_load_duration_seconds",
+    "Duration of loading a site's models",
+    ["site"],
+    buckets=DURATION_BUCKETS,
+)
+block_fallbacks = Counter(
+    "splash_block_fallbacks",
+    "Requests for a block resolved to an earlier block, and unreadable blocks skipped",
+    ["site", "reason"],
+)
+coalesced_requests = Counter(
+    "splash_coalesced_requests",
+    "Requests served with the response of an identical concurrent request",
+    ["scope"],
+)
+rejected_requests = Counter(
+    "splash_rejected_requests",
+    "Requests answered with 503 by the admission control",
+    ["lane", "reason"],
+)
+worker_resident_memory = Gauge(
+    "splash_worker_resident_memory_bytes",
+    "Resident memory of each worker",
+    multiprocess_mode="liveall",
+)
+
+
+def record_cache_lookup(cache_name, is_hit):
+    """Count a lookup of an in-memory cache
+
+    Args:
+        cache_name (string): Cache's name
+        is_hit (bool): Whether the cache held the entry
+    """
+
+    cache_lookups.labels(cache_name, "hit" if is_hit else "miss").inc()
+
+
+def record_cache_evictions(cache_name, evictions_count):
+    """Count entries evicted from an in-memory cache
+
+    Args:
+        cache_name (string): Cache's name
+        evictions_count (integer): Number of evicted entries
+    """
+
+    if evictions_count:
+        cache_evictions.labels(cache_name).inc(evictions_count)
+
+
+def record_model_load(site, duration):
+    """Count a load of a site's models
+
+    Args:
+        site (string): Site's name
+        duration (float): Load's duration in seconds
+    """
+
+    model_loads.labels(site).inc()
+    model_load_duration.labels(site).observe(duration)
+
+
+def record_block_fallback(site, reason):
+    """Count a block fallback
+
+    Args:
+        site (string): Site's name
+        reason (string): Either unreadable_block, when a candidate block could not be processed, or previous_block, when a request is served from a block earlier than the requested one
+    """
+
+    block_fallbacks.labels(site, reason).inc()
+
+
+def record_coalesced_request(scope):
+    """Count a request served with the response of an identical concurrent request
+
+    Args:
+        scope (string): Either threads, when the response was computed by another thread of the worker, or workers, when it was computed by another worker
+    """
+
+    coalesced_requests.labels(scope).inc()
+
+
+def record_rejected_request(lane_name, reason):
+    """Count a request rejected by the admission control
+
+    Args:
+        lane_name (string): Request's lane
+        reason (string): Either queue_full or queue_timeout
+    """
+
+    rejected_requests.labels(lane_name, reason).inc()
+
+
+def get_resident_memory():
+    """Get the resident memory of the current process
+
+    Returns:
+        integer: Resident memory in bytes, None when /proc is unavailable
+    """
+
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def record_request(route, method, status_code, stage_timings):
+    """Record the duration and pipeline stage durations of a request, and the worker's resident memory
+
+    Args:
+        route (string): Request's route rule
+        method (string): Request's method
+        status_code (integer): Response's status code
+        stage_timings (Dictionary): Request's stage timings
+    """
+
+    request_duration.labels(route, method, str(status_code)).observe(
+        stage_timings["duration_ms"] / 1000
+    )
+    for stage_name, stage in stage_timings["stages"].items():
+        stage_duration.labels(stage_name).observe(stage["duration_ms"] / 1000)
+
+    resident_memory = get_resident_memory()
+    if resident_memory is not None:
+        worker_resident_memory.set(resident_memory)
+
+
+def get_metrics_data():
+    """Get the metrics of all the workers in Prometheus text format
+
+    Returns:
+        bytes, string: Metrics data and its content type
+    """
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,352 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""SPLASH Digital Twin Penzance notebook and plots"""
+
+# Notebook sliders, overtopping graphs, features line plots and significant-wave-height contour plots of the Penzance
+# digital twin. This module is only imported on demand, so the API workers never load IPython, ipywidgets, matplotlib or
+# seaborn.
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from IPython.display import display, clear_output
+import matplotlib.lines as mlines
+import ipywidgets as widgets
+import matplotlib.pyplot as plt
+import feature_plots
+import penzance_final_digital_twin_script_upgraded as pdt
+import utils
+import wave_maps
+
+
+utils.loadConfigFile()
+
+# Step 4: Slider Adjustments, this allows us to play around with altering the forecast data (for fun) and see if it changes the predicitons in anyway.
+
+penzance_slider_style_layout = {"description_width": "150px"}
+slider_layout_design_with_digital_twin = widgets.Layout(width="400px")
+significant_wave_height_slider_SPLASH = widgets.FloatSlider(
+    value=0,
+    min=-100,
+    max=100,
+    step=1,
+    description="Hs (%):",
+    style=penzance_slider_style_layout,
+    layout=slider_layout_design_with_digital_twin,
+)
+mean_period_slider_SPLASH = widgets.FloatSlider(
+    value=0,
+    min=-100,
+    max=100,
+    step=1,
+    description="Tm (%):",
+    style=penzance_slider_style_layout,
+    layout=slider_layout_design_with_digital_twin,
+)
+shore_wave_direction_slider_SPLASH = widgets.FloatSlider(
+    value=0,
+    min=0,
+    max=360,
+    step=1,
+    description="ShoreWaveDir (°):",
+    style=penzance_slider_style_layout,
+    layout=slider_layout_design_with_digital_twin,
+)
+wind_speed_slider_SPLASH = widgets.FloatSlider(
+    value=0,
+    min=-100,
+    max=100,
+    step=1,
+    description="Wind (m/s) (%):",
+    style=penzance_slider_style_layout,
+    layout=slider_layout_design_with_digital_twin,
+)
+shore_wind_direction_slider_SPLASH = widgets.FloatSlider(
+    value=0,
+    min=0,
+    max=360,
+    step=1,
+    description="ShoreWindDir (°):",
+    style=penzance_slider_style_layout,
+    layout=slider_layout_design_with_digital_twin,
+)
+freeboard_slider_SPLASH = widgets.FloatSlider(
+    value=0,
+    min=-100,
+    max=100,
+    step=1,
+    description="Freeboard (%):",
+    style=penzance_slider_style_layout,
+    layout=slider_layout_design_with_digital_twin,
+)
+
+submit_button = widgets.Button(description="Submit")
+use_our_previous_SPLASH_rf1_rf2 = None
+use_our_previous_SPLASH_rf3_rf4 = None
+previous_rf1_confidences = None
+previous_rf3_confidences = None
+df = pd.DataFrame()
+start_time = datetime.now()
+
+
+def adjust_features(df):
+    """Adjust wave and atmospheric features
+
+    Args:
+        df (Dataframe): Initial digital twin dataframe
+
+    Returns:
+        Dataframe: Dataframe with adjusted features values
+    """
+
+    Penzance_adjusted_note = df.copy()
+    Penzance_adjusted_note["Hs"] *= (
+        1 + significant_wave_height_slider_SPLASH.value / 100
+    )
+    Penzance_adjusted_note["Tm"] *= 1 + mean_period_slider_SPLASH.value / 100
+    Penzance_adjusted_note["shoreWaveDir"] = shore_wave_direction_slider_SPLASH.value
+    Penzance_adjusted_note["Wind(m/s)"] *= 1 + wind_speed_slider_SPLASH.value / 100
+    Penzance_adjusted_note["shoreWindDir"] = shore_wind_direction_slider_SPLASH.value
+    Penzance_adjusted_note["Freeboard"] *= 1 + freeboard_slider_SPLASH.value / 100
+    return Penzance_adjusted_note
+
+
+def plot_overtopping_graphs(
+    df_adjusted,
+    Met_office_time_stamps_df,
+    Our_overtopping_counts_rig1_rf1_rf2,
+    Our_overtopping_counts_rig2_rf3_rf4,
+    rf1_confidences,
+    rf3_confidences,
+):
+    """Plot overtopping graphs
+
+    Args:
+        df_adjusted (Dataframe): Main dataframe with adjusted wave and atmospheric variables
+        Met_office_time_stamps_df (Dataframe): Time stamps dataframe
+        Our_overtopping_counts_rig1_rf1_rf2 (List): Overtopping counts list of first location
+        Our_overtopping_counts_rig2_rf3_rf4 (List): Overtopping counts list of second location
+        rf1_confidences (List): Confidence values list of overtopping events prediction for first location
+        rf3_confidences (List): Confidence values list of overtopping events prediction for second location
+    """
+
+    global use_our_previous_SPLASH_rf1_rf2, use_our_previous_SPLASH_rf3_rf4, previous_rf1_confidences, previous_rf3_confidences
+
+    clear_output(wait=True)
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 10), dpi=300)
+    ax1.set_title(
+        "Penzance, Seawall crest", fontsize=10, fontweight="bold"
+    )  # may want to change the names of both locations, not sure just lest it at this.
+    ax2.set_title("Penzance, Seawall crest (sheltered)", fontsize=10, fontweight="bold")
+
+    # Fix selected timestamps for plotting (first 54h hourly, then 3-hourly)
+    forecast_hours = (df_adjusted["time"] - start_time).dt.total_seconds() / 3600
+    selected_timestamps = df_adjusted.loc[
+        (forecast_hours <= 54) | (forecast_hours % 3 == 0), "time"
+    ]
+
+    df_adjusted = df_adjusted[df_adjusted["time"].isin(selected_timestamps)]
+
+    # Skip timestamps outside valid intervals
+    time_points = Met_office_time_stamps_df.iloc[
+        : len(Our_overtopping_counts_rig1_rf1_rf2)
+    ]
+    valid_points = time_points.isin(selected_timestamps).to_numpy()
+
+    # Rig 1 (Seawall Crest)
+    feature_plots.scatter_overtopping_counts(
+        ax1,
+        time_points[valid_points],
+        np.asarray(Our_overtopping_counts_rig1_rf1_rf2)[valid_points],
+        pdt.get_confidence_colors(rf1_confidences)[valid_points],
+        100,
+    )
+
+    ax1.axhline(y=6, color="black", linestyle="--", linewidth=1, label="25% IQR (6)")
+    ax1.axhline(y=54, color="black", linestyle="--", linewidth=1, label="75% IQR (54)")
+    ax1.set_ylim(-10, 120)
+    ax1.set_xlabel("Time", fontsize=10)
+    ax1.set_ylabel("No. of Overtopping Occurrences (Per 10 Mins)", fontsize=10)
+    ax1.set_xticks(selected_timestamps)
+    ax1.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter("%Y-%m-%d %H:%M"))
+    ax1.tick_params(axis="x", rotation=90, labelsize=8)
+    ax1.tick_params(axis="y", labelsize=8)
+
+    # Rig 2 (Seawall Crest Sheltered)
+    feature_plots.scatter_overtopping_counts(
+        ax2,
+        time_points[valid_points],
+        np.asarray(Our_overtopping_counts_rig2_rf3_rf4)[valid_points],
+        pdt.get_confidence_colors(rf3_confidences)[valid_points],
+        100,
+    )
+
+    ax2.axhline(y=2, color="black", linestyle="--", linewidth=1, label="25% IQR (2)")
+    ax2.axhline(y=9, color="black", linestyle="--", linewidth=1, label="75% IQR (9)")
+    ax2.set_ylim(-5, 120)
+    ax2.set_xlabel("Time", fontsize=10)
+    ax2.set_ylabel("No. of Overtopping Occurrences (Per 10 Mins)", fontsize=10)
+    ax2.set_xticks(selected_timestamps)
+    ax2.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter("%Y-%m-%d %H:%M"))
+    ax2.tick_params(axis="x", rotation=90, labelsize=8)
+    ax2.tick_params(axis="y", labelsize=8)
+
+    # Confidence Legends
+    Digital_twin_has_high_confidence = mlines.Line2D(
+        [],
+        [],
+        color="#00008B",
+        marker="o",
+        linestyle="None",
+        markersize=8,
+        label="High Confidence (> 80%)",
+    )
+    Digital_twin_has_medium_confidence = mlines.Line2D(
+        [],
+        [],
+        color="#4682B4",
+        marker="o",
+        linestyle="None",
+        markersize=8,
+        label="Medium Confidence (50-80%)",
+    )
+    Digital_twin_has_low_confidence = mlines.Line2D(
+        [],
+        [],
+        color="aqua",
+        marker="o",
+        linestyle="None",
+        markersize=8,
+        label="Low Confidence (< 50%)",
+    )
+    No_overtopping_recorded = mlines.Line2D(
+        [],
+        [],
+        color="black",
+        marker="x",
+        linestyle="None",
+        markersize=8,
+        label="No Overtopping",
+    )
+    Upper_and_lower_iqr_dashed_lines = mlines.Line2D(
+        [],
+        [],
+        color="black",
+        linestyle="--",
+        linewidth=1,
+        label="Interquartile Range (25th & 75th)",
+    )
+
+    fig.legend(
+        handles=[
+            Digital_twin_has_high_confidence,
+            Digital_twin_has_medium_confidence,
+            Digital_twin_has_low_confidence,
+            No_overtopping_recorded,
+            Upper_and_lower_iqr_dashed_lines,
+        ],
+        loc="lower center",
+        bbox_to_anchor=(0.5, -0.15),
+        ncol=5,
+        frameon=False,
+        fontsize=8,
+    )
+
+    plt.tight_layout()
+    plt.show()
+
+    use_our_previous_SPLASH_rf1_rf2 = Our_overtopping_counts_rig1_rf1_rf2
+    use_our_previous_SPLASH_rf3_rf4 = Our_overtopping_counts_rig2_rf3_rf4
+    previous_rf1_confidences = rf1_confidences[:]
+    previous_rf3_confidences = rf3_confidences[:]
+
+    display(
+        significant_wave_height_slider_SPLASH,
+        mean_period_slider_SPLASH,
+        shore_wave_direction_slider_SPLASH,
+        wind_speed_slider_SPLASH,
+        shore_wind_direction_slider_SPLASH,
+        freeboard_slider_SPLASH,
+        submit_button,
+    )
+
+
+def on_submit_clicked(b):
+    """Update overtopping graphs after inputting new variales values
+
+    Args:
+        b (Button): Button instance
+    """
+
+    df_adjusted = adjust_features(df)
+    pdt.process_wave_overtopping(df_adjusted)
+
+
+# step 8: plot now the subplot figures
+def save_combined_features_plot(
+    combined_features_data, send_to_this_output_path_folder
+):
+    """Save combined features plot
+
+    Args:
+        combined_features_data (Tuple): Interpolated features dataframe, overtopping events times, hourly water level dataframe, forecast start and end dates
+        send_to_this_output_path_folder (string): Path to outputs folder
+    """
+
+    utils.write_file_atomically(
+        send_to_this_output_path_folder,
+        feature_plots.render_penzance_combined_features_plot(*combined_features_data),
+    )
+
+
+def combine_features(df):
+    """Combine_features
+
+    Args:
+        df (Dataframe): Digital twin dataframe
+    """
+
+    save_combined_features_plot(
+        pdt.get_combined_features_data(df, pdt.site["water_level_file"]),
+        pdt.site["combined_features_plot_path"],
+    )
+
+
+def plot_significant_wave_height(start_date_block):
+    """Plot significant wave height graphs
+
+    Args:
+        start_date_block (Date): Forecast start date
+    """
+
+    # Step 9. Now we also want to plot Hs and wave direction geospatially and save to the figures folders of both sites.
+    wave_maps.generate_wave_maps(start_date_block)
+
+
+def generate_overtopping_graphs():
+    """Generate overtopping events graphs, features line plots and significant-wave-height contour plots"""
+
+    global df, start_time
+    df, start_date_block = pdt.get_digital_twin_dataset(
+        datetime.now().date(), pdt.get_data_sources()
+    )
+    start_time = df["time"].iloc[0]
+    pdt.load_models()
+
+    submit_button.on_click(lambda b: pdt.process_wave_overtopping(adjust_features(df)))
+    submit_button.on_click(on_submit_clicked)
+    display(
+        significant_wave_height_slider_SPLASH,
+        mean_period_slider_SPLASH,
+        shore_wave_direction_slider_SPLASH,
+        wind_speed_slider_SPLASH,
+        shore_wind_direction_slider_SPLASH,
+        freeboard_slider_SPLASH,
+        submit_button,
+    )
+    pdt.process_wave_overtopping(df)
+
+    combine_features(df)
@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Cache of overtopping predictions of each timestamp"""
+
+# Predictions are kept per block and scenario, i.e. the adjusted features values requested, for the most recently used
+# ones. Every prediction stores the model inputs it was computed from, so a prediction is only reused for identical inputs.
+# When the assembled data of a block changes, only the predictions of the changed timestamps are invalidated.
+
+import os
+import threading
+from collections import OrderedDict
+import metrics
+import utils
+
+
+utils.loadConfigFile()
+
+prediction_cache_size = int(os.environ.get("PREDICTION_CACHE_SIZE", "64"))
+cached_predictions = OrderedDict()
+cached_predictions_lock = threading.Lock()
+
+
+def get_predictions(block_key, scenario):
+    """Get cached predictions of a block and scenario
+
+    Args:
+        block_key (Tuple): Block's key set by the block assembly
+        scenario (Tuple): Adjusted features values
+
+    Returns:
+        Dictionary: Model inputs and predictions by timestamp, None when the block or scenario are unknown
+    """
+
+    if block_key is None or scenario is None:
+        return None
+
+    with cached_predictions_lock:
+        predictions = cached_predictions.setdefault((block_key, scenario), {})
+        cached_predictions.move_to_end((block_key, scenario))
+        evictions_count = max(len(cached_predictions) - prediction_cache_size, 0)
+        for _ in range(evictions_count):
+            cached_predictions.popitem(last=False)
+    metrics.record_cache_evictions("predictions", evictions_count)
+    return predictions
+
+
+def get_prediction(predictions, timestamp, model_inputs):
+    """Get a cached prediction computed from the same model inputs
+
+    Args:
+        predictions (Dictionary): Cached predictions of a block and scenario, it may be None
+        timestamp (Timestamp): Prediction's timestamp
+        model_inputs (Tuple): Selected model and features values
+
+    Returns:
+        Tuple: Cached prediction, None when it is missing
+    """
+
+    if predictions is None:
+        return None
+
+    cached_prediction = predictions.get(timestamp)
+    is_hit = cached_prediction is not None and cached_prediction[0] == model_inputs
+    metrics.record_cache_lookup("predictions", is_hit)
+    return cached_prediction[1] if is_hit else None
+
+
+def set_prediction(predictions, timestamp, model_inputs, prediction):
+    """Cache a prediction
+
+    Args:
+        predictions (Dictionary): Cached predictions of a block and scenario, it may be None
+        timestamp (Timestamp): Prediction's timestamp
+        model_inputs (Tuple): Selected model and features values
+        prediction (Tuple): Prediction
+    """
+
+    if predictions is not None:
+        predictions[timestamp] = (model_inputs, prediction)
+
+
+def invalidate_timestamps(block_key, timestamps):
+    """Invalidate the predictions of some timestamps of a block in all scenarios
+
+    Args:
+        block_key (Tuple): Block's key set by the block assembly
+        timestamps (DatetimeIndex): Changed timestamps
+    """
+
+    with cached_predictions_lock:
+        for (cached_block_key, _), predictions in cached_predictions.items():
+            if cached_block_key == block_key:
+                for timestamp in timestamps:
+                    predictions.pop(timestamp, None)
+
+
+def invalidate_block(block_key):
+    """Invalidate all the predictions of a block
+
+    Args:
+        block_key (Tuple): Block's key set by the block assembly
+    """
+
+    with cached_predictions_lock:
+        for cache_key in [
+            cache_key for cache_key in cached_predictions if cache_key[0] == block_key
+        ]:
+            del cached_predictions[cache_key]
@@ -0,0 +1,223 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Parquet store of the overtopping predictions of each block"""
+
+# Predictions are stored as one Parquet file per site, dataset option and block, in hive-style partition folders, e.g.
+# site=dawlish/option=storm_bert/block_date=2024-11-20/part-0.parquet. Files are written to a temporary name and renamed,
+# so an existing partition is always complete and interrupted runs resume by skipping the existing partitions. The API
+# stores the baseline predictions of every block it processes, so the history of a site is read back without running the
+# models again. They are stored under the option and block of the request they were computed for, and only when the
+# predicted data was assembled from that option's data sources for that block.
+
+import logging
+import os
+import pandas as pd
+import block_assembly
+import lead_time
+import utils
+
+
+utils.loadConfigFile()
+
+logger = logging.getLogger(__name__)
+
+PARTITION_FILE_NAME = "part-0.parquet"
+FEATURE_COLUMNS = ["Hs", "Tm", "shoreWaveDir", "Wind(m/s)", "shoreWindDir", "Freeboard"]
+
+prediction_store_folder = os.environ.get("PREDICTION_STORE_FOLDER")
+
+
+def get_option_folder(site, option):
+    """Get the folder of the predictions files of a site and dataset option
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+
+    Returns:
+        string: Path to option's folder
+    """
+
+    return os.path.join(prediction_store_folder, f"site={site}", f"option={option}")
+
+
+def get_partition_path(site, option, block_date):
+    """Get the path of the predictions file of a block
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        block_date (Date): Block's date
+
+    Returns:
+        string: Path to predictions file
+    """
+
+    return os.path.join(
+        get_option_folder(site, option),
+        f"block_date={block_date.strftime('%Y-%m-%d')}",
+        PARTITION_FILE_NAME,
+    )
+
+
+def has_partition(site, option, block_date):
+    """Check whether the predictions of a block are stored
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        block_date (Date): Block's date
+
+    Returns:
+        bool: Flag is True when the predictions file exists, False otherwise
+    """
+
+    return os.path.exists(get_partition_path(site, option, block_date))
+
+
+def build_predictions_frame(df_adjusted, rig1_overtopping_df, rig2_overtopping_df):
+    """Combine the model inputs and the predictions of both rigs of a block
+
+    Args:
+        df_adjusted (Dataframe): Digital twin dataframe with the model inputs and the final RF1 predictions
+        rig1_overtopping_df (Dataframe): First location wave-overtopping-events dataframe
+        rig2_overtopping_df (Dataframe): Second location wave-overtopping-events dataframe
+
+    Returns:
+        Dataframe: Forecast hour, model inputs, final RF1 prediction, overtopping counts and confidences by time
+    """
+
+    predictions = df_adjusted[["time", *FEATURE_COLUMNS, "RF1_Final_Predictions"]]
+    for rig, overtopping_df in (
+        ("rig1", rig1_overtopping_df),
+        ("rig2", rig2_overtopping_df),
+    ):
+        predictions = predictions.merge(
+            overtopping_df.rename(
+                columns={
+                    "Time": "time",
+                    "Overtopping Count": f"{rig}_overtopping_count",
+                    "Confidence": f"{rig}_confidence",
+                }
+            ),
+            on="time",
+            how="left",
+        )
+
+    predictions.insert(
+        1,
+        "forecast_hour",
+        lead_time.get_lead_time_hours(predictions["time"], predictions["time"].iloc[0]),
+    )
+    numeric_columns = predictions.columns.drop("time")
+    predictions[numeric_columns] = predictions[numeric_columns].apply(
+        pd.to_numeric, errors="coerce"
+    )
+    return predictions
+
+
+def write_partition(site, option, block_date, predictions):
+    """Write the predictions file of a block atomically
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        block_date (Date): Block's date
+        predictions (Dataframe): Predictions of the block
+
+    Returns:
+        string: Path to predictions file
+    """
+
+    partition_path = get_partition_path(site, option, block_date)
+    os.makedirs(os.path.dirname(partition_path), exist_ok=True)
+    utils.write_file_atomically(partition_path, predictions.to_parquet(index=False))
+    return partition_path
+
+
+def store_block_predictions(
+    site,
+    data_sources,
+    block_date,
+    df_adjusted,
+    rig1_overtopping_df,
+    rig2_overtopping_df,
+):
+    """Store the predictions of a block processed with the baseline scenario, unless they are already stored
+
+    Args:
+        site (string): Site's name
+        data_sources (Dictionary): Dataset's option name, wave folder, wind folder and water level file of the request
+        block_date (Date): Request's resolved block's date
+        df_adjusted (Dataframe): Digital twin dataframe with the model inputs and the final RF1 predictions
+        rig1_overtopping_df (Dataframe): First location wave-overtopping-events dataframe
+        rig2_overtopping_df (Dataframe): Second location wave-overtopping-events dataframe
+
+    Returns:
+        string: Path to predictions file, None when nothing was stored
+    """
+
+    # Adjusted features are what-if scenarios, not what the twin forecast
+    option = data_sources["option"]
+    scenario = df_adjusted.attrs.get("scenario")
+    if (
+        not prediction_store_folder
+        or scenario is None
+        or any(scenario)
+        or has_partition(site, option, block_date)
+    ):
+        return None
+
+    block_key = df_adjusted.attrs.get("block_key")
+    if block_key != block_assembly.get_block_key(site, data_sources, block_date):
+        logger.warning(
+            "Predictions of block %s were not computed from the data of option %s and are not stored: %s",
+            block_date,
+            option,
+            block_key,
+        )
+        return None
+
+    try:
+        return write_partition(
+            site,
+            option,
+            block_date,
+            build_predictions_frame(
+                df_adjusted, rig1_overtopping_df, rig2_overtopping_df
+            ),
+        )
+    except OSError as e:
+        logger.error("Predictions of block %s could not be stored: %s", block_date, e)
+        return None
+
+
+def read_predictions(site, option, start_date, end_date):
+    """Read the stored predictions of the blocks within a date range
+
+    Args:
+        site (string): Site's name
+        option (string): Dataset's option name
+        start_date (Date): First block's date
+        end_date (Date): Last block's date
+
+    Returns:
+        Dataframe: Predictions with their block's date, sorted by block's date and time
+    """
+
+    option_folder = get_option_folder(site, option) if prediction_store_folder else None
+    if option_folder is None or not os.path.isdir(option_folder):
+        return pd.DataFrame(columns=["block_date", "time"])
+
+    # Block dates partitions are ISO formatted, so they compare as strings
+    predictions = pd.read_parquet(
+        option_folder,
+        filters=[
+            ("block_date", ">=", start_date.strftime("%Y-%m-%d")),
+            ("block_date", "<=", end_date.strftime("%Y-%m-%d")),
+        ],
+    )
+    predictions["block_date"] = predictions["block_date"].astype(str)
+    return predictions.sort_values(["block_date", "time"], ignore_index=True)
@@ -0,0 +1,203 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Sampling profiles of single requests, written as collapsed stacks"""
+
+# A request is profiled when its X-Profile-Token header matches the PROFILING_TOKEN setting, profiling is disabled when
+# the setting is empty. The token is taken from a header rather than the query string so that it is not written to access
+# logs. While the request runs, a sampler thread records the Python stack of every busy thread of the worker, which
+# includes the block extraction threads, e.g. pygrib decoding, and threads of concurrent requests, told apart by the
+# thread's name at the base of their stacks. Threads idle on a lock, a queue or a socket are left out.
+# Profiles are written in the collapsed stacks format read by flamegraph.pl and speedscope, one "frame;frame;frame count"
+# line per distinct stack. The base frame of every stack is the request's method, path and query, so profiles of
+# different requests can be concatenated into a single flame graph. A json file with the same name describes the profile.
+
+import hmac
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+import utils
+
+
+utils.loadConfigFile()
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+SAMPLER_THREAD_NAME = "profile-sampler"
+# Innermost frames of idle threads, by file name and function name
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("thread.py", "_worker"),
+}
+
+profiling_token = os.environ.get("PROFILING_TOKEN", "")
+profiles_folder = os.environ.get("PROFILES_FOLDER")
+profiling_interval = float(os.environ.get("PROFILING_INTERVAL_MS", "5")) / 1000
+
+
+def is_profiling_requested(headers):
+    """Check whether a request asks to be profiled with the right token
+
+    Args:
+        headers (Headers): Request's headers
+
+    Returns:
+        bool: Whether the request must be profiled
+    """
+
+    request_token = headers.get(PROFILE_TOKEN_HEADER)
+    return bool(
+        profiling_token
+        and profiles_folder
+        and request_token is not None
+        # Bytes are compared, so a token with non-ASCII characters is just a wrong token
+        and hmac.compare_digest(request_token.encode(), profiling_token.encode())
+    )
+
+
+def is_idle_frame(frame):
+    """Check whether the innermost frame of a thread is waiting for work
+
+    Args:
+        frame (Frame): Thread's innermost frame
+
+    Returns:
+        bool: Whether the thread is idle
+    """
+
+    return (
+        os.path.basename(frame.f_code.co_filename),
+        frame.f_code.co_name,
+    ) in IDLE_FRAMES
+
+
+def get_frame_name(frame):
+    """Get the name of a frame in a collapsed stack
+
+    Args:
+        frame (Frame): Stack's frame
+
+    Returns:
+        string: Function's name and its file's folder and name
+    """
+
+    file_path = "/".join(frame.f_code.co_filename.split(os.sep)[-2:])
+    return f"{frame.f_code.co_name} ({file_path})".replace(";", ",")
+
+
+def get_collapsed_stack(thread_name, frame):
+    """Get the collapsed stack of a thread, from its base to its innermost frame
+
+    Args:
+        thread_name (string): Thread's name
+        frame (Frame): Thread's innermost frame
+
+    Returns:
+        string: Frames names separated by semicolons
+    """
+
+    frames_names = []
+    while frame is not None:
+        frames_names.append(get_frame_name(frame))
+        frame = frame.f_back
+    frames_names.append(thread_name.replace(";", ","))
+    return ";".join(reversed(frames_names))
+
+
+def sample_stacks(profile):
+    """Record the stacks of the busy threads of the worker until the profile is stopped
+
+    Args:
+        profile (Dictionary): Request's profile
+    """
+
+    while not profile["stop_event"].wait(profiling_interval):
+        threads_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            thread_name = threads_names.get(thread_id, str(thread_id))
+            if thread_name == SAMPLER_THREAD_NAME or is_idle_frame(frame):
+                continue
+            profile["stacks"][get_collapsed_stack(thread_name, frame)] += 1
+        profile["samples_count"] += 1
+
+
+def start_profile():
+    """Start sampling the stacks of the worker
+
+    Returns:
+        Dictionary: Request's profile
+    """
+
+    profile = {
+        "start": time.perf_counter(),
+        "stacks": Counter(),
+        "samples_count": 0,
+        "stop_event": threading.Event(),
+    }
+    profile["sampler"] = threading.Thread(
+        target=sample_stacks, args=(profile,), name=SAMPLER_THREAD_NAME, daemon=True
+    )
+    profile["sampler"].start()
+    return profile
+
+
+def stop_profile(profile, method, route, path, query_params, status_code):
+    """Stop sampling and write the profile to the profiles folder
+
+    Args:
+        profile (Dictionary): Request's profile
+        method (string): Request's method
+        route (string): Request's route rule
+        path (string): Request's path
+        query_params (Dictionary): Request's query parameters
+        status_code (integer): Response's status code
+
+    Returns:
+        string: Profile's file name, None when it could not be written
+    """
+
+    profile["stop_event"].set()
+    profile["sampler"].join()
+    duration = time.perf_counter() - profile["start"]
+
+    query_string = "&".join(f"{name}={value}" for name, value in query_params.items())
+    request_frame = f"{method} {path}{'?' if query_string else ''}{query_string}"
+    profile_name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{path.strip('/').replace('/', '_')}"
+    collapsed_stacks = "".join(
+        f"{request_frame.replace(';', ',')};{stack} {count}\n"
+        for stack, count in profile["stacks"].most_common()
+    )
+    description = {
+        "method": method,
+        "route": route,
+        "path": path,
+        "query_params": query_params,
+        "status": status_code,
+        "duration_ms": round(duration * 1000, 1),
+        "samples_count": profile["samples_count"],
+        "interval_ms": profiling_interval * 1000,
+    }
+
+    try:
+        os.makedirs(profiles_folder, exist_ok=True)
+        utils.write_file_atomically(
+            os.path.join(profiles_folder, f"{profile_name}.folded"), collapsed_stacks
+        )
+        utils.write_file_atomically(
+            os.path.join(profiles_folder, f"{profile_name}.json"),
+            json.dumps(description, indent=4),
+        )
+    except OSError as e:
+        logger.error("Profile %s could not be written: %s", profile_name, e)
+        return None
+    return f"{profile_name}.folded"
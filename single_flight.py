@@ -0,0 +1,321 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Coalescing of identical concurrent requests into a single computation"""
+
+# Requests are identified by their path and normalized query parameters: the start date as an ISO date, today when it is
+# missing, numeric values as integers, and parameters equal to 0, the default of every scenario parameter, left out. A
+# request whose start date or scenario values cannot be parsed is answered with 400 before any coalescing.
+# Within a worker, the first request of a key computes the response while identical requests wait for it and get a copy.
+# Across gunicorn workers, that request first takes an exclusive file lock of the key in SINGLE_FLIGHT_FOLDER. The worker
+# which holds it computes the response and writes it next to the lock, so workers waiting for the lock reuse a response
+# computed after they started waiting rather than computing it again. Shared responses are stored as a json header with
+# the status and headers, followed by the raw body, so reading a response never runs code from the folder. The
+# cross-process variant is disabled when the folder is not set. A request whose computation failed in another thread is
+# computed again. Waiting requests take a place in their admission lane's queue and are answered with 503 when the queue
+# is full or the computation takes longer than the queue's timeout. Old files are removed by a background thread of each
+# worker, not by the computing requests.
+
+import fcntl
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from flask import Response, abort, current_app, request
+import admission
+import metrics
+import stage_timing
+import utils
+
+
+utils.loadConfigFile()
+
+logger = logging.getLogger(__name__)
+# Responses and lock files older than this are removed, every FILES_CLEANUP_INTERVAL seconds
+FILES_MAX_AGE = 3600
+FILES_CLEANUP_INTERVAL = 600
+# Seconds between two attempts to take a file lock held by another worker
+FILE_LOCK_POLL_INTERVAL = 0.05
+
+single_flight_folder = os.environ.get("SINGLE_FLIGHT_FOLDER")
+flights = {}
+flights_lock = threading.Lock()
+files_cleanup_thread = None
+
+
+def get_request_key():
+    """Get the key of the current request from its path and normalized query parameters
+
+    Raises:
+        ValueError: The start date or a scenario parameter cannot be parsed
+
+    Returns:
+        Tuple: Request's path and sorted normalized query parameters
+    """
+
+    query_params = {"start_date": utils.get_start_date_value("start_date").isoformat()}
+    for name, value in request.args.items():
+        if name == "start_date":
+            continue
+        if name in utils.SCENARIO_PARAMS:
+            value = int(value)  # the views only accept integer scenario values
+        else:
+            try:
+                value = int(value)
+            except ValueError:
+                value = value.strip()
+        if value != 0:
+            query_params[name] = value
+    return (request.path, tuple(sorted(query_params.items())))
+
+
+def get_response_data(view_result):
+    """Get the status, headers and body of a view's response
+
+    Args:
+        view_result (Response): View's return value
+
+    Returns:
+        Tuple: Response's status code, headers and body
+    """
+
+    response = current_app.make_response(view_result)
+    return response.status_code, list(response.headers.items()), response.get_data()
+
+
+@stage_timing.timed_stage
+def wait_for_flight(flight):
+    """Wait for the response of an identical request computed in another thread
+
+    Args:
+        flight (Dictionary): Computation of the identical request
+
+    Returns:
+        Tuple: Response's status code, headers and body, None when the computation failed
+
+    Raises:
+        ServiceUnavailable: The lane's queue is full or the computation took too long
+    """
+
+    admission.wait_for_other_request(flight["event"].wait)
+    return flight["response_data"]
+
+
+def take_file_lock(lock_file, timeout):
+    """Take the exclusive lock of a file, trying again until it is free
+
+    Args:
+        lock_file (File): Key's lock file
+        timeout (float): Longest wait in seconds, None for no limit
+
+    Returns:
+        bool: Flag is True when the lock was taken, False when the wait timed out
+    """
+
+    if timeout is None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return True
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(FILE_LOCK_POLL_INTERVAL)
+
+
+@stage_timing.timed_stage
+def wait_for_file_lock(lock_file):
+    """Take the exclusive lock of a request key, waiting while another worker holds it
+
+    Args:
+        lock_file (File): Key's lock file
+
+    Raises:
+        ServiceUnavailable: The lane's queue is full or the other worker's computation took too long
+    """
+
+    if not take_file_lock(lock_file, 0):
+        admission.wait_for_other_request(functools.partial(take_file_lock, lock_file))
+
+
+def get_shared_response(response_data):
+    """Get the content of a response file
+
+    Args:
+        response_data (Tuple): Response's status code, headers and body
+
+    Returns:
+        bytes: Json header with the response's status code and headers on the first line, followed by the body
+    """
+
+    status_code, headers, body = response_data
+    header = json.dumps({"status": status_code, "headers": headers})
+    return header.encode() + b"\n" + body
+
+
+def read_response_data(response_path, wait_start):
+    """Read the response written by another worker since a request started waiting
+
+    Args:
+        response_path (string): Key's response file path
+        wait_start (float): Time when the request started waiting for the lock
+
+    Returns:
+        Tuple: Response's status code, headers and body, None when there is no such response
+    """
+
+    try:
+        if os.stat(response_path).st_mtime < wait_start:
+            return None
+        with open(response_path, "rb") as response_file:
+            header = json.loads(response_file.readline())
+            body = response_file.read()
+        return (
+            int(header["status"]),
+            [(str(name), str(value)) for name, value in header["headers"]],
+            body,
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def remove_old_files():
+    """Remove the responses and lock files not used for a while from the single-flight folder"""
+
+    oldest_time = time.time() - FILES_MAX_AGE
+    try:
+        file_names = os.listdir(single_flight_folder)
+    except OSError:
+        return
+    for file_name in file_names:
+        file_path = os.path.join(single_flight_folder, file_name)
+        try:
+            if os.stat(file_path).st_mtime < oldest_time:
+                os.remove(file_path)
+        except OSError:
+            pass
+
+
+def remove_old_files_periodically():
+    """Remove old files from the single-flight folder every FILES_CLEANUP_INTERVAL seconds"""
+
+    while True:
+        remove_old_files()
+        time.sleep(FILES_CLEANUP_INTERVAL)
+
+
+def start_files_cleanup():
+    """Start the worker's removal of old files from the single-flight folder, unless it is already running"""
+
+    global files_cleanup_thread
+    with flights_lock:
+        if files_cleanup_thread is not None:
+            return
+        files_cleanup_thread = threading.Thread(
+            target=remove_old_files_periodically,
+            name="single-flight-cleanup",
+            daemon=True,
+        )
+    files_cleanup_thread.start()
+
+
+def compute_across_workers(request_key, compute):
+    """Compute a response while holding the key's file lock, unless another worker computed it meanwhile
+
+    Args:
+        request_key (Tuple): Request's key
+        compute (Function): Response's computation, without arguments
+
+    Raises:
+        ServiceUnavailable: The lane's queue is full or the other worker's computation took too long
+
+    Returns:
+        Tuple: Response's status code, headers and body
+    """
+
+    if not single_flight_folder:
+        return get_response_data(compute())
+
+    key_hash = hashlib.sha256(repr(request_key).encode()).hexdigest()
+    lock_path = os.path.join(single_flight_folder, f"{key_hash}.lock")
+    response_path = os.path.join(single_flight_folder, f"{key_hash}.response")
+    # Only the user running the workers may write responses
+    os.makedirs(single_flight_folder, mode=0o700, exist_ok=True)
+    start_files_cleanup()
+
+    wait_start = time.time()
+    with open(lock_path, "a") as lock_file:
+        wait_for_file_lock(lock_file)
+        try:
+            os.utime(lock_path)
+            response_data = read_response_data(response_path, wait_start)
+            if response_data is not None:
+                metrics.record_coalesced_request("workers")
+                return response_data
+
+            response_data = get_response_data(compute())
+            try:
+                utils.write_file_atomically(
+                    response_path, get_shared_response(response_data)
+                )
+            except OSError as e:
+                logger.error("Response of %s could not be shared: %s", request_key, e)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+    return response_data
+
+
+def coalesce_requests(view):
+    """Decorate a view so that identical concurrent requests share a single computation of the response
+
+    Args:
+        view (Function): Route's view
+
+    Returns:
+        Function: Coalescing view
+    """
+
+    @functools.wraps(view)
+    def coalescing_view(*args, **kwargs):
+        try:
+            request_key = get_request_key()
+        except ValueError as e:
+            abort(400, description=f"Invalid query parameters: {e}")
+        with flights_lock:
+            flight = flights.get(request_key)
+            is_leader = flight is None
+            if is_leader:
+                flight = {"event": threading.Event(), "response_data": None}
+                flights[request_key] = flight
+
+        if not is_leader:
+            response_data = wait_for_flight(flight)
+            if response_data is None:
+                return view(*args, **kwargs)
+            metrics.record_coalesced_request("threads")
+            return Response(
+                response_data[2], status=response_data[0], headers=response_data[1]
+            )
+
+        try:
+            flight["response_data"] = compute_across_workers(
+                request_key, lambda: view(*args, **kwargs)
+            )
+        finally:
+            with flights_lock:
+                del flights[request_key]
+            flight["event"].set()
+        response_data = flight["response_data"]
+        return Response(
+            response_data[2], status=response_data[0], headers=response_data[1]
+        )
+
+    return coalescing_view
@@ -0,0 +1,405 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Registry of the coastline sites, each one declared once and served by the shared digital twin engine"""
+
+# Every site is declared once in SITES: its wave buoy, tide file, wind sampling, lead time buckets, regularisation rules
+# of its models' predictions, models folder, overtopping outputs and their confidence colours, combined features plot and
+# output locations. The digital_twin engine reads the site's entry, so all the sites share one extraction, regularisation
+# and inference path. The forecast of every site and product goes through get_forecast, so the block, prediction and plot
+# caches apply to all the sites alike, and every product declared in PRODUCTS is served for every site by the
+# /splash/<site>/<product> route. Adding a site is adding its entry.
+
+import functools
+import os
+from flask import jsonify, make_response
+import digital_twin
+import feature_plots
+import lead_time
+import prediction_store
+import utils
+
+
+utils.loadConfigFile()
+
+# A regularisation rule revises a model's prediction to revised_prediction when any of its when_any conditions holds, or
+# when none of its unless_any conditions holds. A condition is a feature's name, a test of digital_twin.CONDITION_TESTS
+# and the test's bound. The rules of a model are applied in order.
+SITES = {
+    "dawlish": {
+        "name": "dawlish",
+        "label": "Dawlish",
+        "wave_buoy_latitude": float(os.environ.get("DAWLISH_WAVE_BUOY_LATITUDE")),
+        "wave_buoy_longitude": float(os.environ.get("DAWLISH_WAVE_BUOY_LONGITUDE")),
+        "water_level_file": os.environ.get("WATER_LEVEL_FILE"),
+        "wind_mean_hours": 3,
+        "lead_time_bucket_hours": lead_time.lead_time_bucket_hours,
+        "models_folder": os.environ.get("DAWLISH_MODELS_FOLDER"),
+        "regularisation": {
+            "RF1": (
+                {
+                    "prediction": 1,
+                    "revised_prediction": 0,
+                    "unless_any": (
+                        ("Hs", ">", 1.39),
+                        ("Wind(m/s)", ">", 7.71),
+                        ("shoreWaveDir", "between", (49, 97)),
+                    ),
+                },
+            ),
+            "RF3": (
+                {
+                    "prediction": 1,
+                    "revised_prediction": 0,
+                    "unless_any": (
+                        ("Hs", ">", 1.65),
+                        ("Wind(m/s)", ">", 8.47),
+                        ("shoreWaveDir", "between", (50, 93)),
+                    ),
+                },
+            ),
+        },
+        # The railway line confidences are listed for the timestamps where they were predicted first, then zeros, as the
+        # Dawlish outputs have always been
+        "pack_rf3_confidences": True,
+        "hourly_features": True,
+        "overtopping_names": (
+            "seawall_crest_overtopping",
+            "railway_line_overtopping",
+        ),
+        "confidence_colors": ((0.8, 0.5, "aqua"), (0.6, 0.4, "#4682B4")),
+        "render_combined_features_plot": feature_plots.render_dawlish_combined_features_plot,
+        "combined_features_plot_path": os.environ.get("OUTPUT_PATH_DAWLISH"),
+        "wave_maps_folder": os.environ.get("DAWLISH_OUTPUT_WAVES_FOLDER"),
+        "seawall_latitude": float(os.environ.get("DAWLISH_LAT_SEAWALL", "50.56757")),
+        "seawall_longitude": float(os.environ.get("DAWLISH_LON_SEAWALL", "-3.42424")),
+        "map_marker": "o",
+    },
+    "penzance": {
+        "name": "penzance",
+        "label": "Penzance",
+        "wave_buoy_latitude": float(os.environ.get("PENZANCE_WAVE_BUOY_LATITUDE")),
+        "wave_buoy_longitude": float(os.environ.get("PENZANCE_WAVE_BUOY_LONGITUDE")),
+        "water_level_file": os.environ.get("PENZANCE_WATER_LEVEL_FILE"),
+        "wind_mean_hours": None,
+        "lead_time_bucket_hours": lead_time.lead_time_bucket_hours,
+        "models_folder": os.environ.get("PENZANCE_MODELS_FOLDER"),
+        "regularisation": {
+            "RF1": (
+                {
+                    "prediction": 1,
+                    "revised_prediction": 0,
+                    "when_any": (("Hs", "<", 0.84),),
+                },
+                {
+                    "prediction": 0,
+                    "revised_prediction": 1,
+                    "when_any": (
+                        ("Hs", "between", (2.08, 2.17)),
+                        ("Hs", "between", (2.32, 2.37)),
+                    ),
+                },
+                {
+                    "prediction": 1,
+                    "revised_prediction": 0,
+                    "when_any": (("Wind(m/s)", "<", 2.8),),
+                },
+                {
+                    "prediction": 1,
+                    "revised_prediction": 0,
+                    "when_any": (("shoreWindDir", ">", 300),),
+                },
+                {
+                    "prediction": 0,
+                    "revised_prediction": 1,
+                    "when_any": (
+                        ("shoreWaveDir", "in", (98, 99, 100, 102, 103, 104, 107)),
+                    ),
+                },
+                {
+                    "prediction": 1,
+                    "revised_prediction": 0,
+                    "when_any": (
+                        ("Freeboard", "between", (5.367, 5.491)),
+                        ("Freeboard", "between", (5.561, 5.647)),
+                        ("Freeboard", "between", (3.615, 3.692)),
+                        ("Freeboard", "between", (5.677, 5.788)),
+                    ),
+                },
+            ),
+        },
+        "pack_rf3_confidences": False,
+        "hourly_features": False,
+        "overtopping_names": (
+            "seawall_crest_overtopping",
+            "seawall_crest_sheltered_overtopping",
+        ),
+        "confidence_colors": ((0.8, 0.5, "aqua"), (0.8, 0.5, "aqua")),
+        "render_combined_features_plot": feature_plots.render_penzance_combined_features_plot,
+        "combined_features_plot_path": os.environ.get("OUTPUT_PATH_PENZANCE"),
+        "wave_maps_folder": os.environ.get("PENZANCE_OUTPUT_WAVES_FOLDER"),
+        "seawall_latitude": float(os.environ.get("PENZANCE_LAT_SEAWALL", "50.1186")),
+        "seawall_longitude": float(os.environ.get("PENZANCE_LON_SEAWALL", "-5.5373")),
+        "map_marker": "s",
+    },
+}
+OVERTOPPING_COLUMNS = {
+    "Confidence": "confidence",
+    "Overtopping Count": "overtopping_count",
+}
+
+
+def get_forecast(site_name, option, date_object, scenario):
+    """Get a site's digital twin dataset adjusted to a scenario, with its overtopping predictions
+
+    Args:
+        site_name (string): Site's name
+        option (string): Dataset's option name
+        date_object (Date): Requested forecast block's date
+        scenario (Dictionary): Scenario's values in percentage or degrees by scenario parameter name
+
+    Raises:
+        ValueError: No block of the site could be read within the look-back window of the requested block
+
+    Returns:
+        Dictionary: Site, option, data sources, resolved block's date, adjusted dataset, overtopping predictions dataframes and scenario
+    """
+
+    site = SITES[site_name]
+    # The data sources of the request's option go along with it, other requests may use other options meanwhile
+    data_sources = digital_twin.get_data_sources(site, option)
+    dataset, block_date = digital_twin.get_digital_twin_dataset(
+        site, date_object, data_sources
+    )
+    dataset_adjusted = digital_twin.adjust_overtopping_features(
+        dataset, *(scenario[param_name] for param_name in utils.SCENARIO_PARAMS)
+    )
+    digital_twin.load_models(site)
+    overtopping_dfs = digital_twin.process_wave_overtopping(site, dataset_adjusted)
+
+    return {
+        "site_name": site_name,
+        "option": option,
+        "data_sources": data_sources,
+        "block_date": block_date,
+        "dataset": dataset_adjusted,
+        "overtopping_dfs": overtopping_dfs,
+        "scenario": scenario,
+    }
+
+
+def get_product_fields(product_name, fields_value):
+    """Get the fields of a product to return, from the comma separated fields query parameter
+
+    Args:
+        product_name (string): Product's name
+        fields_value (string): Requested fields, None for all the product's fields
+
+    Raises:
+        ValueError: A requested field is not a field of the product
+
+    Returns:
+        Tuple: Product's fields to return, besides the time of each record
+    """
+
+    product_fields = PRODUCTS[product_name]["fields"]
+    if fields_value is None:
+        return product_fields
+    if not product_fields:
+        raise ValueError(f"{product_name} has no fields.")
+
+    field_names = [
+        field_name.strip()
+        for field_name in fields_value.split(",")
+        if field_name.strip()
+    ]
+    unknown_field_names = set(field_names) - set(product_fields) - {"time"}
+    if unknown_field_names:
+        raise ValueError(
+            f"Unknown fields {', '.join(sorted(unknown_field_names))}, the fields of {product_name} are: {', '.join(product_fields)}."
+        )
+    return tuple(
+        field_name for field_name in product_fields if field_name in field_names
+    )
+
+
+def project_fields(data_df, fields):
+    """Keep only the time and the requested fields of a product's dataframe
+
+    Args:
+        data_df (Dataframe): Product's dataframe with a Time column
+        fields (Tuple): Fields to keep, besides the time
+
+    Returns:
+        Dataframe: Dataframe with the Time column and the requested fields present in it
+    """
+
+    return data_df[
+        ["Time", *(field_name for field_name in fields if field_name in data_df)]
+    ]
+
+
+def get_wave_overtopping(forecast, fields):
+    """Get a forecast's wave overtopping data and store its predictions
+
+    Args:
+        forecast (Dictionary): Site's forecast
+        fields (Tuple): Fields to return, besides the time
+
+    Returns:
+        Json: Forecast wave overtopping data of each of the site's outputs in json format
+    """
+
+    prediction_store.store_block_predictions(
+        forecast["site_name"],
+        forecast["data_sources"],
+        forecast["block_date"],
+        forecast["dataset"],
+        *forecast["overtopping_dfs"],
+    )
+
+    response_data = {"block_date": forecast["block_date"].strftime("%Y-%m-%d")}
+    for overtopping_name, overtopping_df in zip(
+        SITES[forecast["site_name"]]["overtopping_names"], forecast["overtopping_dfs"]
+    ):
+        response_data[overtopping_name] = utils.convert_df_to_json_data(
+            project_fields(overtopping_df.rename(columns=OVERTOPPING_COLUMNS), fields)
+        )
+    return jsonify(response_data)
+
+
+def get_feature_data(feature_name, column_name, data_name, forecast, fields):
+    """Get a forecast's hourly feature data and overtopping times data
+
+    Args:
+        feature_name (string): Feature's column name in the digital twin dataset
+        column_name (string): Feature's name in the response
+        data_name (string): Name of the feature data in the response
+        forecast (Dictionary): Site's forecast
+        fields (Tuple): Fields to return, besides the time
+
+    Returns:
+        Json: Feature data and forecast wave overtopping times data in Json format
+    """
+
+    interpolated_dataset, overtopping_times_by_feature_df = (
+        digital_twin.get_feature_and_overtopping_times_data(
+            SITES[forecast["site_name"]], forecast["dataset"], feature_name
+        )
+    )
+    interpolated_dataset = interpolated_dataset.rename(
+        columns={feature_name: column_name, "time": "Time"}
+    )
+    overtopping_times_by_feature_df = overtopping_times_by_feature_df.rename(
+        columns={feature_name: column_name, "overtopping_time": "Time"}
+    )
+
+    return jsonify(
+        {
+            "block_date": forecast["block_date"].strftime("%Y-%m-%d"),
+            data_name: utils.convert_df_to_json_data(
+                project_fields(interpolated_dataset, fields)
+            ),
+            "overtopping_times": utils.convert_df_to_json_data(
+                project_fields(overtopping_times_by_feature_df, fields)
+            ),
+        }
+    )
+
+
+def get_tidal_level(forecast, fields):
+    """Get a forecast's hourly tidal level data and overtopping times data
+
+    Args:
+        forecast (Dictionary): Site's forecast
+        fields (Tuple): Fields to return, besides the time
+
+    Returns:
+        Json: Tidal level data and forecast wave overtopping times data in Json format
+    """
+
+    dataset = forecast["dataset"]
+    tidal_level_df = digital_twin.extract_hourly_water_level_data(
+        dataset["time"].min(),
+        dataset["time"].max(),
+        forecast["data_sources"]["water_level_file"],
+    )
+    tidal_level_df = digital_twin.adjust_freeboard_only(
+        tidal_level_df, forecast["scenario"]["freeboard"]
+    )
+    overtopping_times_by_feature_df = digital_twin.get_overtopping_times_data(
+        dataset, "Freeboard"
+    )
+    overtopping_times_by_feature_df = overtopping_times_by_feature_df.rename(
+        columns={"Freeboard": "tidal_level", "overtopping_time": "Time"}
+    )
+
+    return jsonify(
+        {
+            "block_date": forecast["block_date"].strftime("%Y-%m-%d"),
+            "tidal_levels": utils.convert_df_to_json_data(
+                project_fields(tidal_level_df.reset_index(), fields)
+            ),
+            "overtopping_times": utils.convert_df_to_json_data(
+                project_fields(overtopping_times_by_feature_df, fields)
+            ),
+        }
+    )
+
+
+def get_combined_features_plot(forecast, fields):
+    """Get a forecast's significant wave height, freeboard and wind speed plot with the forecast overtopping events
+
+    Args:
+        forecast (Dictionary): Site's forecast
+        fields (Tuple): Unused, the plot has no fields
+
+    Returns:
+        Response: Combined features plot as a PNG image
+    """
+
+    site = SITES[forecast["site_name"]]
+    dataset = forecast["dataset"]
+    png = feature_plots.get_plot(
+        (
+            forecast["site_name"],
+            dataset.attrs.get("block_key"),
+            dataset.attrs.get("scenario"),
+        ),
+        site["render_combined_features_plot"],
+        *digital_twin.get_combined_features_data(
+            site, dataset, forecast["data_sources"]["water_level_file"]
+        ),
+    )
+
+    response = make_response(png)
+    response.mimetype = "image/png"
+    response.headers["X-Block-Date"] = forecast["block_date"].strftime("%Y-%m-%d")
+    return response
+
+
+# Every product declares the fields it returns besides the time, only those are interpolated and serialized
+PRODUCTS = {
+    "wave-overtopping": {
+        "get_product": get_wave_overtopping,
+        "fields": ("confidence", "overtopping_count"),
+    },
+    "significant-wave-height": {
+        "get_product": functools.partial(
+            get_feature_data,
+            "Hs",
+            "significant_wave_height",
+            "significant_wave_heights",
+        ),
+        "fields": ("significant_wave_height",),
+    },
+    "wind-speed": {
+        "get_product": functools.partial(
+            get_feature_data, "Wind(m/s)", "wind_speed", "wind_speeds"
+        ),
+        "fields": ("wind_speed",),
+    },
+    "tidal-level": {"get_product": get_tidal_level, "fields": ("tidal_level",)},
+    "combined-features": {"get_product": get_combined_features_plot, "fields": ()},
+}
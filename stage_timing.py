@@ -0,0 +1,129 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Durations of the pipeline stages run by each request"""
+
+# Stages are the pipeline functions decorated with timed_stage and are named after them, e.g. process_block or
+# process_wave_overtopping. Durations are added up by stage in the timings of the current request, which live in a context
+# variable, so threads started with submit_in_context record into the timings of the request that started them. Stages
+# overlap, e.g. process_block includes the extraction stages. Outside of a request, e.g. in the hindcast, nothing is timed.
+
+import contextvars
+import functools
+import threading
+import time
+
+
+request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def start_request_timings():
+    """Start recording the stage timings of the current request"""
+
+    request_timings.set(
+        {
+            "start": time.perf_counter(),
+            "stages": {},
+            "lock": threading.Lock(),
+        }
+    )
+
+
+def record_stage(stage_name, duration):
+    """Add the duration of a stage to the timings of the current request
+
+    Args:
+        stage_name (string): Stage's name
+        duration (float): Duration in seconds
+    """
+
+    timings = request_timings.get()
+    if timings is None:
+        return
+
+    with timings["lock"]:
+        stage = timings["stages"].setdefault(stage_name, [0.0, 0])
+        stage[0] += duration
+        stage[1] += 1
+
+
+def timed_stage(function):
+    """Decorate a pipeline function so that its calls are timed as a stage named after it
+
+    Args:
+        function (Function): Pipeline function
+
+    Returns:
+        Function: Timed function
+    """
+
+    @functools.wraps(function)
+    def timed_function(*args, **kwargs):
+        if request_timings.get() is None:
+            return function(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record_stage(function.__name__, time.perf_counter() - start)
+
+    return timed_function
+
+
+def submit_in_context(executor, function, *args):
+    """Submit a call to an executor so that it runs in a copy of the current context
+
+    Args:
+        executor (Executor): Thread pool executor
+        function (Function): Function to call
+        args (Tuple): Function's arguments
+
+    Returns:
+        Future: Call's future
+    """
+
+    return executor.submit(contextvars.copy_context().run, function, *args)
+
+
+def finish_request_timings():
+    """Stop recording the stage timings of the current request
+
+    Returns:
+        Dictionary: Request's total duration and duration and calls count by stage in milliseconds, None when the timings were not started
+    """
+
+    timings = request_timings.get()
+    if timings is None:
+        return None
+    request_timings.set(None)
+
+    with timings["lock"]:
+        stages = {
+            stage_name: {"duration_ms": round(duration * 1000, 1), "calls": calls}
+            for stage_name, (duration, calls) in timings["stages"].items()
+        }
+    return {
+        "duration_ms": round((time.perf_counter() - timings["start"]) * 1000, 1),
+        "stages": stages,
+    }
+
+
+def get_server_timing_header(stage_timings):
+    """Format stage timings as a Server-Timing header value
+
+    Args:
+        stage_timings (Dictionary): Request's stage timings
+
+    Returns:
+        string: Server-Timing header value, with a total entry for the whole request
+    """
+
+    entries = [
+        f'{stage_name};dur={stage["duration_ms"]}'
+        + (f';desc="{stage["calls"]} calls"' if stage["calls"] > 1 else "")
+        for stage_name, stage in stage_timings["stages"].items()
+    ]
+    entries.append(f'total;dur={stage_timings["duration_ms"]}')
+    return ", ".join(entries)
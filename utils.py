@@ -3,12 +3,36 @@
 # SPDX-License-Identifier: MIT
 
 import os
+import tempfile
+from bisect import bisect_right
 from dotenv import load_dotenv
 import pandas as pd
 from flask import request
-from datetime import datetime
+from datetime import datetime, timedelta
 import utils
 import json
+import metrics
+import stage_timing
+
+
+WAVE_FILE_PREFIX = "metoffice_wave_amm15_NWS_WAV_b"
+WIND_SPEED_FILE_PREFIX = "agl_wind-speed-"
+WIND_DIRECTION_FILE_PREFIX = "agl_wind-direction-"
+# Query parameters of the scenario adjustments, in the order of adjust_overtopping_features' arguments
+SCENARIO_PARAMS = (
+    "sig_wave_height",
+    "freeboard",
+    "mean_wave_period",
+    "mean_wave_dir",
+    "wind_speed",
+    "wind_direction",
+)
+
+# Dataset options of the Met Office folders, each one selectable with the option query parameter
+DATASET_OPTIONS = ("dawlish", "penzance", "no_overtopping", "storm_bert")
+
+# Directory listings indexed by block date, keyed by folder and refreshed only when the folder changes
+block_files_index = {}
 
 
 def loadConfigFile():
@@ -34,10 +58,18 @@ def getLocationDataPaths(option: str):
     Args:
         option (string): Dataset's name
 
+    Raises:
+        ValueError: The option is not one of DATASET_OPTIONS
+
     Returns:
-        Tuple: Absolute paths of wave, wind, Dawlish and Penzance water level folders
+        Tuple: Absolute paths of wave and wind folders, the water level file is the site's
     """
 
+    if option not in DATASET_OPTIONS:
+        raise ValueError(
+            f"Unknown option {option}, the options are: {', '.join(DATASET_OPTIONS)}."
+        )
+
     if option == "dawlish" or option == "penzance":
         met_office_wave_folder = os.environ.get("MET_OFFICE_WAVE_FOLDER")
         met_office_wind_folder = os.environ.get("MET_OFFICE_WIND_FOLDER")
@@ -48,15 +80,131 @@ def getLocationDataPaths(option: str):
         met_office_wave_folder = os.environ.get("MET_OFFICE_STORM_BERT_WAVE_FOLDER")
         met_office_wind_folder = os.environ.get("MET_OFFICE_STORM_BERT_WIND_FOLDER")
 
-    dawlish_water_level_file = os.environ.get("WATER_LEVEL_FILE")
-    penzance_water_level_file = os.environ.get("PENZANCE_WATER_LEVEL_FILE")
+    return met_office_wave_folder, met_office_wind_folder
 
-    return (
-        met_office_wave_folder,
-        met_office_wind_folder,
-        dawlish_water_level_file,
-        penzance_water_level_file,
+
+def get_block_files_index(folder, prefixes):
+    """Index files of a Met Office folder by forecast block date
+
+    Args:
+        folder (string): Folder's path
+        prefixes (Tuple): File name prefixes, each one followed by the block date in %Y%m%d format
+
+    Returns:
+        Dictionary: Sorted file paths by block date for each prefix
+    """
+
+    folder_mtime = os.stat(folder).st_mtime_ns
+    cached_index = block_files_index.get((folder, prefixes))
+    is_hit = cached_index is not None and cached_index[0] == folder_mtime
+    metrics.record_cache_lookup("block_files_index", is_hit)
+    if is_hit:
+        return cached_index[1]
+
+    files_index = {prefix: {} for prefix in prefixes}
+    for file_name in sorted(os.listdir(folder)):
+        for prefix in prefixes:
+            if not file_name.startswith(prefix):
+                continue
+            try:
+                block_date = datetime.strptime(
+                    file_name[len(prefix) : len(prefix) + 8], "%Y%m%d"
+                ).date()
+            except ValueError:
+                continue
+            files_index[prefix].setdefault(block_date, []).append(
+                os.path.join(folder, file_name)
+            )
+
+    block_files_index[(folder, prefixes)] = (folder_mtime, files_index)
+    return files_index
+
+
+@stage_timing.timed_stage
+def get_available_block_dates(wave_folder, wind_folder):
+    """Get dates of the blocks which have wave, wind speed and wind direction files
+
+    Args:
+        wave_folder (string): Wave folder's path
+        wind_folder (string): Wind folder's path
+
+    Returns:
+        List: Sorted blocks dates
+    """
+
+    wave_files_index = get_block_files_index(wave_folder, (WAVE_FILE_PREFIX,))
+    wind_files_index = get_block_files_index(
+        wind_folder, (WIND_SPEED_FILE_PREFIX, WIND_DIRECTION_FILE_PREFIX)
+    )
+    return sorted(
+        set(wave_files_index[WAVE_FILE_PREFIX])
+        & set(wind_files_index[WIND_SPEED_FILE_PREFIX])
+        & set(wind_files_index[WIND_DIRECTION_FILE_PREFIX])
+    )
+
+
+def get_candidate_block_dates(block_dates, requested_date, max_lookback_days):
+    """Get available blocks dates at or before the requested date, latest first
+
+    Args:
+        block_dates (List): Sorted available blocks dates
+        requested_date (Date): Requested forecast block's date
+        max_lookback_days (integer): Maximum number of days to look back from the requested date
+
+    Returns:
+        List: Candidate blocks dates, latest first
+    """
+
+    earliest_date = requested_date - timedelta(days=max_lookback_days)
+    last_index = bisect_right(block_dates, requested_date)
+    return [
+        block_date
+        for block_date in reversed(block_dates[:last_index])
+        if block_date >= earliest_date
+    ]
+
+
+def resolve_block_date(block_dates, requested_date, max_lookback_days):
+    """Resolve the latest available block at or before the requested date
+
+    Args:
+        block_dates (List): Sorted available blocks dates
+        requested_date (Date): Requested forecast block's date
+        max_lookback_days (integer): Maximum number of days to look back from the requested date
+
+    Returns:
+        Date: Resolved block's date, None when there is no block within the look-back window
+    """
+
+    candidate_block_dates = get_candidate_block_dates(
+        block_dates, requested_date, max_lookback_days
     )
+    return candidate_block_dates[0] if candidate_block_dates else None
+
+
+def write_file_atomically(file_path, content):
+    """Write a file by writing a temporary file in the same folder and renaming it
+
+    Args:
+        file_path (string): File's path
+        content (string): File's content, written in binary mode when it is bytes
+    """
+
+    folder = os.path.dirname(os.path.abspath(file_path))
+    file_descriptor, temporary_file_path = tempfile.mkstemp(
+        dir=folder, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(
+            file_descriptor, "wb" if isinstance(content, bytes) else "w"
+        ) as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_file_path, file_path)
+    except BaseException:
+        os.unlink(temporary_file_path)
+        raise
 
 
 def getNumericValue(input_value):
@@ -72,12 +220,23 @@ def getNumericValue(input_value):
     return int(input_value) if isinstance(input_value, str) else input_value
 
 
+@stage_timing.timed_stage
 def convert_df_to_json_data(original_df):
+    """Convert a dataframe with a Time column to json records
+
+    Args:
+        original_df (Dataframe): Dataframe to convert, its columns are already projected to the response's fields
+
+    Returns:
+        List: Records with their time formatted as in HTTP dates
+    """
+
     if not original_df.empty:
-        original_df["time"] = original_df.apply(
-            lambda row: row.Time.strftime("%a, %d %b %Y %H:%M:%S GMT"), axis=1
+        original_df = original_df.drop(columns=["Time"]).assign(
+            time=pd.to_datetime(original_df["Time"]).dt.strftime(
+                "%a, %d %b %Y %H:%M:%S GMT"
+            )
         )
-        original_df = original_df.drop(["Time"], axis=1)
         original_json_data = original_df.to_json(orient="records")
         json_data = json.loads(original_json_data)
     else:
@@ -85,6 +244,49 @@ def convert_df_to_json_data(original_df):
     return json_data
 
 
+def convert_predictions_to_json_data(predictions):
+    """Convert stored predictions to json data grouped by block
+
+    Args:
+        predictions (Dataframe): Predictions with their block's date
+
+    Returns:
+        List: Block's date and predictions of each block
+    """
+
+    json_data = []
+    for block_date, block_predictions in predictions.groupby("block_date", sort=True):
+        block_predictions = block_predictions.drop(columns=["block_date"])
+        block_predictions["time"] = block_predictions["time"].dt.strftime(
+            "%a, %d %b %Y %H:%M:%S GMT"
+        )
+        json_data.append(
+            {
+                "block_date": block_date,
+                "predictions": json.loads(block_predictions.to_json(orient="records")),
+            }
+        )
+    return json_data
+
+
+def get_start_date_value(start_date_name):
+    """Get forecast start date query parameter's value
+
+    Args:
+        start_date_name (string): Parameter's name of forecast start date
+
+    Returns:
+        Date: Forecast start date, today when the parameter is missing
+    """
+
+    start_date = request.args.get(start_date_name, datetime.now().date())
+    return (
+        datetime.strptime(start_date, "%d-%m-%Y").date()
+        if isinstance(start_date, str)
+        else start_date
+    )
+
+
 def get_query_params_values(
     start_date_name,
     sig_wave_height_name,
@@ -109,12 +311,7 @@ def get_query_params_values(
         Tuple: Values of forecast start date, significant wave height, freeboard, mean wave period, mean wave direction, wind speed and wind direction
     """
 
-    start_date = request.args.get(start_date_name, datetime.now().date())
-    date_object = (
-        datetime.strptime(start_date, "%d-%m-%Y").date()
-        if isinstance(start_date, str)
-        else start_date
-    )
+    date_object = get_start_date_value(start_date_name)
     sig_wave_height = utils.getNumericValue(request.args.get(sig_wave_height_name, 0))
     freeboard = utils.getNumericValue(request.args.get(freeboard_name, 0))
     mean_wave_period = utils.getNumericValue(request.args.get(mean_wave_period_name, 0))
@@ -0,0 +1,345 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Significant wave height and wave direction maps of Southwest England"""
+
+# The pieces shared by all the frames of a block, i.e. colormap, normalisation, contour levels, arrows grid and site
+# markers, are computed once and sent to every worker process when the pool starts. Each worker renders its frames with
+# the object-oriented Agg API, so no pyplot global state is involved. Both sites show the same Southwest England frames, so
+# each frame is rendered once and linked into the output folder of every site.
+
+import multiprocessing
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+import utils
+import wave_rasters
+
+
+utils.loadConfigFile()
+
+FRAME_STEP = 6  # Plot every 6 hours
+ARROW_DENSITY_FACTOR = 12
+LAND_MARGIN_HS = 0.2  # No arrows where Hs is below this value
+HS_LEVELS = np.linspace(0, 11, 21)
+HS_TICKS = np.linspace(0, 11, 12)
+MAP_DPI = 300
+
+wave_maps_processes = int(os.environ.get("WAVE_MAPS_PROCESSES", "0")) or None
+max_block_lookback_days = int(os.environ.get("MAX_BLOCK_LOOKBACK_DAYS", "7"))
+
+# Static map layers of the worker process, set by init_wave_map_worker
+static_map_layers = None
+
+
+def load_wave_frames(block_files):
+    """Load the significant wave height and wave direction frames to plot
+
+    Args:
+        block_files (List): Wave files paths of a block
+
+    Returns:
+        Dataset: Southwest England wave data of every plotted time step
+    """
+
+    wave_data = wave_rasters.load_wave_grids(block_files)
+    return wave_data.isel(time=slice(None, None, FRAME_STEP))
+
+
+def get_static_map_layers(longitudes, latitudes, site_markers, colormap):
+    """Compute the map layers shared by all the frames
+
+    Args:
+        longitudes (Array): Longitude values
+        latitudes (Array): Latitude values
+        site_markers (List): Label, longitude, latitude and marker of each site
+        colormap (Colormap): Significant wave height colormap
+
+    Returns:
+        Dictionary: Static map layers
+    """
+
+    arrows_skip = (
+        slice(None, None, max(1, len(latitudes) // ARROW_DENSITY_FACTOR)),
+        slice(None, None, max(1, len(longitudes) // ARROW_DENSITY_FACTOR)),
+    )
+    lon_grid, lat_grid = np.meshgrid(longitudes, latitudes)
+    return {
+        "longitudes": longitudes,
+        "latitudes": latitudes,
+        "arrows_skip": arrows_skip,
+        "arrows_longitudes": lon_grid[arrows_skip],
+        "arrows_latitudes": lat_grid[arrows_skip],
+        "colormap": colormap,
+        "norm": Normalize(vmin=0, vmax=11),
+        "site_markers": site_markers,
+        "legend_handles": [
+            Line2D(
+                [],
+                [],
+                color="white",
+                marker="$→$",
+                markersize=10,
+                linestyle="None",
+                label="Wave Direction (°)",
+            )
+        ]
+        + [
+            Line2D(
+                [],
+                [],
+                color="red",
+                marker=marker,
+                markersize=10,
+                linestyle="None",
+                label=label,
+            )
+            for label, _, _, marker in site_markers
+        ],
+    }
+
+
+def init_wave_map_worker(map_layers):
+    """Keep the static map layers in the worker process
+
+    Args:
+        map_layers (Dictionary): Static map layers
+    """
+
+    global static_map_layers
+    static_map_layers = map_layers
+
+
+def render_wave_map(hs_values, wave_directions, title, output_file):
+    """Render a significant wave height and wave direction map
+
+    Args:
+        hs_values (Array): Significant wave height values
+        wave_directions (Array): Mean wave direction values in degrees
+        title (string): Map's title
+        output_file (string): Path to output image
+
+    Returns:
+        string: Path to output image
+    """
+
+    map_layers = static_map_layers
+    arrows_skip = map_layers["arrows_skip"]
+
+    U = -np.sin(np.deg2rad(wave_directions[arrows_skip]))
+    V = -np.cos(np.deg2rad(wave_directions[arrows_skip]))
+    land_margin_mask = ~np.isnan(hs_values[arrows_skip]) & (
+        hs_values[arrows_skip] > LAND_MARGIN_HS
+    )
+    U = np.where(land_margin_mask, U, np.nan)
+    V = np.where(land_margin_mask, V, np.nan)
+
+    fig = Figure(figsize=(10, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    contour = ax.contourf(
+        map_layers["longitudes"],
+        map_layers["latitudes"],
+        hs_values,
+        levels=HS_LEVELS,
+        cmap=map_layers["colormap"],
+        norm=map_layers["norm"],
+    )
+    cbar = fig.colorbar(contour, ax=ax, label="Significant Wave Height (Hs) [m]")
+    cbar.set_ticks(HS_TICKS)
+
+    ax.quiver(
+        map_layers["arrows_longitudes"],
+        map_layers["arrows_latitudes"],
+        U,
+        V,
+        color="white",
+        scale=50,
+        width=0.002,
+        label="_nolegend_",
+    )
+
+    for label, longitude, latitude, marker in map_layers["site_markers"]:
+        ax.scatter(
+            longitude, latitude, color="red", s=50, marker=marker, label=label, zorder=5
+        )
+
+    ax.legend(handles=map_layers["legend_handles"], loc="upper left")
+    ax.set_title(title)
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    ax.grid(False)
+
+    # An interrupted render never leaves a partial image which would be reused later
+    temporary_file = f"{output_file}.{os.getpid()}.tmp"
+    fig.savefig(temporary_file, dpi=MAP_DPI, format="png")
+    os.replace(temporary_file, output_file)
+    return output_file
+
+
+def link_map_file(source_file, output_file):
+    """Link a rendered map into another output folder, copying it when the folders are on different file systems
+
+    Args:
+        source_file (string): Path to rendered image
+        output_file (string): Path to output image
+    """
+
+    try:
+        os.link(source_file, output_file)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copyfile(source_file, output_file)
+
+
+def render_wave_maps(block_files, block_label, output_folders, site_markers):
+    """Render the significant wave height and wave direction maps of a block in parallel
+
+    Every frame is rendered once into the first output folder and linked into the other ones. Frames already present in
+    all the output folders are skipped.
+
+    Args:
+        block_files (List): Wave files paths of a block
+        block_label (string): Block's date in %Y%m%d format
+        output_folders (List): Paths to output folders
+        site_markers (List): Label, longitude, latitude and marker of each site
+
+    Returns:
+        List: Paths to output images
+    """
+
+    import seaborn as sns  # only the calling process needs seaborn, workers receive the colormap
+
+    for output_folder in output_folders:
+        os.makedirs(output_folder, exist_ok=True)
+
+    wave_frames = load_wave_frames(block_files)
+    map_layers = get_static_map_layers(
+        wave_frames["longitude"].values,
+        wave_frames["latitude"].values,
+        site_markers,
+        sns.color_palette("mako", as_cmap=True),
+    )
+
+    output_files = []
+    # Spawned workers do not inherit the threads and locks of the calling process
+    with ProcessPoolExecutor(
+        max_workers=wave_maps_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_wave_map_worker,
+        initargs=(map_layers,),
+    ) as executor:
+        futures = []
+        for time_index, time_value in enumerate(wave_frames["time"].values):
+            time_label = pd.Timestamp(time_value).strftime("%Y-%m-%d %H:%M:%S")
+            file_name = f'hs_wave_direction_plot_block_{block_label}_time_{time_label.replace(":", "_")}.png'
+            frame_files = [
+                os.path.join(output_folder, file_name)
+                for output_folder in output_folders
+            ]
+            output_files.extend(frame_files)
+            if all(os.path.exists(frame_file) for frame_file in frame_files):
+                continue
+
+            if os.path.exists(frame_files[0]):
+                future = None
+            else:
+                wave_frame = wave_frames.isel(time=time_index)
+                hs_values = wave_frame["VHM0"].squeeze().values
+                if hs_values.ndim > 2:
+                    hs_values = hs_values[0]
+                future = executor.submit(
+                    render_wave_map,
+                    hs_values,
+                    wave_frame["VMDR"].squeeze().values,
+                    f"Significant Wave Height (Hs)\nBlock: {block_label}, Time: {time_label}",
+                    frame_files[0],
+                )
+            futures.append((time_label, frame_files, future))
+
+        for time_label, frame_files, future in futures:
+            if future is not None:
+                future.result()
+            for frame_file in frame_files[1:]:
+                link_map_file(frame_files[0], frame_file)
+            print(f"Saved plot for time {time_label} to {', '.join(frame_files)}")
+
+    return output_files
+
+
+def generate_wave_maps(requested_date):
+    """Render the maps of the latest block at or before the requested date for all sites
+
+    Args:
+        requested_date (Date): Requested forecast block's date
+
+    Returns:
+        List: Paths to output images, empty when there is no block within the look-back window
+    """
+
+    import sites  # imported on first use, the map workers never need the sites' engine
+
+    wave_folder = os.environ.get("MET_OFFICE_WAVE_FOLDER")
+    print(f"Processing Block: {requested_date.strftime('%Y%m%d')}")
+
+    wave_files_index = utils.get_block_files_index(
+        wave_folder, (utils.WAVE_FILE_PREFIX,)
+    )[utils.WAVE_FILE_PREFIX]
+    resolved_block_date = utils.resolve_block_date(
+        sorted(wave_files_index), requested_date, max_block_lookback_days
+    )
+    if resolved_block_date is None:
+        print(
+            f"No files found for Block {requested_date.strftime('%Y%m%d')} or the previous {max_block_lookback_days} days."
+        )
+        return []
+    if resolved_block_date != requested_date:
+        print(
+            f"No files found for Block {requested_date.strftime('%Y%m%d')}. Falling back to the latest available block: {resolved_block_date}"
+        )
+
+    block_files = [
+        file_path
+        for file_path in wave_files_index[resolved_block_date]
+        if file_path.endswith(".nc")
+    ]
+    if not block_files:
+        return []
+    return render_wave_maps(
+        block_files,
+        resolved_block_date.strftime("%Y%m%d"),
+        [
+            site["wave_maps_folder"]
+            for site in sites.SITES.values()
+            if site["wave_maps_folder"]
+        ],
+        [
+            (
+                site["label"],
+                site["seawall_longitude"],
+                site["seawall_latitude"],
+                site["map_marker"],
+            )
+            for site in sites.SITES.values()
+        ],
+    )
+
+
+if __name__ == "__main__":
+    # Run by the ingest job once new Met Office files have been downloaded, e.g. python wave_maps.py 20-11-2024
+    generate_wave_maps(
+        datetime.strptime(sys.argv[1], "%d-%m-%Y").date()
+        if len(sys.argv) > 1
+        else datetime.now().date()
+    )
@@ -0,0 +1,221 @@
+# SPDX-FileCopyrightText: © 2025 National Oceanography Centre and University of Plymouth
+
+# SPDX-License-Identifier: MIT
+
+"""Quantized significant wave height and wave direction grids of Southwest England"""
+
+# The frontend renders the wave maps itself from compact grids instead of server-side images. Every grid value is stored
+# as a little-endian uint16 with a scale and an offset per variable, missing values, e.g. land, hold the nodata value.
+# Each worker keeps the quantized grids of its most recently used blocks, so a time step is served straight from memory.
+
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import xarray as xr
+import admission
+import block_assembly
+import block_state
+import metrics
+import utils
+
+
+utils.loadConfigFile()
+
+# Coordinates (Southwest England)
+SOUTHWEST_LATITUDE_BOUNDS = [49.5, 51.5]
+SOUTHWEST_LONGITUDE_BOUNDS = [-6.0, -2.0]
+
+RASTER_DTYPE = np.dtype("<u2")
+RASTER_NODATA = np.iinfo(RASTER_DTYPE).max
+# Scale and offset of each variable: 1 mm for the significant wave height, 0.01 degree for the wave direction
+RASTER_VARIABLES = {"VHM0": (0.001, 0.0), "VMDR": (0.01, 0.0)}
+
+max_block_lookback_days = int(os.environ.get("MAX_BLOCK_LOOKBACK_DAYS", "7"))
+wave_rasters_cache_size = int(os.environ.get("WAVE_RASTERS_CACHE_SIZE", "4"))
+wave_rasters = OrderedDict()
+wave_rasters_lock = threading.Lock()
+
+
+def load_wave_grids(block_files):
+    """Load the significant wave height and wave direction grids of Southwest England
+
+    Args:
+        block_files (List): Wave files paths of a block
+
+    Returns:
+        Dataset: Southwest England wave data of every time step
+    """
+
+    wave_datasets = []
+    for file_path in block_files:
+        with xr.open_dataset(file_path) as wave_dataset:
+            wave_datasets.append(wave_dataset[list(RASTER_VARIABLES)].load())
+
+    wave_data = xr.concat(wave_datasets, dim="time")
+    wave_data["longitude"] = xr.where(
+        wave_data["longitude"] > 180,
+        wave_data["longitude"] - 360,
+        wave_data["longitude"],
+    )
+    return wave_data.sel(
+        latitude=slice(SOUTHWEST_LATITUDE_BOUNDS[0], SOUTHWEST_LATITUDE_BOUNDS[1]),
+        longitude=slice(SOUTHWEST_LONGITUDE_BOUNDS[0], SOUTHWEST_LONGITUDE_BOUNDS[1]),
+    )
+
+
+def quantize_grid(values, scale, offset):
+    """Quantize grid values to unsigned 16-bit integers
+
+    Args:
+        values (Array): Grid values
+        scale (float): Value of one quantization step
+        offset (float): Value of the zero quantization step
+
+    Returns:
+        Array: Quantized values, missing values hold the nodata value
+    """
+
+    quantized_values = np.clip(np.rint((values - offset) / scale), 0, RASTER_NODATA - 1)
+    return np.where(np.isnan(values), RASTER_NODATA, quantized_values).astype(
+        RASTER_DTYPE
+    )
+
+
+def quantize_wave_grids(wave_data):
+    """Quantize the wave grids of every time step
+
+    Args:
+        wave_data (Dataset): Southwest England wave data
+
+    Returns:
+        Array: Quantized grids by time step, variable, latitude and longitude
+    """
+
+    return np.stack(
+        [
+            quantize_grid(
+                wave_data[variable]
+                .transpose("time", "latitude", "longitude", ...)
+                .values.reshape(
+                    wave_data.sizes["time"],
+                    wave_data.sizes["latitude"],
+                    wave_data.sizes["longitude"],
+                    -1,
+                )[..., 0],
+                scale,
+                offset,
+            )
+            for variable, (scale, offset) in RASTER_VARIABLES.items()
+        ],
+        axis=1,
+    )
+
+
+def resolve_wave_block(wave_folder, requested_date):
+    """Resolve the wave files of the latest published block at or before the requested date
+
+    Args:
+        wave_folder (string): Wave folder's path
+        requested_date (Date): Requested forecast block's date
+
+    Returns:
+        Date, List: Resolved block's date and its wave files paths, None and an empty list when there is no block
+    """
+
+    published_block_date = block_state.get_published_block(wave_folder)
+    # The requested block is still being ingested
+    if published_block_date is not None and published_block_date < requested_date:
+        requested_date = published_block_date
+
+    wave_files_index = utils.get_block_files_index(
+        wave_folder, (utils.WAVE_FILE_PREFIX,)
+    )[utils.WAVE_FILE_PREFIX]
+    block_date = utils.resolve_block_date(
+        sorted(wave_files_index), requested_date, max_block_lookback_days
+    )
+    if block_date is None:
+        return None, []
+    return block_date, [
+        file_path
+        for file_path in wave_files_index[block_date]
+        if file_path.endswith(".nc")
+    ]
+
+
+def get_wave_rasters(wave_folder, requested_date):
+    """Get the quantized wave grids of a block, reusing them while the block's files do not change
+
+    Args:
+        wave_folder (string): Wave folder's path
+        requested_date (Date): Requested forecast block's date
+
+    Returns:
+        Dictionary: Block's date, time steps, coordinates and quantized grids, None when there is no block
+    """
+
+    block_date, block_files = resolve_wave_block(wave_folder, requested_date)
+    if not block_files:
+        return None
+
+    cache_key = (os.path.abspath(wave_folder), block_date)
+    files_signature = block_assembly.get_files_signature(block_files)
+    with wave_rasters_lock:
+        block_rasters = wave_rasters.get(cache_key)
+        if block_rasters is not None:
+            wave_rasters.move_to_end(cache_key)
+
+    is_hit = (
+        block_rasters is not None
+        and block_rasters["files_signature"] == files_signature
+    )
+    metrics.record_cache_lookup("wave_rasters", is_hit)
+    if not is_hit:
+        admission.admit_cold_computation()
+        wave_data = load_wave_grids(block_files)
+        block_rasters = {
+            "files_signature": files_signature,
+            "block_date": block_date,
+            "times": wave_data.indexes["time"],
+            "longitudes": wave_data["longitude"].values.tolist(),
+            "latitudes": wave_data["latitude"].values.tolist(),
+            "rasters": quantize_wave_grids(wave_data),
+        }
+        with wave_rasters_lock:
+            wave_rasters[cache_key] = block_rasters
+            wave_rasters.move_to_end(cache_key)
+            evictions_count = max(len(wave_rasters) - wave_rasters_cache_size, 0)
+            for _ in range(evictions_count):
+                wave_rasters.popitem(last=False)
+        metrics.record_cache_evictions("wave_rasters", evictions_count)
+
+    return block_rasters
+
+
+def get_wave_rasters_metadata(block_rasters):
+    """Get the description of the quantized wave grids of a block
+
+    Args:
+        block_rasters (Dictionary): Quantized wave grids of a block
+
+    Returns:
+        Dictionary: Block's date, time steps, coordinates and decoding parameters
+    """
+
+    return {
+        "block_date": block_rasters["block_date"].strftime("%Y-%m-%d"),
+        "times": [
+            time_value.strftime("%a, %d %b %Y %H:%M:%S GMT")
+            for time_value in block_rasters["times"]
+        ],
+        "longitudes": block_rasters["longitudes"],
+        "latitudes": block_rasters["latitudes"],
+        "shape": [len(block_rasters["latitudes"]), len(block_rasters["longitudes"])],
+        "dtype": "uint16",
+        "byte_order": "little",
+        "nodata": int(RASTER_NODATA),
+        "variables": [
+            {"name": variable, "scale": scale, "offset": offset}
+            for variable, (scale, offset) in RASTER_VARIABLES.items()
+        ],
+    }